@@ -0,0 +1,125 @@
+"""
+Benchmark per-page detail parsing before and after the single-pass extractor.
+
+Compares the original path (full ``html.parser`` tree, three
+``extract_dt_dd`` scans, ``extract_undergrad_gpa`` and
+``extract_gre_scores``) against :func:`scrape.parse_detail_page`, which
+builds a strained tree and reads every field in one pass. Both paths are
+checked to return identical dicts before timing, and the strained tree is
+checked to hold at most half the tags of the full one.
+
+Run from ``module_5/``::
+
+    python benchmarks/bench_detail_parse.py --pages 500
+"""
+
+# Import argparse for command-line options
+import argparse
+
+# Import os and sys to put the project root on the import path
+import os
+import sys
+
+# Import timeit for repeatable timings
+import timeit
+
+# Import BeautifulSoup for the original full-tree parse
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import the scraper under test
+from src.scrape import scrape  # pylint: disable=wrong-import-position
+
+#: Page chrome approximating a GradCafe result page around the detail list.
+CHROME = "".join(
+    f'<div class="card"><span class="badge">Tag {i}:</span><span>{i}</span>'
+    f'<p>Related result {i} <a href="/result/{i}">view</a></p></div>'
+    for i in range(60)
+)
+
+#: Detail definition list with the fields the scraper reads.
+DETAIL = """
+<dl>
+  <div><dt>Institution</dt><dd>Johns Hopkins University</dd></div>
+  <div><dt>Program</dt><dd>Computer Science</dd></div>
+  <div><dt>Degree Type</dt><dd>Masters</dd></div>
+  <div><dt>Degree's Country of Origin</dt><dd>American</dd></div>
+  <div><dt>Decision</dt><dd>Accepted on 1 Feb</dd></div>
+  <div><dt>Notification</dt><dd>on 01/02/2026 via E-mail</dd></div>
+  <div><dt>Undergrad GPA</dt><dd>3.85</dd></div>
+  <div><span>GRE General:</span><span>325</span></div>
+  <div><span>GRE Verbal:</span><span>160</span></div>
+  <div><span>Analytical Writing:</span><span>4.50</span></div>
+  <div><dt>Notes</dt><dd>Funded offer with a TA position.</dd></div>
+</dl>
+"""
+
+#: Full synthetic detail page.
+PAGE = (
+    "<html><head><title>Result</title></head><body><nav>" + CHROME
+    + "</nav><main>" + DETAIL + "</main><footer>" + CHROME
+    + "</footer></body></html>"
+)
+
+
+def extract_fields_original(soup):
+    """Extract the detail fields with the original per-field scans.
+
+    :param soup: Parsed detail page.
+    :type soup: bs4.BeautifulSoup
+    :returns: Detail dict as returned by :func:`scrape.extract_detail_fields`.
+    :rtype: dict[str, str]
+    """
+    gre = scrape.extract_gre_scores(soup)
+    return {
+        "program_name": scrape.extract_dt_dd(soup, "Program"),
+        "degree_type": scrape.extract_dt_dd(soup, "Degree Type"),
+        "comments": scrape.extract_dt_dd(soup, "Notes"),
+        "gpa": scrape.extract_undergrad_gpa(soup),
+        "gre_general": gre["gre_general"],
+        "gre_verbal": gre["gre_verbal"],
+        "gre_analytical_writing": gre["gre_analytical_writing"],
+    }
+
+
+def parse_detail_page_original(html):
+    """Parse a detail page the way the scraper did before the one-pass extractor.
+
+    :param html: Raw HTML string of a result detail page.
+    :type html: str
+    :returns: Detail dict as returned by :func:`scrape.parse_detail_page`.
+    :rtype: dict[str, str]
+    """
+    return extract_fields_original(BeautifulSoup(html, "html.parser"))
+
+
+def main():
+    """Time both parsers and print per-page milliseconds."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=300, help="Pages per timing run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs (best is kept).")
+    args = parser.parse_args()
+
+    if parse_detail_page_original(PAGE) != scrape.parse_detail_page(PAGE):
+        raise SystemExit("Parsers disagree; refusing to benchmark.")
+    full_tags = len(BeautifulSoup(PAGE, "html.parser").find_all(True))
+    strained_tags = len(scrape.make_soup(PAGE, scrape.DETAIL_STRAINER).find_all(True))
+    print(f"tags built: full {full_tags}, strained {strained_tags}")
+    if strained_tags * 2 > full_tags:
+        raise SystemExit("DETAIL_STRAINER keeps most of the page; nothing to gain.")
+
+    soup = BeautifulSoup(PAGE, "html.parser")
+    for name, func, arg in (
+        ("extract only: repeated scans", extract_fields_original, soup),
+        ("extract only: single pass", scrape.extract_detail_fields, soup),
+        ("parse + extract: original", parse_detail_page_original, PAGE),
+        ("parse + extract: strained, single pass", scrape.parse_detail_page, PAGE),
+    ):
+        best = min(timeit.repeat(lambda f=func, a=arg: f(a), number=args.pages,
+                                 repeat=args.repeat))
+        print(f"{name:<40} {best / args.pages * 1000:8.3f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark indexed fuzzy matching against difflib.get_close_matches.
+
+Builds misspelled, truncated and padded variants of the bundled canonical
+program and university names, checks that :class:`FuzzyIndex` returns the
+same match as ``difflib.get_close_matches(..., n=1)`` for every query, then
+reports microseconds per lookup for both at the cutoffs the standardizer
+uses. Memoization is bypassed so only cold lookups are timed.
+
+Run from ``module_5/``::
+
+    python benchmarks/bench_fuzzy_match.py --queries 2000
+"""
+
+# Import argparse for command-line options
+import argparse
+
+# Import difflib as the baseline
+import difflib
+
+# Import os and sys to put the project root on the import path
+import os
+import sys
+
+# Import random for reproducible query perturbations
+import random
+
+# Import time for wall-clock timings
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import the canonical lists and the index under test
+from src.scrape.llm_hosting import app as llm_app  # pylint: disable=wrong-import-position
+from src.scrape.llm_hosting.fuzzy_index import FuzzyIndex  # pylint: disable=wrong-import-position
+
+
+def _perturb(name, rnd):
+    """Return ``name`` with a few random deletions, insertions and swaps.
+
+    :param name: Canonical name.
+    :type name: str
+    :param rnd: Random source.
+    :type rnd: random.Random
+    :rtype: str
+    """
+    chars = list(name)
+    for _ in range(rnd.randint(0, 6)):
+        op = rnd.random()
+        i = rnd.randrange(len(chars) + 1)
+        if op < 0.3 and chars:
+            chars.pop(min(i, len(chars) - 1))
+        elif op < 0.6:
+            chars.insert(i, rnd.choice("abcdefghijklmnopqrstuvwxyz ."))
+        elif chars:
+            chars[min(i, len(chars) - 1)] = rnd.choice("aeiou xyz")
+    return "".join(chars)
+
+
+def main():
+    """Verify identical results, then time both matchers per list."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=2000, help="Lookups per list.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    for label, candidates, cutoff in (
+        ("programs", llm_app.CANON_PROGS, 0.84),
+        ("universities", llm_app.CANON_UNIS, 0.86),
+    ):
+        index = FuzzyIndex(candidates)
+        queries = [_perturb(rnd.choice(candidates), rnd) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        expected = [difflib.get_close_matches(q, candidates, n=1, cutoff=cutoff)
+                    for q in queries]
+        difflib_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = [index._best_match(q, cutoff) for q in queries]  # pylint: disable=protected-access
+        index_s = time.perf_counter() - start
+
+        mismatches = sum((e[0] if e else None) != g for e, g in zip(expected, got))
+        if mismatches:
+            sys.exit(f"{label}: {mismatches} results differ from difflib")
+        per = 1e6 / len(queries)
+        print(f"{label:<13}({len(index)} names, cutoff {cutoff}) "
+              f"difflib {difflib_s * per:7.0f} us  index {index_s * per:6.0f} us  "
+              f"speedup {difflib_s / index_s:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
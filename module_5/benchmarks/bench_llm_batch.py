@@ -0,0 +1,66 @@
+"""
+Benchmark single-row against batched LLM standardization.
+
+Standardizes the same distinct program strings once with one chat
+completion per row and once packed ``--batch-size`` rows per completion,
+both through ``standardize_texts``, with the persistent result cache
+disabled so every row reaches the model, and reports records per second
+for each path plus how many batched rows agree with the single-row answer.
+
+Needs ``llama-cpp-python`` and the GGUF model (downloaded on first use).
+Run from ``module_5/``::
+
+    python benchmarks/bench_llm_batch.py --input ROWS.json --batch-size 8
+"""
+
+# Import argparse for command-line options
+import argparse
+
+# Import os and sys to put the project root on the import path
+import os
+import sys
+
+# Import time for wall-clock timings
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import the standardizer under test
+from src.scrape.llm_hosting import app as llm_app  # pylint: disable=wrong-import-position
+
+
+def main():
+    """Time both paths over the input rows and print records per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--input", required=True,
+                        help="JSON list of rows with program_name and university.")
+    parser.add_argument("--rows", type=int, default=64, help="Rows to standardize.")
+    parser.add_argument("--batch-size", type=int, default=8,
+                        help="Program strings per batched completion.")
+    args = parser.parse_args()
+
+    rows = llm_app.read_rows(args.input)
+    # Distinct strings only, so batching gets no credit for de-duplication
+    texts = list(dict.fromkeys(
+        f"{r.get('program_name', '')}, {r.get('university', '')}" for r in rows
+    ))[:args.rows]
+
+    llm_app.LLM_CACHE_PATH = ""
+    llm_app.load_model()  # keep model loading out of both timings
+
+    start = time.perf_counter()
+    single = llm_app.standardize_texts(texts, batch_size=1, workers=1)
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = llm_app.standardize_texts(texts, batch_size=args.batch_size, workers=1)
+    batched_s = time.perf_counter() - start
+
+    agree = sum(a == b for a, b in zip(single, batched))
+    print(f"single   {single_s:8.2f} s  {len(texts) / single_s:8.2f} records/s")
+    print(f"batch={args.batch_size:<3}{batched_s:8.2f} s  {len(texts) / batched_s:8.2f} records/s")
+    print(f"speedup  {single_s / batched_s:8.2f}x  ({agree}/{len(texts)} results identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark per-record memory of plain dicts against ApplicantRecord.
+
+Builds the same synthetic survey-plus-detail records as dicts (each value
+decoded separately, as ``json.loads`` and the HTML parser produce them) and
+as :class:`record.ApplicantRecord` objects, and reports the memory held by
+each list as measured by :mod:`tracemalloc`.
+
+Run from ``module_5/``::
+
+    python benchmarks/bench_record_memory.py --records 100000
+"""
+
+# Import argparse for command-line options
+import argparse
+
+# Import os and sys to put the project root on the import path
+import os
+import sys
+
+# Import tracemalloc to measure the memory held by each representation
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import the record type under test
+from src.scrape.record import ApplicantRecord  # pylint: disable=wrong-import-position
+
+#: Small pools of values that repeat across records in real scrapes.
+UNIVERSITIES = ["Johns Hopkins University", "Stanford University", "MIT", "UC Berkeley"]
+PROGRAMS = ["Computer Science", "Electrical Engineering", "Mathematics"]
+STATUSES = ["Accepted on 1 Feb", "Rejected on 3 Mar", "Wait listed", "Interview"]
+TERMS = ["Fall 2025", "Fall 2026", "Spring 2026"]
+
+
+def make_raw(i):
+    """Build one record dict with freshly allocated strings.
+
+    :param i: Record number.
+    :type i: int
+    :rtype: dict
+    """
+    def fresh(value):
+        return "".join(list(value))
+
+    return {
+        "result_id": str(900000 + i),
+        "university": fresh(UNIVERSITIES[i % len(UNIVERSITIES)]),
+        "program_name": fresh(PROGRAMS[i % len(PROGRAMS)]),
+        "degree_type": fresh("Masters" if i % 2 else "PhD"),
+        "date_added": fresh(f"February {i % 28 + 1}, 2026"),
+        "applicant_status": fresh(STATUSES[i % len(STATUSES)]),
+        "start_term": fresh(TERMS[i % len(TERMS)]),
+        "International/US": fresh("International" if i % 3 else "US"),
+        "comments": f"Applicant note {i}",
+        "url_link": f"https://www.thegradcafe.com/result/{900000 + i}",
+        "gre_general": str(300 + i % 40),
+        "gre_verbal": str(140 + i % 30),
+        "gre_analytical_writing": f"{3 + i % 3}.0",
+        "gpa": f"3.{i % 100:02d}",
+    }
+
+
+def measure(build, count):
+    """Return the bytes still allocated after building ``count`` records.
+
+    :param build: Callable mapping a record number to a record.
+    :type build: callable
+    :param count: Number of records.
+    :type count: int
+    :rtype: int
+    """
+    tracemalloc.start()
+    records = [build(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main():
+    """Measure both representations and print bytes per record."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100000, help="Records to build.")
+    args = parser.parse_args()
+
+    if ApplicantRecord(make_raw(1)).to_dict() != make_raw(1):
+        raise SystemExit("Round trip differs; refusing to benchmark.")
+
+    as_dict = measure(make_raw, args.records)
+    as_record = measure(lambda i: ApplicantRecord(make_raw(i)), args.records)
+    for name, total in (("dict", as_dict), ("ApplicantRecord", as_record)):
+        print(f"{name:<16} {total / args.records:8.1f} bytes/record "
+              f"({total / 2**20:7.1f} MiB total)")
+    print(f"reduction        {1 - as_record / as_dict:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Client for the standalone LLM standardization service.
+
+By default :func:`src.update_data.update_data` standardizes records with
+llama.cpp inside the web process. In client mode it instead posts them to
+the ``/standardize`` endpoint of ``scrape/llm_hosting/app.py`` running as
+its own service (``python app.py --serve``): ``batch_size`` rows per
+request, up to ``concurrency`` requests in flight, over keep-alive
+connections. The model is then never loaded into the web process, and the
+inference service can be sized and scaled on its own.
+"""
+
+# Import json to encode requests and decode responses
+import json
+
+# Import ThreadPoolExecutor to keep several requests in flight
+from concurrent.futures import ThreadPoolExecutor
+
+# Import HTTPError to report error statuses like the other fetch paths
+from urllib.error import HTTPError
+
+# Import the keep-alive connection pool shared with the scraper
+from .scrape.http_pool import ConnectionPool
+
+
+class LLMServiceClient:
+    """Batched, concurrent client for the ``/standardize`` endpoint.
+
+    :param base_url: Service root, e.g. ``"http://127.0.0.1:8000"``.
+    :type base_url: str
+    :param batch_size: Rows sent per request.
+    :type batch_size: int
+    :param concurrency: Requests in flight at once.
+    :type concurrency: int
+    :param timeout: Socket timeout in seconds for each request.
+    :type timeout: float
+    """
+
+    def __init__(self, base_url, batch_size=32, concurrency=2, timeout=300):
+        self.url = base_url.rstrip("/") + "/standardize"
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.pool = ConnectionPool(
+            maxsize=self.concurrency,
+            timeout=timeout,
+            headers={"Content-Type": "application/json"},
+        )
+
+    def _post(self, rows):
+        """Standardize one batch of rows with a single request.
+
+        :param rows: Dicts with ``program_name`` and ``university``.
+        :type rows: list[dict]
+        :returns: One result dict per row, in order.
+        :rtype: list[dict]
+        :raises HTTPError: If the service answers with an error status.
+        :raises URLError: If the service cannot be reached.
+        :raises ValueError: If the reply is not JSON of the form
+            ``{"rows": [{...}, ...]}`` with one row per input.
+        """
+        body = json.dumps({"rows": rows}, ensure_ascii=False).encode("utf-8")
+        status, reason, headers, payload = self.pool.request(
+            self.url, method="POST", body=body,
+        )
+        if status >= 400:
+            raise HTTPError(self.url, status, reason, headers, None)
+        reply = json.loads(payload)
+        out = reply.get("rows") if isinstance(reply, dict) else None
+        if not isinstance(out, list) or not all(isinstance(row, dict) for row in out):
+            raise ValueError("malformed reply from the LLM service")
+        if len(out) != len(rows):
+            raise ValueError(f"expected {len(rows)} rows from the LLM service, got {len(out)}")
+        return [
+            {
+                "standardized_program": row.get("llm-generated-program"),
+                "standardized_university": row.get("llm-generated-university"),
+            }
+            for row in out
+        ]
+
+    def _post_or_none(self, rows):
+        """Like :meth:`_post`, but log a failure and answer ``None`` per row.
+
+        :param rows: Dicts with ``program_name`` and ``university``.
+        :type rows: list[dict]
+        :rtype: list[dict or None]
+        """
+        try:
+            return self._post(rows)
+        except (OSError, ValueError) as exc:
+            print(f"Warning: LLM service request for {len(rows)} rows failed: {exc}")
+            return [None] * len(rows)
+
+    def standardize(self, rows):
+        """Standardize ``rows`` through the service.
+
+        Repeated ``(program_name, university)`` pairs are sent once. A batch
+        whose request fails yields ``None`` for each of its rows rather than
+        failing the others.
+
+        :param rows: Applicant records.
+        :type rows: list[dict]
+        :returns: One result dict (``standardized_program``,
+            ``standardized_university``) or ``None`` per row, in order.
+        :rtype: list[dict or None]
+        """
+        keys = [(row.get("program_name", ""), row.get("university", "")) for row in rows]
+        distinct = list(dict.fromkeys(keys))
+        batches = [
+            [{"program_name": p, "university": u} for p, u in distinct[i:i + self.batch_size]]
+            for i in range(0, len(distinct), self.batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            answered = [r for batch in executor.map(self._post_or_none, batches) for r in batch]
+        results = dict(zip(distinct, answered))
+        return [results[key] for key in keys]
+
+    def close(self):
+        """Close the pooled connections."""
+        self.pool.close()
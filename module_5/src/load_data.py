@@ -29,6 +29,7 @@ from psycopg import sql
 from psycopg import Connection, OperationalError
 
 from .paths import LLM_OUTPUT_FILE
+from .scrape.clean import normalize_status
 
 
 def create_connection(
@@ -123,7 +124,8 @@ def _build_rows(path: str) -> list:
     Reads the file at ``path`` line by line, parses each line as JSON, and
     converts each record into a tuple matching the ``grad_applications``
     column order. Numeric fields are cast to ``float`` where present;
-    missing or empty values become ``None``. Records with a malformed
+    missing or empty values become ``None``. Applicant statuses go through
+    :func:`scrape.clean.normalize_status`. Records with a malformed
     ``date_added`` field are logged and skipped rather than crashing the
     entire load, so one bad line is never fatal.
 
@@ -172,8 +174,10 @@ def _build_rows(path: str) -> list:
                     # Application URL (used as unique key)
                     r.get("url_link"),
 
-                    # Applicant decision status
-                    r.get("applicant_status"),
+                    # Applicant decision status, normalized through the
+                    # shared memo so older files load in canonical form
+                    normalize_status(r["applicant_status"])
+                    if r.get("applicant_status") else r.get("applicant_status"),
 
                     # Application term (e.g., Fall 2026)
                     r.get("start_term"),
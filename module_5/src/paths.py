@@ -17,3 +17,10 @@ SRC_FILES_DIR = os.path.join(BASE_DIR, "src_files")
 STATE_FILE = os.path.join(SRC_FILES_DIR, "pull_state.json")
 NEW_APPLICANT_FILE = os.path.join(SRC_FILES_DIR, "new_applicant_data.json")
 LLM_OUTPUT_FILE = os.path.join(SRC_FILES_DIR, "llm_extend_applicant_data.json")
+
+# Crawl-session files that let an interrupted refresh resume
+REFRESH_SESSION_FILE = os.path.join(SRC_FILES_DIR, "refresh_session.json")
+REFRESH_CHECKPOINT_FILE = os.path.join(SRC_FILES_DIR, "refresh_checkpoint.ndjson")
+
+# On-disk conditional-GET cache of GradCafe pages (see scrape/http_cache.py)
+HTTP_CACHE_FILE = os.path.join(SRC_FILES_DIR, "http_cache.sqlite3")
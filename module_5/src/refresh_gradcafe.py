@@ -16,9 +16,31 @@ import json
 # Import ThreadPoolExecutor and as_completed for parallel detail fetching
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Import closing so an early return shuts down the survey-page generator
+from contextlib import closing
+
 # Import public scrape and clean utilities from the scrape module
-from .scrape import scrape, clean
-from .paths import NEW_APPLICANT_FILE, LLM_OUTPUT_FILE
+from .scrape import scrape, clean, crawl_session, http_cache
+from .scrape.record import json_default
+from . import seen_index
+from .paths import (
+    NEW_APPLICANT_FILE,
+    LLM_OUTPUT_FILE,
+    REFRESH_SESSION_FILE,
+    REFRESH_CHECKPOINT_FILE,
+)
+
+# On-disk conditional-GET cache used by refresh() (e.g. paths.HTTP_CACHE_FILE);
+# None downloads every page in full
+HTTP_CACHE_PATH = None
+
+# Locate the new/seen boundary by bisecting survey pages (find_frontier_page)
+# instead of walking them one by one from the first page
+FRONTIER_SEARCH = False
+
+# Enriched records between refresh-session saves; the session is also saved
+# after every listed survey page, so a crashed refresh repeats little work
+REFRESH_SAVE_EVERY = 25
 
 
 def get_seen_ids_from_llm_extend_file(path=LLM_OUTPUT_FILE):
@@ -59,20 +81,150 @@ def get_seen_ids_from_llm_extend_file(path=LLM_OUTPUT_FILE):
     return seen_ids
 
 
-def scrape_new_records(seen_ids):
+def load_seen_ids(path=LLM_OUTPUT_FILE):
+    """Load previously processed result IDs through the persistent index.
+
+    Unlike :func:`get_seen_ids_from_llm_extend_file`, only lines appended
+    to the LLM output file since the index was last synced are parsed, and
+    the IDs stay in a memory-mapped sorted array instead of a set.
+
+    :param path: Path to the LLM output NDJSON file.
+    :type path: str
+    :returns: Index supporting ``result_id in seen_ids``.
+    :rtype: seen_index.SeenIndex
+    """
+    seen_ids = seen_index.SeenIndex.open(path)
+    print(f"Loaded {len(seen_ids)} seen IDs")
+    return seen_ids
+
+
+def _close_seen_ids(seen_ids):
+    """Release ``seen_ids`` if it is a mapped :class:`seen_index.SeenIndex`.
+
+    :param seen_ids: Value returned by :func:`load_seen_ids`.
+    :type seen_ids: seen_index.SeenIndex or set[int]
+    """
+    if isinstance(seen_ids, seen_index.SeenIndex):
+        seen_ids.close()
+
+
+def find_frontier_page(newest_seen_id, start_page=1):
+    """Find the first survey page that reaches already-seen records.
+
+    Survey pages list results newest first, so result IDs fall as the page
+    number rises. A page is *old* when it is empty or its smallest result
+    ID is at most ``newest_seen_id``; every page after an old page is old
+    too. Pages ``start_page``, ``+1``, ``+3``, ``+7``, ... are probed until
+    an old one is found, and the remaining gap is bisected, so the
+    boundary is located in O(log pages) fetches.
+
+    :param newest_seen_id: Largest result ID already processed.
+    :type newest_seen_id: int
+    :param start_page: First survey page that may hold new records.
+    :type start_page: int
+    :returns: Tuple of ``(frontier, probed)``: the first old page at or
+        after ``start_page``, and the parsed records of every probed page.
+    :rtype: tuple[int, dict[int, list[dict]]]
+    """
+    probed = {}
+
+    def is_old(page):
+        probed[page] = scrape.fetch_survey_page(page)
+        ids = [int(record["result_id"]) for record in probed[page]]
+        return not ids or min(ids) <= newest_seen_id
+
+    newer, offset = start_page - 1, 0
+    while not is_old(start_page + offset):
+        newer = start_page + offset
+        offset = offset * 2 + 1
+    older = start_page + offset
+
+    while older - newer > 1:
+        middle = (newer + older) // 2
+        if is_old(middle):
+            older = middle
+        else:
+            newer = middle
+    return older, probed
+
+
+def _scrape_to_frontier(seen_ids, start_page, session, on_listed):
+    """Collect new records from every page up to the frontier page.
+
+    Pages not already fetched by :func:`find_frontier_page` are fetched
+    concurrently with :func:`scrape.fetch_survey_pages`.
+
+    :param seen_ids: Non-empty set of result IDs to skip.
+    :type seen_ids: set[int]
+    :param start_page: First survey page to collect.
+    :type start_page: int
+    :param session: Optional crawl session receiving each page's records.
+    :type session: crawl_session.CrawlSession or None
+    :param on_listed: Optional callback receiving each page's new records.
+    :type on_listed: callable or None
+    :returns: New applicant records, in survey order.
+    :rtype: list[dict]
+    """
+    if isinstance(seen_ids, seen_index.SeenIndex):
+        newest_seen_id = seen_ids.newest
+    else:
+        newest_seen_id = max(seen_ids)
+    frontier, pages = find_frontier_page(newest_seen_id, start_page)
+    print(f"Frontier at survey page {frontier} after {len(pages)} probes")
+    wanted = range(start_page, frontier + 1)
+    pages.update(scrape.fetch_survey_pages([p for p in wanted if p not in pages]))
+
+    new_records = []
+    for page in wanted:
+        page_new = [
+            record for record in pages[page]
+            if int(record["result_id"]) not in seen_ids
+        ]
+        new_records.extend(page_new)
+        if session:
+            session.add_listed(page, page_new)
+        if on_listed:
+            on_listed(page_new)
+    return new_records
+
+
+def scrape_new_records(seen_ids, prefetch=None, session=None, frontier=None,
+                       on_listed=None):
     """Scrape survey pages and return records not yet in the database.
 
     Pages through the GradCafe survey, skipping result IDs already in
     ``seen_ids``. Stops early once ``seen_limit`` consecutive already-seen
-    records are encountered in a row.
+    records are encountered in a row; any survey pages still being
+    prefetched at that point are cancelled.
+
+    In frontier mode the serial walk is replaced by
+    :func:`find_frontier_page`, and the pages before the boundary are then
+    fetched in parallel. Frontier mode needs at least one seen ID; with
+    none, the serial walk is used.
 
     :param seen_ids: Set of result IDs to skip.
     :type seen_ids: set[int]
-    :returns: List of new applicant record dicts.
+    :param prefetch: Number of survey pages fetched ahead concurrently.
+        Defaults to :data:`scrape.PREFETCH_PAGES`.
+    :type prefetch: int or None
+    :param session: Optional crawl session. Paging starts after its last
+        completed page and each page's new records are recorded in it.
+    :type session: crawl_session.CrawlSession or None
+    :param frontier: Use frontier mode. Defaults to :data:`FRONTIER_SEARCH`.
+    :type frontier: bool or None
+    :param on_listed: Optional callback invoked with each survey page's new
+        records as soon as the page is processed.
+    :type on_listed: callable or None
+    :returns: List of new applicant record dicts found by this call.
     :rtype: list[dict]
     """
+    start_page = session.last_page + 1 if session else 1
+    if frontier is None:
+        frontier = FRONTIER_SEARCH
+    if frontier and seen_ids:
+        return _scrape_to_frontier(seen_ids, start_page, session, on_listed)
+
     new_records = []
-    page = 1
     consecutive_seen = 0
 
     # Stop scraping once this many consecutive already-seen records appear.
@@ -81,47 +233,71 @@ def scrape_new_records(seen_ids):
     # preventing unbounded pagination through old data.
     seen_limit = 5
 
-    while True:
-        print(f"Scraping survey page {page}")
-
-        html = scrape.fetch_html(scrape.SURVEY_URL.format(page))
-        page_results = scrape.parse_survey_page(html)
+    pages = scrape.iter_survey_pages(start_page=start_page, prefetch=prefetch)
+    with closing(pages):
+        for page, page_results in pages:
+            print(f"Scraped survey page {page}")
+            page_start = len(new_records)
 
-        if not page_results:
-            break
+            for record in page_results:
+                result_id = int(record["result_id"])
 
-        for record in page_results:
-            result_id = int(record["result_id"])
+                if result_id in seen_ids:
+                    consecutive_seen += 1
+                else:
+                    consecutive_seen = 0
+                    new_records.append(record)
 
-            if result_id in seen_ids:
-                consecutive_seen += 1
-            else:
-                consecutive_seen = 0
-                new_records.append(record)
+                if consecutive_seen >= seen_limit:
+                    break
 
+            if session:
+                session.add_listed(page, new_records[page_start:])
+            if on_listed:
+                on_listed(new_records[page_start:])
             if consecutive_seen >= seen_limit:
                 return new_records
 
-        page += 1
-
     return new_records
 
 
-def enrich_with_details(records):
-    """Fetch and merge detail-page data into each record using a thread pool.
+def _log_detail_failure(record, exc):
+    """Print a warning for a record whose detail fetch failed.
 
-    Errors from individual detail-page fetches are caught and logged per
-    record rather than aborting enrichment of all remaining records.
+    :param record: The survey-level record that could not be enriched.
+    :type record: dict
+    :param exc: The exception raised by the fetch.
+    :type exc: Exception
+    """
+    print(
+        f"Warning: failed to fetch detail for result_id "
+        f"{record.get('result_id')}: {exc}"
+    )
 
-    :param records: List of survey-level applicant records to enrich.
-    :type records: list[dict]
-    :returns: The same list with detail fields merged in-place.
-        Records whose detail fetch failed are left unchanged.
-    :rtype: list[dict]
+
+def _merge_detail(record, detail):
+    """Merge a detail dict into its record, or log the fetch failure.
+
+    :param record: Survey-level record to enrich in place.
+    :type record: dict
+    :param detail: Detail dict, or the exception raised fetching it.
+    :type detail: dict or Exception
     """
-    print(f"Enriching {len(records)} records")
+    if isinstance(detail, Exception):
+        _log_detail_failure(record, detail)
+    else:
+        record.update(detail)
+
+
+def _enrich_on_threads(records, on_complete):
+    """Fetch and parse detail pages on a thread pool, merging as they finish.
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
+    :param records: Survey-level records to enrich in place.
+    :type records: list[dict]
+    :param on_complete: Optional per-record completion callback.
+    :type on_complete: callable or None
+    """
+    with ThreadPoolExecutor(max_workers=scrape.detail_workers()) as executor:
         future_to_record = {
             executor.submit(scrape.scrape_detail_page, r["result_id"]): r
             for r in records
@@ -133,14 +309,99 @@ def enrich_with_details(records):
                 detail = future.result()
                 record.update(detail)
             except Exception as exc:  # pylint: disable=broad-except
-                print(
-                    f"Warning: failed to fetch detail for result_id "
-                    f"{record.get('result_id')}: {exc}"
-                )
+                _log_detail_failure(record, exc)
+            if on_complete:
+                on_complete(record)
+
+
+def enrich_with_details(records, engine=None, on_complete=None):
+    """Fetch and merge detail-page data into each record.
+
+    Uses a thread pool by default, or the single-threaded asyncio engine
+    (:func:`scrape.fetch_details_async`) when ``engine`` is ``"asyncio"``.
+    With :data:`scrape.PARSE_PROCESSES` set, the thread pool only fetches
+    and pages are parsed in worker processes
+    (:func:`scrape.iter_details_in_processes`).
+    Errors from individual detail-page fetches are caught and logged per
+    record rather than aborting enrichment of all remaining records.
+
+    :param records: List of survey-level applicant records to enrich.
+    :type records: list[dict]
+    :param engine: ``"threads"`` or ``"asyncio"``. Defaults to
+        :data:`scrape.FETCH_ENGINE`.
+    :type engine: str or None
+    :param on_complete: Optional callback invoked with each record once its
+        detail fetch has finished (successfully or not).
+    :type on_complete: callable or None
+    :returns: The same list with detail fields merged in-place.
+        Records whose detail fetch failed are left unchanged.
+    :rtype: list[dict]
+    """
+    print(f"Enriching {len(records)} records")
 
+    result_ids = [r["result_id"] for r in records]
+    details = None
+    if (engine or scrape.FETCH_ENGINE) == "asyncio":
+        details = scrape.fetch_details_async(result_ids)
+    elif scrape.PARSE_PROCESSES > 0:
+        details = scrape.iter_details_in_processes(result_ids)
+    if details is not None:
+        for record, detail in zip(records, details):
+            _merge_detail(record, detail)
+            if on_complete:
+                on_complete(record)
+    else:
+        _enrich_on_threads(records, on_complete)
+
+    if scrape.RATE_CONTROLLER is not None:
+        print(scrape.RATE_CONTROLLER.report())
     return records
 
 
+def list_and_enrich(session, pending):
+    """List new records while their detail pages are already being fetched.
+
+    Each survey page's new records go straight to a detail pipeline
+    (:func:`scrape.open_detail_pipeline`), and finished records are merged
+    and recorded in ``session`` as soon as they complete, so enrichment
+    runs alongside listing rather than after it.
+
+    :param session: Crawl session for this refresh.
+    :type session: crawl_session.CrawlSession
+    :param pending: Records left unenriched by a previous run.
+    :type pending: list[dict]
+    :returns: Every record listed or pending, in listing order, with
+        detail fields merged in where the fetch succeeded.
+    :rtype: list[dict]
+    """
+    listed = list(pending)
+
+    def finish(pairs):
+        for record, detail in pairs:
+            _merge_detail(record, detail)
+            session.record_completed(record)
+
+    with scrape.open_detail_pipeline() as pipeline:
+        def on_listed(records):
+            listed.extend(records)
+            pipeline.submit(records)
+            finish(pipeline.completed())
+
+        pipeline.submit(pending)
+        if not session.listing_done:
+            seen_ids = load_seen_ids()
+            try:
+                scrape_new_records(seen_ids, session=session, on_listed=on_listed)
+            finally:
+                _close_seen_ids(seen_ids)
+            session.finish_listing()
+        finish(pipeline.drain())
+
+    if scrape.RATE_CONTROLLER is not None:
+        print(scrape.RATE_CONTROLLER.report())
+    return listed
+
+
 def write_new_applicant_file(records):
     """Clean and write enriched records to the new-applicant staging file.
 
@@ -172,33 +433,96 @@ def write_new_applicant_file(records):
             merged.append(record)
 
     with open(NEW_APPLICANT_FILE, "w", encoding="utf-8") as f:
-        json.dump(merged, f, ensure_ascii=False, indent=2)
+        json.dump(merged, f, ensure_ascii=False, indent=2,
+                  default=json_default)
 
     print(f"Wrote {len(cleaned)} records to new_applicant_data.json "
           f"({len(merged)} total after merge)")
 
 
-def refresh():
+def refresh(resume=False, http_cache_path=None):
     """Run the full GradCafe refresh pipeline.
 
     Loads seen IDs, scrapes new records, enriches them with detail data,
     and writes the results to the staging file. Returns a summary dict
     with the count of new records added.
 
+    Progress is recorded in a :class:`crawl_session.CrawlSession`
+    (:data:`src.paths.REFRESH_SESSION_FILE`). With ``resume=True`` an
+    interrupted refresh continues paging after the last recorded survey
+    page and only fetches detail pages that were not completed before.
+
+    With :data:`scrape.PIPELINE_DEPTH` set, listing and enrichment overlap
+    through :func:`list_and_enrich`.
+
+    With a cache path, pages are fetched through an
+    :class:`http_cache.HTTPCache` for the duration of the refresh, so
+    unchanged pages are revalidated instead of downloaded again.
+
+    :param resume: Continue from the previous refresh session, if any.
+    :type resume: bool
+    :param http_cache_path: SQLite file for the conditional-GET cache.
+        Defaults to :data:`HTTP_CACHE_PATH`.
+    :type http_cache_path: str or None
     :returns: Dict with key ``new`` containing the number of new records.
     :rtype: dict[str, int]
     """
-    print("Starting GradCafe refresh")
+    cache_path = http_cache_path or HTTP_CACHE_PATH
+    if not cache_path:
+        return _run_refresh(resume)
+
+    previous_cache = scrape.HTTP_CACHE
+    scrape.HTTP_CACHE = http_cache.HTTPCache(cache_path)
+    try:
+        return _run_refresh(resume)
+    finally:
+        scrape.HTTP_CACHE.close()
+        scrape.HTTP_CACHE = previous_cache
 
-    seen_ids = get_seen_ids_from_llm_extend_file()
-    new_records = scrape_new_records(seen_ids)
 
-    if not new_records:
-        print("No new records found")
-        return {"new": 0}
+def _run_refresh(resume):
+    """Run the refresh steps described in :func:`refresh`.
+
+    :param resume: Continue from the previous refresh session, if any.
+    :type resume: bool
+    :returns: Dict with key ``new`` containing the number of new records.
+    :rtype: dict[str, int]
+    """
+    print("Starting GradCafe refresh")
 
-    enriched = enrich_with_details(new_records)
-    write_new_applicant_file(enriched)
+    session = crawl_session.CrawlSession.open(
+        REFRESH_SESSION_FILE, REFRESH_CHECKPOINT_FILE, resume=resume,
+        save_every=REFRESH_SAVE_EVERY, save_every_page=True,
+    )
+    try:
+        pending = list(session.pending.values())
+        enriched = session.completed_records
+
+        if scrape.PIPELINE_DEPTH > 0:
+            enriched = enriched + list_and_enrich(session, pending)
+            pending = []
+        elif not session.listing_done:
+            seen_ids = load_seen_ids()
+            try:
+                pending += scrape_new_records(seen_ids, session=session)
+            finally:
+                _close_seen_ids(seen_ids)
+            session.finish_listing()
+
+        if pending:
+            enriched = enriched + enrich_with_details(
+                pending, on_complete=session.record_completed,
+            )
+
+        if not enriched:
+            print("No new records found")
+            session.clear()
+            return {"new": 0}
+
+        write_new_applicant_file(enriched)
+        session.clear()
+    finally:
+        session.close()
 
     print(f"Refresh complete; added {len(enriched)} records")
     return {"new": len(enriched)}
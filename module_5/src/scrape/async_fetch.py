@@ -0,0 +1,380 @@
+"""
+Asyncio HTTP fetch engine for GradCafe pages.
+
+Implements a small HTTP/1.1 GET client on top of asyncio streams so that
+hundreds of page requests can be in flight on a single thread, bounded by
+a configurable in-flight limit. :func:`fetch_many` keeps connections
+alive and reuses them per host for the duration of the call. Errors are raised as the same
+``HTTPError`` / ``URLError`` types that ``urllib`` uses, so callers can
+treat both fetch engines identically.
+"""
+
+# Import asyncio for the event loop, streams and timeouts
+import asyncio
+
+# Import ssl for HTTPS connections
+import ssl
+
+# Import suppress to ignore errors from a peer that already hung up
+from contextlib import suppress
+
+# Import urllib errors so failures match the threaded fetch path
+from urllib.error import URLError, HTTPError
+
+# Import URL helpers for splitting request targets and resolving redirects
+from urllib.parse import urljoin, urlsplit
+
+# Import the headers and redirect rules shared with the other fetch paths
+try:
+    from .http_common import DEFAULT_HEADERS, MAX_REDIRECTS, REDIRECT_CODES
+except ImportError:  # pragma: no cover
+    from http_common import DEFAULT_HEADERS, MAX_REDIRECTS, REDIRECT_CODES
+
+# Base pause in seconds between retry attempts
+RETRY_BACKOFF = 2
+
+# TLS settings for every HTTPS connection, built once: loading the CA bundle
+# is far more expensive than the handshake that uses it
+SSL_CONTEXT = ssl.create_default_context()
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections of one event loop, keyed by origin."""
+
+    def __init__(self):
+        self._idle = {}
+
+    def take(self, key):
+        """Return an idle ``(reader, writer)`` pair for ``key``, if any.
+
+        :param key: ``(scheme, host, port)`` of the target.
+        :type key: tuple
+        :rtype: tuple[asyncio.StreamReader, asyncio.StreamWriter] or None
+        """
+        idle = self._idle.get(key)
+        return idle.pop() if idle else None
+
+    def release(self, key, connection):
+        """Keep a connection whose response was fully read for later requests.
+
+        :param key: ``(scheme, host, port)`` of the target.
+        :type key: tuple
+        :param connection: ``(reader, writer)`` pair.
+        :type connection: tuple
+        """
+        self._idle.setdefault(key, []).append(connection)
+
+    async def close(self):
+        """Close every idle connection."""
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                await _close(writer)
+
+
+async def _close(writer):
+    """Close a connection and wait until its transport is released.
+
+    :param writer: Stream writer of the connection.
+    :type writer: asyncio.StreamWriter
+    """
+    writer.close()
+    with suppress(OSError):
+        await writer.wait_closed()
+
+
+def _reusable(headers):
+    """Whether a connection can carry another request after this response.
+
+    Bodies delimited by end-of-stream and responses announcing
+    ``Connection: close`` end the connection.
+
+    :param headers: Lower-cased response headers.
+    :type headers: dict[str, str]
+    :rtype: bool
+    """
+    if headers.get("connection", "").lower() == "close":
+        return False
+    return ("content-length" in headers
+            or headers.get("transfer-encoding", "").lower() == "chunked")
+
+
+def _build_request(parts, headers, keep_alive=False):
+    """Build the raw bytes of an HTTP/1.1 GET request.
+
+    :param parts: Result of :func:`urllib.parse.urlsplit` for the target URL.
+    :type parts: urllib.parse.SplitResult
+    :param headers: Extra request headers.
+    :type headers: dict[str, str]
+    :param keep_alive: Ask the server to keep the connection open.
+    :type keep_alive: bool
+    :returns: Encoded request line and headers.
+    :rtype: bytes
+    """
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    lines = [
+        f"GET {path} HTTP/1.1",
+        f"Host: {parts.netloc}",
+        "Accept-Encoding: identity",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _read_headers(reader):
+    """Read the status line and headers of an HTTP response.
+
+    :param reader: Stream positioned at the start of the response.
+    :type reader: asyncio.StreamReader
+    :returns: Tuple of ``(status, reason, headers)`` with lower-cased
+        header names.
+    :rtype: tuple[int, str, dict[str, str]]
+    :raises ValueError: If the status line is malformed.
+    """
+    status_line = (await reader.readline()).decode("latin-1").strip()
+    _version, status, reason = (status_line.split(" ", 2) + [""])[:3]
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(status), reason, headers
+
+
+async def _read_body(reader, headers):
+    """Read a response body using chunked, length-delimited or EOF framing.
+
+    :param reader: Stream positioned just after the response headers.
+    :type reader: asyncio.StreamReader
+    :param headers: Lower-cased response headers.
+    :type headers: dict[str, str]
+    :returns: Raw body bytes.
+    :rtype: bytes
+    """
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                # Skip any trailers and the blank line ending the message, so
+                # a kept-alive connection starts at the next response
+                while (await reader.readline()).strip():
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return b"".join(chunks)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+async def _request_once(url, timeout, headers, pool=None):
+    """Perform a single GET request without retries or redirects.
+
+    With a ``pool``, an idle connection to the same origin is reused when
+    there is one, and the connection is returned to the pool if the
+    response leaves it usable. A reused connection the server has closed
+    in the meantime is replaced by a new one.
+
+    :param url: Absolute ``http`` or ``https`` URL.
+    :type url: str
+    :param timeout: Seconds allowed for the whole request.
+    :type timeout: float
+    :param headers: Extra request headers.
+    :type headers: dict[str, str]
+    :param pool: Keep-alive connections of the running event loop.
+    :type pool: _ConnectionPool or None
+    :returns: Tuple of ``(status, reason, headers, body)``.
+    :rtype: tuple[int, str, dict[str, str], bytes]
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    key = (parts.scheme, parts.hostname, parts.port or (443 if secure else 80))
+
+    async def exchange(connection):
+        reader, writer = connection
+        keep = False
+        try:
+            writer.write(_build_request(parts, headers, keep_alive=pool is not None))
+            await writer.drain()
+            status, reason, response_headers = await _read_headers(reader)
+            body = await _read_body(reader, response_headers)
+            keep = pool is not None and _reusable(response_headers)
+            return status, reason, response_headers, body
+        finally:
+            if keep:
+                pool.release(key, connection)
+            else:
+                await _close(writer)
+
+    async def request():
+        idle = pool.take(key) if pool is not None else None
+        if idle is not None:
+            try:
+                return await exchange(idle)
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                pass  # closed by the server while idle; use a new connection
+        connection = await asyncio.open_connection(
+            key[1], key[2], ssl=SSL_CONTEXT if secure else None,
+        )
+        return await exchange(connection)
+
+    return await asyncio.wait_for(request(), timeout)
+
+
+async def _paced_request(url, timeout, headers, controller, pool):
+    """Perform :func:`_request_once` under an optional rate controller.
+
+    :param url: Absolute ``http`` or ``https`` URL.
+    :type url: str
+    :param timeout: Seconds allowed for the whole request.
+    :type timeout: float
+    :param headers: Extra request headers.
+    :type headers: dict[str, str]
+    :param controller: Shared pacer, or ``None`` to send immediately.
+    :type controller: rate_control.RateController or None
+    :param pool: Keep-alive connections, or ``None`` for one per request.
+    :type pool: _ConnectionPool or None
+    :returns: Tuple of ``(status, reason, headers, body)``.
+    :rtype: tuple[int, str, dict[str, str], bytes]
+    """
+    if controller is None:
+        return await _request_once(url, timeout, headers, pool)
+    started = await controller.acquire_async()
+    status = None
+    try:
+        response = await _request_once(url, timeout, headers, pool)
+        status = response[0]
+        return response
+    finally:
+        controller.release(started, status)
+
+
+async def fetch_html_async(url, timeout=30, retries=3, backoff=None,  # pylint: disable=too-many-arguments
+                           headers=None, *, controller=None, pool=None):
+    """Fetch a page on the running event loop with retry logic.
+
+    Mirrors ``scrape.fetch_html``: follows redirects, retries up to
+    ``retries`` times with a linearly growing pause between attempts, and
+    raises the last error once all attempts are exhausted.
+
+    :param url: URL to fetch.
+    :type url: str
+    :param timeout: Seconds allowed per attempt.
+    :type timeout: float
+    :param retries: Number of attempts before raising.
+    :type retries: int
+    :param backoff: Base pause in seconds between attempts. Defaults to
+        :data:`RETRY_BACKOFF`.
+    :type backoff: float or None
+    :param headers: Request headers. Defaults to :data:`DEFAULT_HEADERS`.
+    :type headers: dict[str, str] or None
+    :param controller: Optional shared rate controller that paces every
+        request and receives its latency and status.
+    :type controller: rate_control.RateController or None
+    :param pool: Keep-alive connections to reuse; by default each request
+        opens and closes its own connection.
+    :type pool: _ConnectionPool or None
+    :returns: Decoded HTML string.
+    :rtype: str
+    :raises HTTPError: If the server returns an HTTP error on the final attempt.
+    :raises URLError: If the connection fails on the final attempt.
+    """
+    headers = DEFAULT_HEADERS if headers is None else headers
+    backoff = RETRY_BACKOFF if backoff is None else backoff
+    last_error = None
+    for attempt in range(retries):
+        try:
+            target = url
+            for _ in range(MAX_REDIRECTS + 1):
+                status, reason, response_headers, body = await _paced_request(
+                    target, timeout, headers, controller, pool,
+                )
+                if status in REDIRECT_CODES and "location" in response_headers:
+                    target = urljoin(target, response_headers["location"])
+                    continue
+                break
+            if status >= 400 or status in REDIRECT_CODES:
+                raise HTTPError(target, status, reason, response_headers, None)
+            return body.decode("utf-8")
+        except HTTPError as e:
+            last_error = e
+        except (OSError, ValueError, asyncio.TimeoutError,
+                asyncio.IncompleteReadError) as e:
+            last_error = URLError(e)
+        if attempt < retries - 1:
+            await asyncio.sleep(backoff * (attempt + 1))
+    raise last_error
+
+
+async def fetch_many(urls, max_in_flight=200, timeout=30, parse=None, **kwargs):
+    """Fetch many URLs concurrently with a bounded number in flight.
+
+    Starts at most ``max_in_flight`` workers that pull URLs from a shared
+    iterator, so memory stays flat regardless of how many URLs are given.
+    Each body is passed through ``parse`` (if provided) as soon as it
+    arrives. Connections are kept alive and reused per host until every
+    URL is done. A failure for one URL does not stop the others; the exception
+    is stored in that URL's result slot instead.
+
+    :param urls: URLs to fetch.
+    :type urls: list[str]
+    :param max_in_flight: Maximum concurrent requests.
+    :type max_in_flight: int
+    :param timeout: Seconds allowed per attempt.
+    :type timeout: float
+    :param parse: Optional callable applied to each decoded body.
+    :type parse: callable or None
+    :param kwargs: Extra keyword arguments for :func:`fetch_html_async`.
+    :returns: Results aligned with ``urls``; each item is the (parsed)
+        body or the exception raised for that URL.
+    :rtype: list
+    """
+    results = [None] * len(urls)
+    pending = iter(enumerate(urls))
+    pool = _ConnectionPool()
+
+    async def worker():
+        for index, url in pending:
+            try:
+                html = await fetch_html_async(url, timeout=timeout, pool=pool, **kwargs)
+                results[index] = parse(html) if parse else html
+            except Exception as exc:  # pylint: disable=broad-except
+                results[index] = exc
+
+    workers = max(1, min(max_in_flight, len(urls)))
+    try:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+    finally:
+        await pool.close()
+    return results
+
+
+def run_fetch_many(urls, max_in_flight=200, timeout=30, parse=None, **kwargs):
+    """Synchronous entry point for :func:`fetch_many`.
+
+    Runs a fresh event loop to completion, so it can be called from plain
+    (non-async) code such as ``scrape_data`` or a worker thread.
+
+    :param urls: URLs to fetch.
+    :type urls: list[str]
+    :param max_in_flight: Maximum concurrent requests.
+    :type max_in_flight: int
+    :param timeout: Seconds allowed per attempt.
+    :type timeout: float
+    :param parse: Optional callable applied to each decoded body.
+    :type parse: callable or None
+    :param kwargs: Extra keyword arguments for :func:`fetch_html_async`.
+    :returns: Results aligned with ``urls``.
+    :rtype: list
+    """
+    return asyncio.run(
+        fetch_many(urls, max_in_flight=max_in_flight, timeout=timeout,
+                   parse=parse, **kwargs)
+    )
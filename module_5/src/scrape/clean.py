@@ -8,15 +8,83 @@ values into a consistent schema, and writes the cleaned output to disk.
 # Import JSON utilities
 import json
 
+# Import os for CPU counts and atomic renames
+import os
+
 # Import regular expressions for date parsing
 import re
 
+# Import sys to intern repeated column values
+import sys
+
+# Import deque to keep parallel chunks in input order
+from collections import deque
+
+# Import ProcessPoolExecutor to clean chunks on several cores
+from concurrent.futures import ProcessPoolExecutor
+
+# Import lru_cache for the bounded status memo
+from functools import lru_cache
+
+# Import islice to split the input into column batches
+from itertools import islice
+
+# Import methodcaller to pull one field out of every record at C speed
+from operator import methodcaller
+
+# Import the compact record type cleaned records are built as (plain import
+# when run as a script from src/scrape/)
+try:
+    from .record import FIELDS, INTERNED, ApplicantRecord, json_default
+except ImportError:  # pragma: no cover
+    from record import FIELDS, INTERNED, ApplicantRecord, json_default
+
 # Input file containing raw scraped data
 RAW_FILE = "applicant_data.json"
 
 # Output file containing cleaned applicant data
 OUT_FILE = "applicant_data.json"
 
+# clean_data engine: "rows" cleans record by record; "columns" transposes
+# batches of records and normalizes each column in bulk
+CLEAN_ENGINE = "rows"
+
+# Records transposed together by the "columns" engine
+CLEAN_BATCH = 50000
+
+# Records per task handed to a clean_file worker process
+CLEAN_CHUNK = 10000
+
+# Characters read from the input file at a time by clean_file
+READ_BLOCK = 1 << 20
+
+# Runs of JSON text that hold no structural bracket: anything outside
+# strings other than brackets and quotes, plus complete string literals
+_JSON_FILLER = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+
+# Distinct raw statuses remembered by normalize_status
+STATUS_MEMO_SIZE = 4096
+
+# Classifies a lowercased status in one match; the lookaheads keep the
+# "wait" test ahead of "interview" wherever each word appears
+_STATUS_KIND = re.compile(
+    r"(?P<wait>(?=.*wait))|(?P<interview>(?=.*interview))"
+    r"|(?P<decision>accepted|rejected)",
+    re.DOTALL,
+)
+
+# Day and month of a decision, e.g. "6 Feb" in "Accepted on 6 Feb"
+_DECISION_DATE = re.compile(
+    r"\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b"
+)
+
+# Cleaned-schema fields, in output order
+CLEAN_FIELDS = (
+    "program_name", "university", "degree_type", "comments", "date_added",
+    "url_link", "applicant_status", "start_term", "International/US",
+    "gre_general", "gre_verbal", "gre_analytical_writing", "gpa",
+)
+
 
 def load_data():
     """Load raw applicant data from disk.
@@ -61,6 +129,9 @@ def _normalize_status(status):
        just ``"Decision"`` if not.
     5. Returns the status unchanged for anything else.
 
+    Rules 2-4 are decided by one precompiled match on the lowercased
+    status. Callers should use the memoized :func:`normalize_status`.
+
     :param status: Raw applicant status string, or ``None``.
     :type status: str or None
     :returns: Normalized status string.
@@ -69,58 +140,268 @@ def _normalize_status(status):
     if not status:
         return ""
 
-    lower = status.lower()
-
-    if "wait" in lower:
+    match = _STATUS_KIND.match(status.lower())
+    if match is None:
+        return status
+    if match.lastgroup == "wait":
         return "Waitlisted"
-
-    if "interview" in lower:
+    if match.lastgroup == "interview":
         return "Interview"
 
-    if lower.startswith("accepted") or lower.startswith("rejected"):
-        decision = status.split()[0].rstrip(":")
-        match = re.search(
-            r"\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b",
-            status
-        )
-        if not match:
-            return decision
-        return f"{decision}: {match.group(1)} {match.group(2)}"
+    decision = status.split()[0].rstrip(":")
+    date = _DECISION_DATE.search(status)
+    if not date:
+        return decision
+    return f"{decision}: {date.group(1)} {date.group(2)}"
+
+
+# Memoized _normalize_status shared by the cleaners and the database loader;
+# raw statuses repeat heavily, so almost every call is a memo hit
+normalize_status = lru_cache(maxsize=STATUS_MEMO_SIZE)(_normalize_status)
+
+
+def status_memo_stats():
+    """Report how well :func:`normalize_status` is being memoized.
+
+    :returns: ``hits``, ``misses``, ``size`` (distinct statuses held),
+        ``maxsize`` and ``hit_rate`` (``0.0`` before the first call).
+    :rtype: dict
+    """
+    info = normalize_status.cache_info()
+    calls = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / calls if calls else 0.0,
+    }
+
+
+def clean_record(r):
+    """Convert one raw scraped record into the final normalized schema.
+
+    Applies :func:`_norm` to all text fields and :func:`normalize_status`
+    to the applicant status field.
+
+    :param r: Raw applicant record dict as returned by the scraper.
+    :type r: dict
+    :returns: Cleaned applicant record.
+    :rtype: record.ApplicantRecord
+    """
+    return ApplicantRecord({
+        "program_name": _norm(r.get("program_name")),
+        "university": _norm(r.get("university")),
+        "degree_type": _norm(r.get("degree_type")),
+        "comments": _norm(r.get("comments")),
+        "date_added": _norm(r.get("date_added")),
+        "url_link": _norm(r.get("url_link")),
+        "applicant_status": normalize_status(_norm(r.get("applicant_status"))),
+        "start_term": _norm(r.get("start_term")),
+        "International/US": _norm(r.get("International/US")),
+        "gre_general": _norm(r.get("gre_general")),
+        "gre_verbal": _norm(r.get("gre_verbal")),
+        "gre_analytical_writing": _norm(r.get("gre_analytical_writing")),
+        "gpa": _norm(r.get("gpa")),
+    })
+
 
-    return status
+def iter_clean_records(raw_records):
+    """Lazily clean a stream of raw records.
+
+    :param raw_records: Raw applicant record dicts, e.g. from
+        :func:`scrape.iter_enriched_records`.
+    :type raw_records: collections.abc.Iterable[dict]
+    :returns: Generator of cleaned records, in input order.
+    :rtype: collections.abc.Iterator[record.ApplicantRecord]
+    """
+    for r in raw_records:
+        yield clean_record(r)
+
+
+def _norm_column(values):
+    """Apply :func:`_norm` to a whole column.
+
+    Columns with many repeated values (university, status, term, scores)
+    are normalized once per distinct value and mapped back through a
+    lookup table; mostly-unique columns use an inlined comprehension.
+
+    :param values: Raw column values.
+    :type values: list[str or None]
+    :returns: Normalized values, aligned with ``values``.
+    :rtype: list[str]
+    """
+    sample = values[:1000]
+    if len(set(sample)) * 2 <= len(sample):
+        table = {value: _norm(value) for value in set(values)}
+        return list(map(table.__getitem__, values))
+    return [" ".join(value.split()) if value else "" for value in values]
 
 
-def clean_data(raw_records):
+def clean_columns(raw_records):
+    """Clean one batch of records column by column.
+
+    Produces exactly the records :func:`clean_record` would. Every field is
+    pulled out of the batch as a column, normalized with
+    :func:`_norm_column`, statuses are normalized once per distinct value,
+    repeated values are interned in bulk, and the records are rebuilt with
+    :meth:`record.ApplicantRecord.from_rows`.
+
+    :param raw_records: Raw applicant records.
+    :type raw_records: list[dict]
+    :returns: Cleaned records, in input order.
+    :rtype: list[record.ApplicantRecord]
+    """
+    columns = []
+    for field in CLEAN_FIELDS:
+        column = _norm_column(list(map(methodcaller("get", field), raw_records)))
+        if field == "applicant_status":
+            table = {value: normalize_status(value) for value in set(column)}
+            column = list(map(table.__getitem__, column))
+        if FIELDS[field] in INTERNED:
+            column = list(map(sys.intern, column))
+        columns.append(column)
+    return ApplicantRecord.from_rows(CLEAN_FIELDS, zip(*columns))
+
+
+def clean_data(raw_records, engine=None):
     """Convert raw scraped records into the final normalized schema.
 
-    Iterates over ``raw_records``, applying :func:`_norm` to all text
-    fields and :func:`_normalize_status` to the applicant status field.
+    Applies :func:`clean_record` to every record in ``raw_records``, or,
+    with the ``"columns"`` engine, runs :func:`clean_columns` over batches
+    of :data:`CLEAN_BATCH` records. Both engines return identical records.
 
     :param raw_records: List of raw applicant record dicts as returned
         by the scraper.
     :type raw_records: list[dict]
-    :returns: List of cleaned applicant record dicts conforming to the
+    :param engine: ``"rows"`` or ``"columns"``. Defaults to
+        :data:`CLEAN_ENGINE`.
+    :type engine: str or None
+    :returns: List of cleaned applicant records conforming to the
         application schema.
-    :rtype: list[dict]
+    :rtype: list[record.ApplicantRecord]
     """
+    if (engine or CLEAN_ENGINE) != "columns":
+        return list(iter_clean_records(raw_records))
+
     cleaned = []
-    for r in raw_records:
-        cleaned.append({
-            "program_name": _norm(r.get("program_name")),
-            "university": _norm(r.get("university")),
-            "degree_type": _norm(r.get("degree_type")),
-            "comments": _norm(r.get("comments")),
-            "date_added": _norm(r.get("date_added")),
-            "url_link": _norm(r.get("url_link")),
-            "applicant_status": _normalize_status(_norm(r.get("applicant_status"))),
-            "start_term": _norm(r.get("start_term")),
-            "International/US": _norm(r.get("International/US")),
-            "gre_general": _norm(r.get("gre_general")),
-            "gre_verbal": _norm(r.get("gre_verbal")),
-            "gre_analytical_writing": _norm(r.get("gre_analytical_writing")),
-            "gpa": _norm(r.get("gpa")),
-        })
-    return cleaned
+    records = iter(raw_records)
+    while True:
+        batch = list(islice(records, CLEAN_BATCH))
+        if not batch:
+            return cleaned
+        cleaned.extend(clean_columns(batch))
+
+
+def _iter_array_items(f, block_size=READ_BLOCK):
+    """Yield the source text of each object in a JSON array file.
+
+    Only brackets outside string literals are tracked, so the text is
+    never decoded here; at most one block plus the current object is held.
+
+    :param f: Text file positioned before the opening ``[``.
+    :type f: io.TextIOBase
+    :param block_size: Characters read per refill.
+    :type block_size: int
+    :returns: Generator of the JSON text of each top-level object.
+    :rtype: collections.abc.Iterator[str]
+    :raises ValueError: If the file ends before the array is closed.
+    """
+    buf = ""
+    pos = 0
+    depth = -1  # until the array's own opening bracket is read
+    start = None
+    while True:
+        pos = _JSON_FILLER.match(buf, pos).end()
+        if pos == len(buf) or buf[pos] == '"':
+            # A block boundary split a string literal (or hit end of block)
+            more = f.read(block_size)
+            if not more:
+                raise ValueError("JSON array is not closed")
+            keep = pos if start is None else start
+            buf = buf[keep:] + more
+            pos -= keep
+            start = None if start is None else 0
+            continue
+        if buf[pos] in "{[":
+            if depth == 0:
+                start = pos
+            depth += 1
+        elif depth == 0:
+            return
+        else:
+            depth -= 1
+            if depth == 0:
+                yield buf[start:pos + 1]
+                start = None
+        pos += 1
+
+
+def _clean_chunk(items):
+    """Parse, clean and serialize one chunk of records in a worker process.
+
+    :param items: JSON text of each raw record.
+    :type items: list[str]
+    :returns: The cleaned records as they appear inside the output array,
+        joined by ``",\n  "``.
+    :rtype: str
+    """
+    records = json.loads("[" + ",".join(items) + "]")
+    text = json.dumps(
+        clean_columns(records), indent=2, ensure_ascii=False, default=json_default,
+    )
+    return text[4:-2]
+
+
+def clean_file(raw_path=None, out_path=None, processes=None, chunk_size=None):
+    """Re-clean a raw JSON array file on several cores.
+
+    Splits the input into chunks of ``chunk_size`` records without decoding
+    it, parses, cleans and serializes each chunk in a process pool, and
+    writes the chunks back in input order. Only ``2 * processes`` chunks
+    are in flight at once, so memory stays bounded however large the file
+    is. The output is identical to :func:`save_data` of :func:`clean_data`
+    and may overwrite the input, since it is renamed into place at the end.
+
+    :param raw_path: Raw JSON array file. Defaults to :data:`RAW_FILE`.
+    :type raw_path: str or None
+    :param out_path: Cleaned output file. Defaults to :data:`OUT_FILE`.
+    :type out_path: str or None
+    :param processes: Worker processes. Defaults to the CPU count.
+    :type processes: int or None
+    :param chunk_size: Records per worker task. Defaults to
+        :data:`CLEAN_CHUNK`.
+    :type chunk_size: int or None
+    :returns: Number of records written.
+    :rtype: int
+    """
+    out_path = out_path or OUT_FILE
+    processes = processes or os.cpu_count()
+    chunk_size = chunk_size or CLEAN_CHUNK
+    count = 0
+    tmp_path = out_path + ".tmp"
+    with open(raw_path or RAW_FILE, "r", encoding="utf-8") as src, \
+            open(tmp_path, "w", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=processes) as pool:
+        items = _iter_array_items(src)
+        pending = deque()
+        chunks_written = 0
+        out.write("[")
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if chunk:
+                pending.append(pool.submit(_clean_chunk, chunk))
+                count += len(chunk)
+            if pending and (not chunk or len(pending) > 2 * processes):
+                out.write(",\n  " if chunks_written else "\n  ")
+                out.write(pending.popleft().result())
+                chunks_written += 1
+            elif not chunk:
+                break
+        out.write("\n]" if count else "]")
+    os.replace(tmp_path, out_path)
+    print(f"Cleaned data saved to {out_path}")
+    return count
 
 
 def save_data(data):
@@ -132,5 +413,5 @@ def save_data(data):
     :type data: list[dict]
     """
     with open(OUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        json.dump(data, f, indent=2, ensure_ascii=False, default=json_default)
     print(f"Cleaned data saved to {OUT_FILE}")
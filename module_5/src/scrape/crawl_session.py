@@ -0,0 +1,264 @@
+"""
+Resumable crawl-session state for GradCafe scrapes.
+
+A crawl session records how far a scrape has progressed so that an
+interrupted run can pick up where it stopped instead of starting again
+from survey page 1. It is made of three files:
+
+- a small JSON state file holding the last completed survey page, whether
+  listing has finished, and how much of the listing log that covers;
+- an append-only NDJSON listing log of survey-level records, so pending
+  records can be enriched after a restart;
+- an append-only NDJSON checkpoint of enriched records, which is also the
+  record of which result IDs are completed.
+
+Pending records are the listed ones that are not in the checkpoint, so
+the state file stays the same small size however long the crawl runs.
+
+The state file is rewritten every ``save_every`` listed or completed
+records rather than after every record, so a crash repeats at most that
+much work. Short runs such as a refresh can also save after every survey
+page (``save_every_page``).
+"""
+
+# Import JSON for the state file and NDJSON logs
+import json
+
+# Import os for atomic renames, fsync and file removal
+import os
+
+# Import the compact record type restored records are held as (plain
+# import when run as a script from src/scrape/)
+try:
+    from .record import ApplicantRecord, json_default
+except ImportError:  # pragma: no cover
+    from record import ApplicantRecord, json_default
+
+
+def _read_ndjson(path, limit=None):
+    """Read every valid JSON line from an NDJSON file.
+
+    :param path: Path to the NDJSON file.
+    :type path: str
+    :param limit: Only read lines within the first ``limit`` bytes.
+    :type limit: int or None
+    :returns: Tuple of ``(records, clean)`` where ``clean`` is ``False``
+        if any line (typically a torn final write) could not be parsed.
+    :rtype: tuple[list[record.ApplicantRecord], bool]
+    """
+    records = []
+    clean = True
+    consumed = 0
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                consumed += len(line)
+                if limit is not None and consumed > limit:
+                    break
+                try:
+                    records.append(ApplicantRecord.from_dict(json.loads(line)))
+                except json.JSONDecodeError:
+                    clean = False
+    except FileNotFoundError:
+        pass
+    return records, clean
+
+
+class CrawlSession:  # pylint: disable=too-many-instance-attributes
+    """Persisted crawl cursor for one scrape or refresh run.
+
+    Use :meth:`open` rather than the constructor so a previous session is
+    either restored (``resume=True``) or discarded.
+
+    :param state_path: Path to the JSON state file.
+    :type state_path: str
+    :param checkpoint_path: Path to the NDJSON checkpoint of enriched records.
+    :type checkpoint_path: str
+    :param save_every: Number of listed or completed records between
+        state-file saves.
+    :type save_every: int
+    :param save_every_page: Also save the state after each listed survey
+        page, however few records it held.
+    :type save_every_page: bool
+    """
+
+    def __init__(self, state_path, checkpoint_path, save_every=1000,
+                 save_every_page=False):
+        self.state_path = state_path
+        self.checkpoint_path = checkpoint_path
+        self.listing_path = os.path.splitext(state_path)[0] + ".listing.ndjson"
+        self.save_every = save_every
+        self.save_every_page = save_every_page
+        self.last_page = 0
+        self.listing_done = False
+        self.completed_ids = set()
+        self.pending = {}
+        self.completed_records = []
+        self._sinks = {}
+        self._listed_since_save = 0
+        self._listing_bytes = 0
+
+    @classmethod
+    def open(cls, state_path, checkpoint_path, resume=False, save_every=1000,
+             save_every_page=False):
+        """Start a new session or restore the previous one from disk.
+
+        :param state_path: Path to the JSON state file.
+        :type state_path: str
+        :param checkpoint_path: Path to the NDJSON checkpoint.
+        :type checkpoint_path: str
+        :param resume: If ``True`` and a state file exists, continue from
+            it; otherwise any previous session files are removed.
+        :type resume: bool
+        :param save_every: Records between state-file saves.
+        :type save_every: int
+        :param save_every_page: Also save after each listed survey page.
+        :type save_every_page: bool
+        :returns: The opened session.
+        :rtype: CrawlSession
+        """
+        session = cls(
+            state_path, checkpoint_path,
+            save_every=save_every, save_every_page=save_every_page,
+        )
+        if resume and os.path.exists(state_path):
+            session._restore()
+        else:
+            session._remove_files()
+        return session
+
+    def _restore(self):
+        """Load the cursor, completed records and pending records from disk.
+
+        Every record in the checkpoint counts as completed. Listed records
+        written after the last save belong to a page that will be listed
+        again, so the listing log is cut back to the saved size. A torn
+        final line in the checkpoint is dropped and the file replaced
+        without it.
+        """
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.last_page = state["last_page"]
+        self.listing_done = state["listing_done"]
+        self._listing_bytes = state["listing_bytes"]
+
+        self.completed_records, clean = _read_ndjson(self.checkpoint_path)
+        if not clean:
+            tmp_path = self.checkpoint_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self.completed_records:
+                    f.write(json.dumps(
+                        record, ensure_ascii=False, default=json_default,
+                    ) + "\n")
+            os.replace(tmp_path, self.checkpoint_path)
+        self.completed_ids = {str(r["result_id"]) for r in self.completed_records}
+
+        listed, _ = _read_ndjson(self.listing_path, limit=self._listing_bytes)
+        if os.path.exists(self.listing_path):
+            os.truncate(self.listing_path, self._listing_bytes)
+        for record in listed:
+            result_id = str(record["result_id"])
+            if result_id not in self.completed_ids:
+                self.pending.setdefault(result_id, record)
+        print(
+            f"Resuming crawl after page {self.last_page}: "
+            f"{len(self.completed_ids)} completed, {len(self.pending)} pending"
+        )
+
+    def _remove_files(self):
+        """Delete any state, listing log and checkpoint left on disk."""
+        for path in (self.state_path, self.listing_path, self.checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _sink(self, path):
+        """Return an append-mode handle for ``path``, opening it once.
+
+        :param path: File to append to.
+        :type path: str
+        :returns: Open text file.
+        :rtype: io.TextIOWrapper
+        """
+        if path not in self._sinks:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # Held open across calls and closed by close()
+            self._sinks[path] = open(  # pylint: disable=consider-using-with
+                path, "a", encoding="utf-8",
+            )
+        return self._sinks[path]
+
+    def add_listed(self, page, records):
+        """Record a completed survey page and the new records found on it.
+
+        :param page: Survey page number that was fully processed.
+        :type page: int
+        :param records: New survey-level records from that page.
+        :type records: list[dict]
+        """
+        sink = self._sink(self.listing_path)
+        for record in records:
+            sink.write(
+                json.dumps(record, ensure_ascii=False, default=json_default) + "\n"
+            )
+            self.pending[str(record["result_id"])] = record
+        self.last_page = page
+        self._listed_since_save += len(records)
+        if self.save_every_page or self._listed_since_save >= self.save_every:
+            self.save()
+
+    def finish_listing(self):
+        """Mark survey listing as finished and save the state."""
+        self.listing_done = True
+        self.save()
+
+    def record_completed(self, record):
+        """Append an enriched record to the checkpoint and mark it completed.
+
+        :param record: Enriched record carrying its ``result_id``.
+        :type record: dict
+        """
+        sink = self._sink(self.checkpoint_path)
+        sink.write(
+            json.dumps(record, ensure_ascii=False, default=json_default) + "\n"
+        )
+        result_id = str(record["result_id"])
+        self.completed_ids.add(result_id)
+        self.pending.pop(result_id, None)
+        if len(self.completed_ids) % self.save_every == 0:
+            self.save()
+            print(
+                f"Checkpointed {len(self.completed_ids)} records to "
+                f"{self.checkpoint_path}"
+            )
+
+    def save(self):
+        """Flush the logs to disk and atomically rewrite the state file."""
+        for sink in self._sinks.values():
+            sink.flush()
+            os.fsync(sink.fileno())
+        if self.listing_path in self._sinks:
+            self._listing_bytes = os.path.getsize(self.listing_path)
+        state = {
+            "last_page": self.last_page,
+            "listing_done": self.listing_done,
+            "listing_bytes": self._listing_bytes,
+        }
+        os.makedirs(
+            os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True,
+        )
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+        self._listed_since_save = 0
+
+    def close(self):
+        """Close the listing log and checkpoint handles."""
+        for sink in self._sinks.values():
+            sink.close()
+        self._sinks = {}
+
+    def clear(self):
+        """End the session and delete its files from disk."""
+        self.close()
+        self._remove_files()
@@ -0,0 +1,198 @@
+"""
+Concurrent detail-page fetching for GradCafe scrapes.
+
+Two ways of running detail fetches alongside other work, split out of
+:mod:`scrape` so that module stays focused on fetching and parsing:
+
+- :class:`DetailPipeline` fetches detail pages on a thread pool while
+  survey pages are still being listed, with a bound on outstanding fetches;
+- :func:`iter_details_in_processes` fetches on I/O threads and parses the
+  pages in worker processes taken from a :class:`ParsePool`.
+
+Both take the fetch and parse callables and their pool sizes as arguments;
+:mod:`scrape` binds them to its own configuration.
+"""
+
+# Import deque for the queue of finished fetches
+from collections import deque
+
+# Import multiprocessing to start parser processes with spawn
+import multiprocessing
+
+# Import threading to guard the shared parser pool
+import threading
+
+# Import the executors and wait helpers that run the fetches
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait,
+)
+
+
+class ParsePool:
+    """Parser processes shared by every :func:`iter_details_in_processes` call.
+
+    Spawned workers pay for interpreter start-up and for importing the
+    parser on their first task, so the pool is started once, on first use,
+    and reused across batches. Asking for a different size shuts the
+    current pool down and starts a new one. Workers are started with
+    ``spawn`` because forking a process that is running fetch threads is
+    not safe.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, processes):
+        """Return the pool of ``processes`` workers, starting it if needed.
+
+        :param processes: Number of parser processes.
+        :type processes: int
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+        with self._lock:
+            if self._executor is not None and self._size != processes:
+                self._executor.shutdown()
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._size = processes
+            return self._executor
+
+    def close(self):
+        """Shut the worker processes down; the next :meth:`get` restarts them."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+def iter_details_in_processes(result_ids, fetch_html, parse_html, parsers, threads):
+    """Fetch detail pages on I/O threads and parse them in worker processes.
+
+    Each of the ``threads`` fetch threads downloads a page and hands the
+    raw HTML to ``parsers``, so parsing runs on several cores instead of
+    contending for the GIL with the fetch threads. Spawned workers import
+    the parser module afresh, so any configuration it reads at runtime
+    must be bound into ``parse_html`` (e.g. with :func:`functools.partial`).
+
+    :param result_ids: Result IDs to fetch.
+    :type result_ids: list
+    :param fetch_html: Called with a result ID; returns the page HTML.
+    :type fetch_html: callable
+    :param parse_html: Picklable callable parsing that HTML.
+    :type parse_html: callable
+    :param parsers: Process pool running ``parse_html``, e.g. from
+        :meth:`ParsePool.get`.
+    :type parsers: concurrent.futures.ProcessPoolExecutor
+    :param threads: Number of fetch threads.
+    :type threads: int
+    :returns: Generator yielding, in ``result_ids`` order, each detail dict
+        or the exception raised while fetching or parsing it.
+    :rtype: collections.abc.Iterator
+    """
+    with ThreadPoolExecutor(max_workers=threads) as fetchers:
+
+        def fetch_then_parse(result_id):
+            return parsers.submit(parse_html, fetch_html(result_id))
+
+        for future in [fetchers.submit(fetch_then_parse, r) for r in result_ids]:
+            try:
+                detail = future.result().result()
+            except Exception as exc:  # pylint: disable=broad-except
+                detail = exc
+            yield detail
+
+
+class DetailPipeline:
+    """Fetch detail pages in the background while survey pages are listed.
+
+    Records handed to :meth:`submit` are fetched on a thread pool of
+    ``workers`` threads. At most ``depth`` fetches are outstanding: once
+    that many are in flight, :meth:`submit` blocks until one finishes,
+    which throttles listing to the pace of enrichment. Finished
+    ``(record, detail)`` pairs are collected in completion order through
+    :meth:`completed` and :meth:`drain`; ``detail`` is the exception
+    raised if the fetch failed.
+
+    :param fetch_detail: Called with a result ID; returns its detail dict.
+    :type fetch_detail: callable
+    :param depth: Maximum outstanding fetches.
+    :type depth: int
+    :param workers: Thread-pool size.
+    :type workers: int
+    """
+
+    def __init__(self, fetch_detail, depth, workers):
+        self.fetch_detail = fetch_detail
+        self.depth = depth
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._in_flight = {}
+        self._finished = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _collect(self, block):
+        """Move finished fetches to the completed queue.
+
+        :param block: Wait for at least one fetch to finish.
+        :type block: bool
+        """
+        if not self._in_flight:
+            return
+        done, _ = wait(
+            self._in_flight, timeout=None if block else 0,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            record = self._in_flight.pop(future)
+            try:
+                detail = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                detail = exc
+            self._finished.append((record, detail))
+
+    def submit(self, records):
+        """Start fetching the detail page of each record.
+
+        :param records: Survey-level records.
+        :type records: list[dict]
+        """
+        for record in records:
+            while len(self._in_flight) >= self.depth:
+                self._collect(block=True)
+            future = self._executor.submit(self.fetch_detail, record["result_id"])
+            self._in_flight[future] = record
+
+    def completed(self):
+        """Yield the fetches that have finished so far, without waiting.
+
+        :returns: Generator of ``(record, detail)`` pairs.
+        :rtype: collections.abc.Iterator[tuple[dict, dict or Exception]]
+        """
+        self._collect(block=False)
+        while self._finished:
+            yield self._finished.popleft()
+
+    def drain(self):
+        """Yield every remaining fetch as it finishes.
+
+        :returns: Generator of ``(record, detail)`` pairs.
+        :rtype: collections.abc.Iterator[tuple[dict, dict or Exception]]
+        """
+        while self._in_flight or self._finished:
+            self._collect(block=True)
+            while self._finished:
+                yield self._finished.popleft()
+
+    def close(self):
+        """Cancel queued fetches and shut the thread pool down."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
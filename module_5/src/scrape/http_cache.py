@@ -0,0 +1,187 @@
+"""
+On-disk conditional-GET cache for GradCafe pages.
+
+Stores zlib-compressed response bodies in a SQLite file, keyed by URL,
+together with their ``ETag`` / ``Last-Modified`` validators. A repeat
+fetch sends those validators as ``If-None-Match`` / ``If-Modified-Since``
+so that an unchanged page comes back as a bodiless ``304 Not Modified``
+and is served from disk. The cache is bounded by total compressed size
+and evicts least-recently-used pages first.
+
+The total stored size is tracked in memory, eviction walks an index on
+the access stamp, and writes are committed ``commit_every`` operations at
+a time (and on :meth:`HTTPCache.close`), so a cached fetch does not pay
+for a table scan or a disk sync.
+"""
+
+# Import os to create the cache directory
+import os
+
+# Import sqlite3 for the single-file on-disk store
+import sqlite3
+
+# Import threading so fetch worker threads can share one cache
+import threading
+
+# Import zlib to compress stored bodies
+import zlib
+
+
+class HTTPCache:  # pylint: disable=too-many-instance-attributes
+    """Size-bounded LRU cache of page bodies and their validators.
+
+    :param path: Path to the SQLite cache file (created if missing).
+    :type path: str
+    :param max_bytes: Maximum total compressed body size kept on disk.
+    :type max_bytes: int
+    :param commit_every: Loads and stores between commits.
+    :type commit_every: int
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, commit_every=256):
+        self.max_bytes = max_bytes
+        self.commit_every = commit_every
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " body BLOB, size INTEGER, accessed INTEGER)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)"
+        )
+        self._db.commit()
+        self._clock, self._bytes = self._db.execute(
+            "SELECT COALESCE(MAX(accessed), 0), COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()
+        self._uncommitted = 0
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _tick(self):
+        """Advance and return the LRU access counter (caller holds the lock).
+
+        :returns: Next access stamp.
+        :rtype: int
+        """
+        self._clock += 1
+        return self._clock
+
+    def _written(self):
+        """Count one write and commit every :attr:`commit_every` writes.
+
+        The caller must hold the lock.
+        """
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def validators(self, url):
+        """Return conditional-request headers for a cached URL.
+
+        :param url: Page URL.
+        :type url: str
+        :returns: ``If-None-Match`` / ``If-Modified-Since`` headers, or an
+            empty dict if the URL is not cached.
+        :rtype: dict[str, str]
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified FROM pages WHERE url = ?", (url,),
+            ).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def load(self, url):
+        """Return the cached body for a URL answered with ``304``.
+
+        Also marks the page as most recently used.
+
+        :param url: Page URL.
+        :type url: str
+        :returns: Decompressed body, or ``None`` if it is no longer cached.
+        :rtype: bytes or None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM pages WHERE url = ?", (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE pages SET accessed = ? WHERE url = ?", (self._tick(), url),
+            )
+            self._written()
+            self.counters["hits"] += 1
+        return zlib.decompress(row[0])
+
+    def store(self, url, body, headers):
+        """Cache a fresh response body if it carries a validator.
+
+        Responses without ``ETag`` or ``Last-Modified`` cannot be
+        revalidated, so they are not stored. Storing may evict the
+        least-recently-used pages to stay within :attr:`max_bytes`.
+
+        :param url: Page URL.
+        :type url: str
+        :param body: Raw response body.
+        :type body: bytes
+        :param headers: Response headers with lower-cased names.
+        :type headers: dict[str, str]
+        """
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        blob = zlib.compress(body)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size FROM pages WHERE url = ?", (url,),
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, blob, len(blob), self._tick()),
+            )
+            self._bytes += len(blob) - (row[0] if row else 0)
+            self.counters["stores"] += 1
+            self._evict()
+            self._written()
+
+    def _evict(self):
+        """Delete least-recently-used pages until under :attr:`max_bytes`.
+
+        The caller must hold the lock.
+        """
+        while self._bytes > self.max_bytes:
+            url, size = self._db.execute(
+                "SELECT url, size FROM pages ORDER BY accessed LIMIT 1"
+            ).fetchone()
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._bytes -= size
+            self.counters["evictions"] += 1
+
+    def stats(self):
+        """Return cache size and hit/miss counters.
+
+        :returns: Dict with keys ``entries``, ``bytes``, ``hits``,
+            ``misses``, ``stores`` and ``evictions``.
+        :rtype: dict[str, int]
+        """
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            return {"entries": entries, "bytes": self._bytes, **self.counters}
+
+    def close(self):
+        """Commit pending writes and close the SQLite connection."""
+        with self._lock:
+            self._db.commit()
+            self._db.close()
@@ -0,0 +1,17 @@
+"""
+HTTP settings shared by the GradCafe fetch paths.
+
+The ``urllib`` path in :mod:`scrape`, the keep-alive pool in
+:mod:`http_pool` and the asyncio client in :mod:`async_fetch` all send the
+same headers and follow redirects the same way; the constants live here so
+the three cannot drift apart.
+"""
+
+# Headers sent with every request
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Status codes that are followed as redirects
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+
+# Maximum number of redirects followed for a single URL
+MAX_REDIRECTS = 5
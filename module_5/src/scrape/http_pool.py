@@ -0,0 +1,233 @@
+"""
+Keep-alive HTTP connection pool for GradCafe requests.
+
+Reuses persistent ``http.client`` connections across calls and threads so
+that each page fetch does not pay for a new TCP and TLS handshake.
+Connections are pooled per ``(scheme, host, port)`` and the pool keeps
+counters of how many connections were opened and how many requests were
+served over an already-open connection.
+"""
+
+# Import http.client for persistent HTTP/1.1 connections
+import http.client
+
+# Import threading so the pool can be shared by worker threads
+import threading
+
+# Import urllib errors so failures match the urllib fetch path
+from urllib.error import URLError, HTTPError
+
+# Import URL helpers for pool keys and redirect resolution
+from urllib.parse import urljoin, urlsplit
+
+# Import the headers and redirect rules shared with the other fetch paths
+try:
+    from .http_common import DEFAULT_HEADERS, MAX_REDIRECTS, REDIRECT_CODES
+except ImportError:  # pragma: no cover
+    from http_common import DEFAULT_HEADERS, MAX_REDIRECTS, REDIRECT_CODES
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP(S) connections.
+
+    A thread takes an idle connection for its host (or opens a new one),
+    performs one request, and hands the connection back if the server
+    allowed keep-alive. At most ``maxsize`` idle connections are kept per
+    host; extras are closed when released.
+
+    :param maxsize: Maximum idle connections kept per host.
+    :type maxsize: int
+    :param timeout: Socket timeout in seconds for new connections.
+    :type timeout: float
+    :param headers: Headers sent with every request.
+    :type headers: dict[str, str] or None
+    """
+
+    def __init__(self, maxsize=10, timeout=30, headers=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.counters = {"connections_created": 0, "connections_reused": 0, "requests": 0}
+
+    def _new_connection(self, key):
+        """Open a new connection for a pool key.
+
+        :param key: ``(scheme, host, port)`` tuple.
+        :type key: tuple
+        :returns: Unconnected ``http.client`` connection.
+        :rtype: http.client.HTTPConnection
+        """
+        scheme, host, port = key
+        conn_class = (
+            http.client.HTTPSConnection if scheme == "https"
+            else http.client.HTTPConnection
+        )
+        with self._lock:
+            self.counters["connections_created"] += 1
+        return conn_class(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        """Take an idle connection for ``key`` or open a new one.
+
+        :param key: ``(scheme, host, port)`` tuple.
+        :type key: tuple
+        :returns: Tuple of ``(connection, reused)``.
+        :rtype: tuple[http.client.HTTPConnection, bool]
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.counters["connections_reused"] += 1
+                return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key, conn):
+        """Return a connection to the pool, or close it if the pool is full.
+
+        :param key: ``(scheme, host, port)`` tuple.
+        :type key: tuple
+        :param conn: Connection whose response has been fully read.
+        :type conn: http.client.HTTPConnection
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _send(self, conn, parts, headers, method="GET", body=None):
+        """Send a request on ``conn`` and read the whole response.
+
+        :param conn: Connection to use.
+        :type conn: http.client.HTTPConnection
+        :param parts: Split target URL.
+        :type parts: urllib.parse.SplitResult
+        :param headers: Request headers.
+        :type headers: dict[str, str]
+        :param method: HTTP method.
+        :type method: str
+        :param body: Request body, if any.
+        :type body: bytes or None
+        :returns: Tuple of ``(response, body)``.
+        :rtype: tuple[http.client.HTTPResponse, bytes]
+        """
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+
+    def request(self, url, headers=None, method="GET", body=None):
+        """Perform a single request over a pooled connection.
+
+        A request that fails on a reused connection is retried once on a
+        fresh one, since the server may have closed an idle keep-alive
+        socket. Only send idempotent requests through the pool.
+
+        :param url: Absolute ``http`` or ``https`` URL.
+        :type url: str
+        :param headers: Extra headers merged over the pool defaults.
+        :type headers: dict[str, str] or None
+        :param method: HTTP method.
+        :type method: str
+        :param body: Request body, if any.
+        :type body: bytes or None
+        :returns: Tuple of ``(status, reason, headers, body)`` with
+            lower-cased header names.
+        :rtype: tuple[int, str, dict[str, str], bytes]
+        :raises URLError: If the connection or protocol exchange fails.
+        """
+        parts = urlsplit(url)
+        default_port = 443 if parts.scheme == "https" else 80
+        key = (parts.scheme, parts.hostname, parts.port or default_port)
+        merged = {**self.headers, **(headers or {})}
+
+        conn, reused = self._acquire(key)
+        with self._lock:
+            self.counters["requests"] += 1
+        try:
+            try:
+                response, payload = self._send(conn, parts, merged, method, body)
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if not reused:
+                    raise
+                conn = self._new_connection(key)
+                response, payload = self._send(conn, parts, merged, method, body)
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            raise URLError(e) from e
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        response_headers = {k.lower(): v for k, v in response.getheaders()}
+        return response.status, response.reason, response_headers, payload
+
+    def fetch(self, url, headers=None):
+        """Fetch ``url``, following redirects, and return the final response.
+
+        A ``304 Not Modified`` answer to a conditional request is returned
+        rather than raised.
+
+        :param url: Absolute ``http`` or ``https`` URL.
+        :type url: str
+        :param headers: Extra headers merged over the pool defaults.
+        :type headers: dict[str, str] or None
+        :returns: Tuple of ``(status, headers, body)`` with lower-cased
+            header names.
+        :rtype: tuple[int, dict[str, str], bytes]
+        :raises HTTPError: If the final response has an error status.
+        :raises URLError: If the connection fails.
+        """
+        target = url
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, response_headers, body = self.request(target, headers)
+            location = response_headers.get("location")
+            if status not in REDIRECT_CODES or not location:
+                break
+            target = urljoin(target, location)
+        if status >= 400 or status in REDIRECT_CODES:
+            raise HTTPError(target, status, reason, response_headers, None)
+        return status, response_headers, body
+
+    def get(self, url, headers=None):
+        """Fetch ``url``, following redirects, and return the body.
+
+        :param url: Absolute ``http`` or ``https`` URL.
+        :type url: str
+        :param headers: Extra headers merged over the pool defaults.
+        :type headers: dict[str, str] or None
+        :returns: Raw response body.
+        :rtype: bytes
+        :raises HTTPError: If the final response has an error status.
+        :raises URLError: If the connection fails.
+        """
+        return self.fetch(url, headers)[2]
+
+    def stats(self):
+        """Return pool size and connection-reuse counters.
+
+        :returns: Dict with keys ``idle_connections``, ``maxsize``,
+            ``connections_created``, ``connections_reused`` and ``requests``.
+        :rtype: dict[str, int]
+        """
+        with self._lock:
+            return {
+                "idle_connections": sum(len(v) for v in self._idle.values()),
+                "maxsize": self.maxsize,
+                **self.counters,
+            }
+
+    def close(self):
+        """Close every idle connection held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
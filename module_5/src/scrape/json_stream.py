@@ -0,0 +1,74 @@
+"""
+Streaming JSON output for scraped and cleaned records.
+
+Scrapes and cleaning runs produce tens of thousands of records. These
+helpers write them as a pretty-printed JSON array one record at a time,
+and turn a crawl's NDJSON checkpoint into that array, without ever
+holding the whole list in memory.
+"""
+
+# Import JSON to serialize each record
+import json
+
+# Import os for the atomic rename and checkpoint removal
+import os
+
+# Import the encoder hook for compact records (plain import when run as a
+# script from src/scrape/)
+try:
+    from .record import json_default
+except ImportError:  # pragma: no cover
+    from record import json_default
+
+
+def write_json_array(records, output_path):
+    """Stream records into a JSON array file.
+
+    Produces byte-for-byte the same layout as ``json.dump(records,
+    indent=2, ensure_ascii=False)`` while holding one record at a time.
+    The array is written to a temporary file and renamed over
+    ``output_path`` once ``records`` is exhausted.
+
+    :param records: Record dicts to write.
+    :type records: collections.abc.Iterable[dict]
+    :param output_path: Path of the JSON array file to produce.
+    :type output_path: str
+    :returns: Number of records written.
+    :rtype: int
+    """
+    count = 0
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for record in records:
+            text = json.dumps(
+                record, indent=2, ensure_ascii=False, default=json_default,
+            )
+            out.write(",\n  " if count else "\n  ")
+            out.write(text.replace("\n", "\n  "))
+            count += 1
+        out.write("\n]" if count else "]")
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def compact_checkpoint(checkpoint_path, output_path):
+    """Stream an NDJSON checkpoint into the final JSON array file.
+
+    The records are streamed through :func:`write_json_array` without
+    loading every record at once, after which the checkpoint is removed.
+    A missing checkpoint (nothing was scraped) yields an empty array.
+
+    :param checkpoint_path: Path to the NDJSON checkpoint.
+    :type checkpoint_path: str
+    :param output_path: Path of the JSON array file to produce.
+    :type output_path: str
+    :returns: Number of records written.
+    :rtype: int
+    """
+    if not os.path.exists(checkpoint_path):
+        return write_json_array([], output_path)
+    with open(checkpoint_path, "r", encoding="utf-8") as src:
+        count = write_json_array((json.loads(line) for line in src), output_path)
+    os.remove(checkpoint_path)
+    return count
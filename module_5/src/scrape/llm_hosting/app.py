@@ -3,19 +3,32 @@
 
 from __future__ import annotations
 
+import atexit
+import hashlib
 import json
+import multiprocessing
 import os
+import pickle
 import re
 import sys
-import difflib
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, List, Tuple
 
 from flask import Flask, jsonify, request
 from huggingface_hub import hf_hub_download
 try:
-    from llama_cpp import Llama
+    from llama_cpp import Llama, __version__ as LLAMA_CPP_VERSION
 except ImportError:
     Llama = None  # CPU-only by default if N_GPU_LAYERS=0
+    LLAMA_CPP_VERSION = None
+
+try:
+    from .fuzzy_index import FuzzyIndex
+    from .llm_cache import LLMCache, version_tag
+except ImportError:  # run as a script from llm_hosting/
+    from fuzzy_index import FuzzyIndex
+    from llm_cache import LLMCache, version_tag
 
 app = Flask(__name__)
 
@@ -33,8 +46,34 @@ N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
 
-CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
-CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
+# Default to files beside this module, whatever the working directory
+_HERE = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.getenv("MODEL_DIR", os.path.join(_HERE, "models"))
+
+# Persistent result cache; set LLM_CACHE_PATH="" to disable it
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(MODEL_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000"))
+
+# Program strings packed into one chat completion; 1 keeps one prompt per row
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "1"))
+
+# Reply tokens budgeted per row of a batched completion, plus the array around them
+BATCH_TOKENS_PER_ROW = 64
+BATCH_TOKENS_EXTRA = 32
+
+# Chat-template tokens assumed around each message (role markers, separators)
+TEMPLATE_TOKENS_PER_MESSAGE = 8
+
+# Generation worker processes, each with its own llama.cpp context on the same
+# memory-mapped GGUF file and N_THREADS // LLM_WORKERS threads; 1 stays in-process
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "1"))
+
+# Reuse the evaluated KV state of the fixed system + few-shot prefix
+PREFIX_CACHE = os.getenv("PREFIX_CACHE", "1") != "0"
+
+# Default to the lists shipped beside this file, whatever the working directory
+CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", os.path.join(_HERE, "canon_universities.txt"))
+CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", os.path.join(_HERE, "canon_programs.txt"))
 
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
@@ -70,6 +109,82 @@ COMMON_PROG_FIXES: Dict[str, str] = {
     "Info Studies": "Information Studies",
 }
 
+# ---------------- Rules-first fast path ----------------
+# Answer inputs whose halves are canonical names or known aliases without
+# running the model; set FAST_PATH=0 to send everything to the LLM
+FAST_PATH = os.getenv("FAST_PATH", "1") != "0"
+FAST_PATH_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+_FAST_PATH_LOCK = threading.Lock()  # request handlers run on several threads
+
+
+def _canon_key(name: str) -> str:
+    """Lookup key that ignores case, spacing, '&' vs 'and' and . , ' marks."""
+    s = (name or "").casefold().replace("&", " and ")
+    s = re.sub(r"[.,'’]", "", s)
+    return " ".join(s.split())
+
+
+def _build_index(canon: List[str], fixes: Dict[str, str]) -> Dict[str, str]:
+    """Map keys of canonical names and known misspellings to the canonical name.
+
+    Keys shared by two different canonical names are left out, so a lookup
+    hit is never a guess.
+    """
+    index: Dict[str, str] = {}
+    ambiguous = set()
+    for name in canon:
+        key = _canon_key(name)
+        if index.setdefault(key, name) != name:
+            ambiguous.add(key)
+    for alias, name in fixes.items():
+        index.setdefault(_canon_key(alias), name)
+    for key in ambiguous:
+        del index[key]
+    return index
+
+
+PROG_INDEX = _build_index(CANON_PROGS, COMMON_PROG_FIXES)
+UNI_INDEX = _build_index(CANON_UNIS, COMMON_UNI_FIXES)
+
+# Hashed exact lookup plus indexed fuzzy matching over the canonical lists
+PROG_MATCHER = FuzzyIndex(CANON_PROGS)
+UNI_MATCHER = FuzzyIndex(CANON_UNIS)
+
+
+def _fast_path(program_text: str) -> Dict[str, str] | None:
+    """Standardize ``program_text`` by lookup alone, or return None.
+
+    Splits like :func:`_split_fallback`, but only at the first separator so
+    names such as "University of California, Berkeley" stay whole. Both
+    halves must resolve through the canonical indexes (the university may
+    also match ``ABBREV_UNI``); anything else is left to the model.
+    """
+    if not FAST_PATH:
+        return None
+    s = re.sub(r"\s+", " ", (program_text or "")).strip().strip(",")
+    parts = [p.strip() for p in re.split(r",| at | @ ", s, maxsplit=1)]
+    prog = PROG_INDEX.get(_canon_key(parts[0]))
+    uni = None
+    if prog and len(parts) == 2:
+        uni = next(
+            (full for pat, full in ABBREV_UNI.items() if re.fullmatch(pat, parts[1])),
+            None,
+        ) or UNI_INDEX.get(_canon_key(parts[1]))
+    with _FAST_PATH_LOCK:
+        FAST_PATH_STATS["misses" if uni is None else "hits"] += 1
+    if uni is None:
+        return None
+    return {"standardized_program": prog, "standardized_university": uni}
+
+
+def _fast_path_stats() -> Dict[str, float]:
+    """Fast-path hits, misses and hit rate since start-up."""
+    with _FAST_PATH_LOCK:
+        stats = dict(FAST_PATH_STATS)
+    lookups = stats["hits"] + stats["misses"]
+    return {**stats, "hit_rate": stats["hits"] / lookups if lookups else 0.0}
+
+
 # ---------------- Few-shot prompt ----------------
 SYSTEM_PROMPT = (
     "You are a data cleaning assistant. Standardize degree program and university "
@@ -113,33 +228,95 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
-_LLM: Llama | None = None
+BATCH_SYSTEM_PROMPT = (
+    SYSTEM_PROMPT.replace(
+        "- Input provides a single string under key `program` that may contain both "
+        "program and university.\n",
+        "- Input provides a JSON array under key `rows`; each row has an `id` and a "
+        "`program` string that may contain both program and university.\n",
+    ).replace(
+        "Return JSON ONLY with keys:\n"
+        "  standardized_program, standardized_university\n",
+        "Return ONLY a JSON array with one object per input row, in the same order, "
+        "with keys:\n"
+        "  id, standardized_program, standardized_university\n",
+    )
+)
 
+# The single-row few-shots folded into one batched example
+BATCH_FEW_SHOT: Tuple[Dict[str, Any], List[Dict[str, Any]]] = (
+    {"rows": [{"id": i, **x_in} for i, (x_in, _) in enumerate(FEW_SHOTS)]},
+    [{"id": i, **x_out} for i, (_, x_out) in enumerate(FEW_SHOTS)],
+)
 
-def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
-    global _LLM
-    if _LLM is not None:
-        return _LLM
+JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+_LLM: Llama | None = None
+_CACHE: LLMCache | None = None
+_PREFIX_STATES: Dict[str, Any] = {}
+_LLM_LOCK = threading.Lock()  # llama.cpp contexts are not thread-safe
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS = 0
 
-    model_path = hf_hub_download(
+
+def _model_path() -> str:
+    """Download (or reuse) the GGUF file and return its local path."""
+    return hf_hub_download(
         repo_id=MODEL_REPO,
         filename=MODEL_FILE,
-        local_dir="models",
+        local_dir=MODEL_DIR,
         local_dir_use_symlinks=False,
         force_filename=MODEL_FILE,
     )
 
+
+def _load_llm() -> Llama:
+    """Initialize llama.cpp on the memory-mapped GGUF file, once per process."""
+    global _LLM
+    if _LLM is not None:
+        return _LLM
+
     _LLM = Llama(
-        model_path=model_path,
+        model_path=_model_path(),
         n_ctx=N_CTX,
         n_threads=N_THREADS,
         n_gpu_layers=N_GPU_LAYERS,
+        use_mmap=True,  # worker processes share the weights via the page cache
         verbose=False,
     )
     return _LLM
 
 
+def _init_worker(threads: int) -> None:
+    """Give a pool worker its share of the CPU threads."""
+    global N_THREADS
+    N_THREADS = threads
+
+
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the pool of ``workers`` generation processes, starting it on first use.
+
+    Asking for a different size shuts the current pool down and starts a new one.
+    """
+    global _POOL, _POOL_WORKERS
+    if _POOL is not None and _POOL_WORKERS != workers:
+        atexit.unregister(_POOL.shutdown)
+        _POOL.shutdown()
+        _POOL = None
+    if _POOL is None:
+        _model_path()  # download once, before the workers look for the file
+        _POOL = ProcessPoolExecutor(
+            max_workers=workers,
+            # spawn: never fork a process holding a llama.cpp context or threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(max(1, N_THREADS // workers),),
+        )
+        _POOL_WORKERS = workers
+        atexit.register(_POOL.shutdown)
+    return _POOL
+
+
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
     s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
@@ -165,12 +342,11 @@ def _split_fallback(text: str) -> Tuple[str, str]:
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
+def _best_match(name: str, matcher: FuzzyIndex, cutoff: float = 0.86) -> str | None:
+    """Fuzzy match with difflib scoring, pruned by the matcher's index."""
+    if not name or not len(matcher):
         return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+    return matcher.best_match(name, cutoff)
 
 
 def _post_normalize_program(prog: str) -> str:
@@ -178,9 +354,9 @@ def _post_normalize_program(prog: str) -> str:
     p = (prog or "").strip()
     p = COMMON_PROG_FIXES.get(p, p)
     p = p.title()
-    if p in CANON_PROGS:
+    if p in PROG_MATCHER:
         return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
+    match = _best_match(p, PROG_MATCHER, cutoff=0.84)
     return match or p
 
 
@@ -202,16 +378,44 @@ def _post_normalize_university(uni: str) -> str:
         u = re.sub(r"\bOf\b", "of", u.title())
 
     # Canonical or fuzzy map
-    if u in CANON_UNIS:
+    if u in UNI_MATCHER:
         return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
+    match = _best_match(u, UNI_MATCHER, cutoff=0.86)
     return match or u or "Unknown"
 
 
-def _call_llm(program_text: str) -> Dict[str, str]:
-    """Query the tiny LLM and return standardized fields."""
-    llm = _load_llm()
+def _load_cache() -> LLMCache | None:
+    """Open the persistent result cache once, unless it is disabled."""
+    global _CACHE
+    if _CACHE is None and LLM_CACHE_PATH:
+        # Anything that can change a result goes into the version tag
+        version = version_tag(
+            MODEL_REPO, MODEL_FILE, SYSTEM_PROMPT, FEW_SHOTS,
+            BATCH_SYSTEM_PROMPT, BATCH_FEW_SHOT,
+            CANON_UNIS, CANON_PROGS, ABBREV_UNI, COMMON_UNI_FIXES, COMMON_PROG_FIXES,
+        )
+        _CACHE = LLMCache(LLM_CACHE_PATH, version, max_entries=LLM_CACHE_MAX_ENTRIES)
+    return _CACHE
+
 
+def _call_llm(program_text: str) -> Dict[str, str]:
+    """Return standardized fields, generating them only on a cache miss."""
+    fast = _fast_path(program_text)
+    if fast is not None:
+        return fast
+    cache = _load_cache()
+    if cache is not None:
+        cached = cache.get(program_text)
+        if cached is not None:
+            return cached
+    result = _generate(program_text)
+    if cache is not None:
+        cache.put(program_text, result)
+    return result
+
+
+def _prefix_messages() -> List[Dict[str, str]]:
+    """System prompt and few-shot turns shared by every single-row request."""
     messages = [{"role": "system", "content": SYSTEM_PROMPT}]
     for x_in, x_out in FEW_SHOTS:
         messages.append(
@@ -223,21 +427,103 @@ def _call_llm(program_text: str) -> Dict[str, str]:
                 "content": json.dumps(x_out, ensure_ascii=False),
             }
         )
-    messages.append(
-        {
-            "role": "user",
-            "content": json.dumps({"program": program_text}, ensure_ascii=False),
-        }
-    )
+    return messages
+
+
+def _batch_prefix_messages() -> List[Dict[str, str]]:
+    """System prompt and few-shot turns shared by every batched request."""
+    x_in, x_out = BATCH_FEW_SHOT
+    return [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)},
+        {"role": "assistant", "content": json.dumps(x_out, ensure_ascii=False)},
+    ]
+
+
+def _prefix_tokens(llm: Llama, prefix: List[Dict[str, str]]) -> List[int]:
+    """Tokens the chat template renders for ``prefix`` ahead of a new user turn.
+
+    Found as the common start of two one-token probes that differ only in
+    the final user message, so it matches the real prompts token for token.
+    """
+    runs = []
+    for probe in ("0", "1"):
+        llm.create_chat_completion(
+            messages=prefix + [{"role": "user", "content": probe}],
+            temperature=0.0,
+            max_tokens=1,
+        )
+        runs.append(list(llm.input_ids[: llm.n_tokens]))
+    common = 0
+    for a, b in zip(*runs):
+        if a != b:
+            break
+        common += 1
+    return runs[0][:common]
+
+
+def _restore_prefix(llm: Llama, prefix: List[Dict[str, str]]) -> None:
+    """Load the evaluated state of ``prefix`` so only the new turn is evaluated.
+
+    The state is built once per llama.cpp version, model and prefix, kept in
+    memory and pickled next to the GGUF file for later processes. It is only
+    loaded when the context does not already start with the prefix tokens;
+    llama.cpp then sees that they are a prefix of the prompt and evaluates
+    just the rest.
+    """
+    if not PREFIX_CACHE:
+        return
+    key = hashlib.sha256(
+        json.dumps([LLAMA_CPP_VERSION, MODEL_REPO, MODEL_FILE, N_CTX, prefix]).encode("utf-8")
+    ).hexdigest()[:16]
+    state = _PREFIX_STATES.get(key)
+    if state is None:
+        path = os.path.join(
+            os.path.dirname(os.path.abspath(llm.model_path)),
+            f"{MODEL_FILE}.{key}.prefix-state",
+        )
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except Exception:  # pylint: disable=broad-except
+            # missing, truncated or written by another llama.cpp build: rebuild
+            tokens = _prefix_tokens(llm, prefix)
+            llm.reset()
+            llm.eval(tokens)
+            state = llm.save_state()
+            tmp_path = f"{path}.{os.getpid()}.tmp"  # pool workers may race here
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f)
+            os.replace(tmp_path, path)
+        _PREFIX_STATES[key] = state
+    n_prefix = state.n_tokens
+    if llm.n_tokens < n_prefix or (
+        list(llm.input_ids[:n_prefix]) != list(state.input_ids[:n_prefix])
+    ):
+        llm.load_state(state)
+
+
+def _complete(prefix: List[Dict[str, str]], content: str, max_tokens: int) -> str:
+    """Run one chat completion of ``content`` after the fixed ``prefix``."""
+    llm = _load_llm()
+    with _LLM_LOCK:
+        _restore_prefix(llm, prefix)
+        out = llm.create_chat_completion(
+            messages=prefix + [{"role": "user", "content": content}],
+            temperature=0.0,
+            max_tokens=max_tokens,
+            top_p=1.0,
+        )
+    return (out["choices"][0]["message"]["content"] or "").strip()
+
 
-    out = llm.create_chat_completion(
-        messages=messages,
-        temperature=0.0,
+def _generate(program_text: str) -> Dict[str, str]:
+    """Query the tiny LLM and return standardized fields."""
+    text = _complete(
+        _prefix_messages(),
+        json.dumps({"program": program_text}, ensure_ascii=False),
         max_tokens=128,
-        top_p=1.0,
     )
-
-    text = (out["choices"][0]["message"]["content"] or "").strip()
     try:
         match = JSON_OBJ_RE.search(text)
         obj = json.loads(match.group(0) if match else text)
@@ -246,14 +532,139 @@ def _call_llm(program_text: str) -> Dict[str, str]:
     except Exception:
         std_prog, std_uni = _split_fallback(program_text)
 
-    std_prog = _post_normalize_program(std_prog)
-    std_uni = _post_normalize_university(std_uni)
+    return _finalize(std_prog, std_uni)
+
+
+def _finalize(std_prog: str, std_uni: str) -> Dict[str, str]:
+    """Post-normalize raw model fields into the result dict."""
     return {
-        "standardized_program": std_prog,
-        "standardized_university": std_uni,
+        "standardized_program": _post_normalize_program(std_prog),
+        "standardized_university": _post_normalize_university(std_uni),
     }
 
 
+def _parse_batch(text: str, count: int) -> List[Tuple[str, str] | None]:
+    """Pull one (program, university) pair per row out of a batched reply.
+
+    Rows are matched by their echoed ``id``; if the model dropped the ids but
+    returned exactly ``count`` objects, they are matched by position. Rows
+    that are missing or malformed come back as ``None``.
+    """
+    objs: List[Any] = []
+    match = JSON_ARRAY_RE.search(text)
+    try:
+        parsed = json.loads(match.group(0) if match else text)
+        objs = parsed if isinstance(parsed, list) else []
+    except ValueError:
+        # Salvage whatever complete objects the reply does contain
+        for obj_text in JSON_OBJ_RE.findall(text):
+            try:
+                objs.append(json.loads(obj_text))
+            except ValueError:
+                objs.append(None)
+
+    pairs: List[Tuple[str, str] | None] = [None] * count
+    positional = len(objs) == count
+    for pos, obj in enumerate(objs):
+        if not isinstance(obj, dict):
+            continue
+        idx = obj.get("id", pos if positional else None)
+        prog = obj.get("standardized_program")
+        uni = obj.get("standardized_university")
+        if (
+            isinstance(idx, int) and 0 <= idx < count and pairs[idx] is None
+            and isinstance(prog, str) and isinstance(uni, str)
+        ):
+            pairs[idx] = (prog.strip(), uni.strip())
+    return pairs
+
+
+def _prompt_tokens(messages: List[Dict[str, str]]) -> int:
+    """Upper estimate of the context tokens ``messages`` take once templated."""
+    llm = _load_llm()
+    text = "\n".join(m["content"] for m in messages)
+    with _LLM_LOCK:
+        tokens = llm.tokenize(text.encode("utf-8"))
+    return len(tokens) + TEMPLATE_TOKENS_PER_MESSAGE * len(messages)
+
+
+def _generate_batch(program_texts: List[str]) -> List[Dict[str, str]]:
+    """Standardize several program strings with one chat completion.
+
+    The reply budget grows with the batch; a batch whose prompt leaves too
+    little of ``N_CTX`` for it is split in half, and a lone row that still
+    does not fit goes through the single-row prompt. Rows the reply does
+    not answer cleanly are retried one at a time through :func:`_generate`.
+    """
+    prefix = _batch_prefix_messages()
+    rows = [{"id": i, "program": t} for i, t in enumerate(program_texts)]
+    content = json.dumps({"rows": rows}, ensure_ascii=False)
+    room = N_CTX - _prompt_tokens(prefix + [{"role": "user", "content": content}])
+    max_tokens = BATCH_TOKENS_PER_ROW * len(program_texts) + BATCH_TOKENS_EXTRA
+    if max_tokens > room:
+        if len(program_texts) == 1:
+            return [_generate(program_texts[0])]
+        half = len(program_texts) // 2
+        return _generate_batch(program_texts[:half]) + _generate_batch(program_texts[half:])
+    text = _complete(prefix, content, max_tokens=max_tokens)
+    pairs = _parse_batch(text, len(program_texts))
+    return [
+        _finalize(*pair) if pair is not None else _generate(program_text)
+        for program_text, pair in zip(program_texts, pairs)
+    ]
+
+
+def _generate_one(chunk: List[str]) -> List[Dict[str, str]]:
+    """Generate a one-row chunk with the single-row prompt."""
+    return [_generate(chunk[0])]
+
+
+def _call_llm_batch(
+    program_texts: List[str],
+    batch_size: int | None = None,
+    workers: int | None = None,
+) -> List[Dict[str, str]]:
+    """Standardize many program strings, packing cache misses into batches.
+
+    Inputs the fast path resolves or the cache holds skip the model,
+    repeated inputs are generated once, and the rest go to the model ``batch_size`` (default
+    ``LLM_BATCH_SIZE``) at a time, spread over ``workers`` (default ``LLM_WORKERS``)
+    processes when there is more than one. Results are returned in input order.
+    """
+    batch_size = max(1, batch_size or LLM_BATCH_SIZE)
+    workers = max(1, workers or LLM_WORKERS)
+    if batch_size == 1 and workers == 1:
+        return [_call_llm(t) for t in program_texts]
+
+    cache = _load_cache()
+    results: Dict[str, Dict[str, str]] = {}
+    misses: Dict[str, None] = {}
+    for text in program_texts:
+        if text in results or text in misses:
+            continue
+        cached = _fast_path(text)
+        if cached is None and cache is not None:
+            cached = cache.get(text)
+        if cached is not None:
+            results[text] = cached
+        else:
+            misses[text] = None
+
+    pending = list(misses)
+    chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    generate = _generate_batch if batch_size > 1 else _generate_one
+    if workers > 1 and len(chunks) > 1:
+        generated = _worker_pool(workers).map(generate, chunks)
+    else:
+        generated = map(generate, chunks)
+    for chunk, chunk_results in zip(chunks, generated):
+        for text, result in zip(chunk, chunk_results):
+            results[text] = result
+            if cache is not None:
+                cache.put(text, result)
+    return [results[t] for t in program_texts]
+
+
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     """Accept either a list of rows or {'rows': [...]}."""
     if isinstance(payload, list):
@@ -263,22 +674,60 @@ def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     return []
 
 
+def read_rows(path: str) -> List[Dict[str, Any]]:
+    """Read rows from a JSON file holding a list of rows or {'rows': [...]}."""
+    with open(path, "r", encoding="utf-8") as f:
+        return _normalize_input(json.load(f))
+
+
+def load_model() -> None:
+    """Load the model now instead of on the first cache miss."""
+    _load_llm()
+
+
+def standardize_texts(
+    program_texts: List[str],
+    batch_size: int | None = None,
+    workers: int | None = None,
+) -> List[Dict[str, str]]:
+    """Standardize "program, university" strings in-process, in input order.
+
+    ``batch_size`` and ``workers`` default to ``LLM_BATCH_SIZE`` and
+    ``LLM_WORKERS``; ``batch_size=1, workers=1`` uses one completion per row.
+    """
+    return _call_llm_batch(program_texts, batch_size=batch_size, workers=workers)
+
+
 @app.get("/")
 def health() -> Any:
     """Simple liveness check."""
     return jsonify({"ok": True})
 
 
+@app.get("/cache")
+def cache_stats() -> Any:
+    """Report persistent result-cache size and hit/miss counters."""
+    cache = _load_cache()
+    return jsonify(cache.stats() if cache is not None else {"enabled": False})
+
+
+@app.get("/fast-path")
+def fast_path_stats() -> Any:
+    """Report how many inputs the rules-first fast path resolved."""
+    return jsonify(_fast_path_stats())
+
+
 @app.post("/standardize")
 def standardize() -> Any:
     """Standardize rows from an HTTP request and return JSON."""
     payload = request.get_json(force=True, silent=True)
     rows = _normalize_input(payload)
 
+    program_texts = [
+        f"{row.get('program_name','')}, {row.get('university','')}" for row in rows
+    ]
     out: List[Dict[str, Any]] = []
-    for row in rows:
-        program_text = f"{row.get('program_name','')}, {row.get('university','')}"
-        result = _call_llm(program_text)
+    for row, result in zip(rows, _call_llm_batch(program_texts)):
         row["llm-generated-program"] = result["standardized_program"]
         row["llm-generated-university"] = result["standardized_university"]
         out.append(row)
@@ -293,8 +742,7 @@ def _cli_process_file(
     to_stdout: bool,
 ) -> None:
     """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
+    rows = read_rows(in_path)
 
     sink = sys.stdout if to_stdout else None
     if not to_stdout:
@@ -305,18 +753,31 @@ def _cli_process_file(
     assert sink is not None  # for type-checkers
 
     try:
-        for row in rows:
-            program_text = f"{row.get('program_name','')}, {row.get('university','')}"
-            result = _call_llm(program_text)
-            row["llm-generated-program"] = result["standardized_program"]
-            row["llm-generated-university"] = result["standardized_university"]
-
-            json.dump(row, sink, ensure_ascii=False)
-            sink.write("\n")
+        # Rows are standardized LLM_BATCH_SIZE at a time per worker and written
+        # as each round finishes, so output still appears incrementally
+        step = max(1, LLM_BATCH_SIZE) * max(1, LLM_WORKERS)
+        for start in range(0, len(rows), step):
+            chunk = rows[start:start + step]
+            program_texts = [
+                f"{row.get('program_name','')}, {row.get('university','')}"
+                for row in chunk
+            ]
+            for row, result in zip(chunk, _call_llm_batch(program_texts)):
+                row["llm-generated-program"] = result["standardized_program"]
+                row["llm-generated-university"] = result["standardized_university"]
+
+                json.dump(row, sink, ensure_ascii=False)
+                sink.write("\n")
             sink.flush()
     finally:
         if sink is not sys.stdout:
             sink.close()
+        stats = _fast_path_stats()
+        print(
+            f"Fast path resolved {stats['hits']} of "
+            f"{stats['hits'] + stats['misses']} inputs ({stats['hit_rate']:.1%})",
+            file=sys.stderr,
+        )
 
 
 if __name__ == "__main__":
@@ -346,12 +807,28 @@ if __name__ == "__main__":
         action="store_true",
         help="Append to the output file instead of overwriting.",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Program strings per chat completion (overrides LLM_BATCH_SIZE).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Generation worker processes (overrides LLM_WORKERS).",
+    )
     parser.add_argument(
         "--stdout",
         action="store_true",
         help="Write JSON Lines to stdout instead of a file.",
     )
     args = parser.parse_args()
+    if args.batch_size:
+        LLM_BATCH_SIZE = args.batch_size
+    if args.workers:
+        LLM_WORKERS = args.workers
 
     if args.serve or args.file is None:
         port = int(os.getenv("PORT", "8000"))
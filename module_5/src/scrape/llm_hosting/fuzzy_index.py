@@ -0,0 +1,120 @@
+"""
+Indexed fuzzy matching over the canonical program and university lists.
+
+:func:`difflib.get_close_matches` runs a :class:`difflib.SequenceMatcher`
+against every candidate on each call: ``real_quick_ratio`` (lengths),
+then ``quick_ratio`` (shared characters), then the expensive ``ratio``.
+:class:`FuzzyIndex` answers exact names from a hash set and computes the
+``quick_ratio`` bound for all candidates at once from a character inverted
+index, so ``ratio`` only runs on the few candidates that can still reach
+the cutoff. It returns exactly what ``get_close_matches(name, candidates,
+n=1, cutoff=cutoff)`` returns.
+"""
+
+# Import Counter and defaultdict to count shared characters
+from collections import Counter, defaultdict
+
+# Import SequenceMatcher for the final, difflib-identical scoring
+from difflib import SequenceMatcher
+
+# Import lru_cache to memoize repeated lookups
+from functools import lru_cache
+
+
+def _min_matches(shorter, total, cutoff):
+    """Return the fewest matching characters that can reach ``cutoff``.
+
+    Uses the same float expression as :meth:`difflib.SequenceMatcher.ratio`.
+
+    :param shorter: Length of the shorter string.
+    :type shorter: int
+    :param total: Combined length of both strings.
+    :type total: int
+    :param cutoff: Minimum ratio.
+    :type cutoff: float
+    :returns: Smallest ``M`` with ``2.0 * M / total >= cutoff``, or
+        ``None`` if even ``M == shorter`` falls short (the
+        ``real_quick_ratio`` test).
+    :rtype: int or None
+    """
+    for matches in range(max(0, int(cutoff * total / 2) - 1), shorter + 1):
+        if 2.0 * matches / total >= cutoff:
+            return matches
+    return None
+
+
+class FuzzyIndex:
+    """Exact and closest-match lookup over a fixed list of names.
+
+    :param candidates: Canonical names; duplicates are ignored.
+    :type candidates: list[str]
+    :param memo_size: Distinct ``(name, cutoff)`` lookups remembered.
+    :type memo_size: int
+    """
+
+    def __init__(self, candidates, memo_size=4096):
+        self.candidates = list(dict.fromkeys(candidates))
+        self._exact = set(self.candidates)
+        self._by_length = defaultdict(list)
+        # char -> [ids holding it at least once, at least twice, ...]
+        self._levels = defaultdict(list)
+        for cid, name in enumerate(self.candidates):
+            self._by_length[len(name)].append(cid)
+            for char, count in Counter(name).items():
+                levels = self._levels[char]
+                levels.extend([] for _ in range(count - len(levels)))
+                for level in levels[:count]:
+                    level.append(cid)
+        self.best_match = lru_cache(maxsize=memo_size)(self._best_match)
+
+    def __contains__(self, name):
+        return name in self._exact
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def _best_match(self, name, cutoff=0.6):
+        """Return the closest candidate scoring at least ``cutoff``.
+
+        Exposed, memoized, as :attr:`best_match`.
+
+        :param name: Name to look up.
+        :type name: str
+        :param cutoff: Minimum :meth:`~difflib.SequenceMatcher.ratio`.
+        :type cutoff: float
+        :returns: The same name ``difflib.get_close_matches(name,
+            candidates, n=1, cutoff=cutoff)`` would return, or ``None``.
+        :rtype: str or None
+        """
+        if name in self._exact:
+            return name
+
+        # Shared characters counted with multiplicity: the numerator of
+        # quick_ratio() for every candidate, accumulated in C
+        shared = Counter()
+        levels = self._levels
+        for char, count in Counter(name).items():
+            for level in levels.get(char, ())[:count]:
+                shared.update(level)
+
+        size = len(name)
+        ids = []
+        for length, group in self._by_length.items():
+            need = _min_matches(min(length, size), length + size, cutoff)
+            if need is None:
+                continue
+            if need == 0:
+                ids.extend(group)
+            else:
+                ids.extend(cid for cid in group if shared[cid] >= need)
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(name)
+        best = None
+        for cid in ids:
+            candidate = self.candidates[cid]
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if score >= cutoff and (best is None or (score, candidate) > best):
+                best = (score, candidate)
+        return best[1] if best else None
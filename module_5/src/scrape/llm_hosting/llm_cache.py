@@ -0,0 +1,195 @@
+"""
+Persistent cache of LLM standardization results.
+
+The same program/university strings ("Computer Science, Stanford
+University") are standardized over and over, and each generation costs a
+full TinyLlama completion. :class:`LLMCache` keeps every result in a SQLite
+file keyed by the input text with case and whitespace normalized, plus a
+version tag derived from the model and prompt so that changing either one
+never serves stale results. The cache is bounded by entry count and evicts
+least-recently-used results first.
+"""
+
+# Import hashlib to derive the model/prompt version tag
+import hashlib
+
+# Import json to store results and fingerprint the prompt
+import json
+
+# Import os to create the cache directory
+import os
+
+# Import sqlite3 for the single-file on-disk store
+import sqlite3
+
+# Import threading so server threads can share one cache
+import threading
+
+
+def normalize_key(text):
+    """Return the cache key for an input string.
+
+    Case and runs of whitespace are ignored, so ``" computer  science,
+    Stanford University"`` and ``"Computer Science, Stanford University"``
+    share one entry.
+
+    :param text: Program text sent to the LLM.
+    :type text: str or None
+    :rtype: str
+    """
+    return " ".join((text or "").split()).casefold()
+
+
+def version_tag(*parts):
+    """Fingerprint everything that determines a generation's result.
+
+    :param parts: JSON-serializable values, e.g. the model file name, the
+        system prompt, the few-shot examples and the canonical lists.
+    :returns: Short hex digest that changes whenever any part changes.
+    :rtype: str
+    """
+    blob = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMCache:
+    """Entry-bounded LRU cache of standardization results.
+
+    Lookups are a single primary-key read. Recency updates for hits are
+    buffered in memory and written ``touch_every`` at a time (and on
+    :meth:`close`), so a hit does not pay for a disk commit.
+
+    :param path: Path to the SQLite cache file (created if missing).
+    :type path: str
+    :param version: Model/prompt version tag, see :func:`version_tag`.
+    :type version: str
+    :param max_entries: Maximum number of results kept on disk.
+    :type max_entries: int
+    :param touch_every: Hits buffered before their recency is written.
+    :type touch_every: int
+    """
+
+    def __init__(self, path, version, max_entries=100000, touch_every=256):
+        self.version = version
+        self.max_entries = max_entries
+        self.touch_every = touch_every
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " version TEXT, key TEXT, result TEXT, accessed INTEGER,"
+            " PRIMARY KEY (version, key))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+        )
+        self._db.commit()
+        row = self._db.execute("SELECT MAX(accessed) FROM results").fetchone()
+        self._clock = row[0] or 0
+        self._touched = {}
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _tick(self):
+        """Advance and return the LRU access counter (caller holds the lock).
+
+        :returns: Next access stamp.
+        :rtype: int
+        """
+        self._clock += 1
+        return self._clock
+
+    def get(self, text):
+        """Return the cached result for ``text``, if any.
+
+        :param text: Program text sent to the LLM.
+        :type text: str
+        :returns: The stored result dict, or ``None`` on a miss.
+        :rtype: dict or None
+        """
+        key = normalize_key(text)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM results WHERE version = ? AND key = ?",
+                (self.version, key),
+            ).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["hits"] += 1
+            self._touched[key] = self._tick()
+            if len(self._touched) >= self.touch_every:
+                self._write_touches()
+        return json.loads(row[0])
+
+    def put(self, text, result):
+        """Store the result generated for ``text``.
+
+        Storing may evict the least-recently-used results to stay within
+        :attr:`max_entries`.
+
+        :param text: Program text sent to the LLM.
+        :type text: str
+        :param result: JSON-serializable result dict.
+        :type result: dict
+        """
+        blob = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (self.version, normalize_key(text), blob, self._tick()),
+            )
+            self.counters["stores"] += 1
+            self._write_touches()
+            self._evict()
+            self._db.commit()
+
+    def _write_touches(self):
+        """Write buffered hit recency to disk (caller holds the lock)."""
+        if self._touched:
+            self._db.executemany(
+                "UPDATE results SET accessed = ? WHERE version = ? AND key = ?",
+                [(stamp, self.version, key) for key, stamp in self._touched.items()],
+            )
+            self._db.commit()
+            self._touched = {}
+
+    def _evict(self):
+        """Delete least-recently-used results beyond :attr:`max_entries`.
+
+        Entries of other versions are never hit again, so they age out
+        first. The caller must hold the lock.
+        """
+        excess = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess -= self.max_entries
+        if excess > 0:
+            cursor = self._db.execute(
+                "DELETE FROM results WHERE rowid IN"
+                " (SELECT rowid FROM results ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            self.counters["evictions"] += cursor.rowcount
+
+    def stats(self):
+        """Return cache size and hit/miss counters.
+
+        :returns: Dict with keys ``entries``, ``hits``, ``misses``,
+            ``stores``, ``evictions`` and ``hit_rate``.
+        :rtype: dict
+        """
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "entries": entries,
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        """Write buffered recency and close the SQLite connection."""
+        with self._lock:
+            self._write_touches()
+        self._db.close()
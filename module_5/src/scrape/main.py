@@ -9,23 +9,59 @@ schema, and writes the cleaned output to disk.
 # Import cleaning module for normalizing scraped data
 import clean
 
+# Import the on-disk conditional-GET cache for --cache
+import http_cache
+
+# Import the streaming JSON array writer for --stream
+import json_stream
+
+# Import the adaptive request pacer for --adaptive-rate
+import rate_control
+
 # Import scraping module for collecting raw GradCafe data
 import scrape
 
 
-def main():
+def main(resume=False, stream=False, reclean=False):
     """Run the full scrape-and-clean pipeline.
 
-    Calls :func:`scrape.scrape_data` to collect raw applicant records,
-    persists the raw data via :func:`scrape.save_data`, normalizes the
-    records into the application schema via :func:`clean.clean_data`, and
-    writes the cleaned output via :func:`clean.save_data`.
+    Calls :func:`scrape.scrape_data` to collect raw applicant records (it
+    writes the raw data to :data:`scrape.OUTPUT_FILE` itself by compacting
+    its checkpoint), normalizes the records into the application schema via
+    :func:`clean.clean_data`, and writes the cleaned output via
+    :func:`clean.save_data`.
+
+    With ``stream=True`` records instead flow one at a time through
+    :func:`scrape.iter_survey_records`, :func:`scrape.iter_enriched_records`
+    and :func:`clean.iter_clean_records` into
+    :func:`json_stream.write_json_array`, so memory stays bounded by
+    :data:`scrape.STREAM_BATCH` rather than growing with
+    :data:`scrape.MAX_RECORDS`. Streaming runs keep no crawl session and
+    cannot be resumed.
+
+    With ``reclean=True`` nothing is scraped: the raw dump at
+    :data:`clean.RAW_FILE` is cleaned again on every core by
+    :func:`clean.clean_file`, e.g. after the normalization rules change.
+
+    :param resume: Continue an interrupted scrape from its crawl session.
+    :type resume: bool
+    :param stream: Run the bounded-memory generator pipeline.
+    :type stream: bool
+    :param reclean: Only re-clean the existing raw dump, in parallel.
+    :type reclean: bool
     """
-    # Scrape raw applicant records from GradCafe
-    raw_records = scrape.scrape_data()
+    if reclean:
+        clean.clean_file()
+        return
 
-    # Save raw scraped data to disk
-    scrape.save_data(raw_records)
+    if stream:
+        records = scrape.iter_enriched_records(scrape.iter_survey_records())
+        count = json_stream.write_json_array(clean.iter_clean_records(records), clean.OUT_FILE)
+        print(f"Cleaned data saved to {clean.OUT_FILE} ({count} records)")
+        return
+
+    # Scrape raw applicant records from GradCafe (saved to disk as they complete)
+    raw_records = scrape.scrape_data(resume=resume)
 
     # Normalize raw records into final cleaned schema
     cleaned = clean.clean_data(raw_records)
@@ -35,4 +71,45 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Import argparse only when run from the command line
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape and clean GradCafe data.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted scrape from its saved crawl session.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Scrape, enrich, clean and write records as a bounded-memory stream.",
+    )
+    parser.add_argument(
+        "--reclean",
+        action="store_true",
+        help="Skip scraping and re-clean the raw dump across all CPU cores.",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Revalidate pages against an on-disk HTTP cache at PATH.",
+    )
+    parser.add_argument(
+        "--adaptive-rate",
+        action="store_true",
+        help="Pace requests with the adaptive AIMD rate controller.",
+    )
+    args = parser.parse_args()
+    if args.adaptive_rate:
+        scrape.RATE_CONTROLLER = rate_control.RateController(
+            concurrency=scrape.NUM_WORKERS,
+        )
+    if args.cache:
+        scrape.HTTP_CACHE = http_cache.HTTPCache(args.cache)
+    try:
+        main(resume=args.resume, stream=args.stream, reclean=args.reclean)
+    finally:
+        # Commit buffered cache writes even if the run fails
+        if scrape.HTTP_CACHE is not None:
+            scrape.HTTP_CACHE.close()
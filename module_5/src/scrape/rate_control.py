@@ -0,0 +1,280 @@
+"""
+Adaptive request-rate controller for GradCafe fetches.
+
+A single :class:`RateController` is shared by every fetch path (``urllib``,
+the keep-alive pool, the conditional-GET cache and the asyncio engine). It
+paces requests with a token bucket, adds random jitter so workers do not
+fire in lock-step, and caps how many requests are in flight at once.
+
+Both the rate and the concurrency limit are tuned by
+additive-increase/multiplicative-decrease (AIMD): every fast, successful
+response raises them a little, while a ``429``, a ``5xx``, a connection
+error or a response slower than the latency target cuts them by a
+constant factor (at most once per cool-down period). Throughput therefore
+climbs until the site pushes back and then settles just below that point.
+"""
+
+# Import asyncio for the event-loop variant of acquire
+import asyncio
+
+# Import random for pacing jitter
+import random
+
+# Import threading so fetch threads can share one controller
+import threading
+
+# Import time for the monotonic clock and blocking waits
+import time
+
+# Import contextmanager for the per-request slot helper
+from contextlib import contextmanager
+
+# Import HTTPError to read the status of failed responses
+from urllib.error import HTTPError
+
+# Seconds an event-loop caller waits before re-checking a full set of slots
+SLOT_POLL_INTERVAL = 0.01
+
+# Slack when comparing the float token count, so rounding cannot stall a wait
+TOKEN_EPSILON = 1e-9
+
+
+class RateController:  # pylint: disable=too-many-instance-attributes
+    """Token-bucket pacer with AIMD-tuned rate and concurrency.
+
+    :param rate: Initial request rate in requests per second.
+    :type rate: float
+    :param concurrency: Initial limit on requests in flight.
+    :type concurrency: int
+    :param max_rate: Upper bound on the rate.
+    :type max_rate: float
+    :param max_concurrency: Upper bound on the concurrency limit.
+    :type max_concurrency: int
+    :param latency_target: Responses slower than this many seconds count
+        as congestion.
+    :type latency_target: float
+    :param jitter: Maximum random delay, as a fraction of the request
+        interval, added to each wait.
+    :type jitter: float
+    :param clock: Monotonic clock returning seconds.
+    :type clock: callable
+    """
+
+    # Lower bounds that a decrease never goes below
+    MIN_RATE = 0.5
+    MIN_CONCURRENCY = 1
+
+    # Additive increase per successful request, spread over the current
+    # rate/concurrency so each grows by about this much per round
+    RATE_STEP = 1.0
+    CONCURRENCY_STEP = 1.0
+
+    # Multiplicative decrease applied on congestion
+    DECREASE_FACTOR = 0.5
+
+    def __init__(self, rate=5.0, concurrency=10, max_rate=50.0,  # pylint: disable=too-many-arguments
+                 max_concurrency=64, latency_target=2.0, *, jitter=0.1,
+                 clock=time.monotonic):
+        self.limits = {
+            "max_rate": max_rate,
+            "max_concurrency": max_concurrency,
+            "latency_target": latency_target,
+            "jitter": jitter,
+        }
+        self.rate = rate
+        self.concurrency = float(concurrency)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._slot_free = threading.Condition(self._lock)
+        self._tokens = 1.0
+        self._last_refill = clock()
+        self._last_decrease = None
+        self.in_flight = 0
+        self.counters = {"requests": 0, "throttled": 0, "errors": 0, "slow": 0}
+
+    @property
+    def max_concurrency(self):
+        """Upper bound on in-flight requests, for sizing worker pools.
+
+        :rtype: int
+        """
+        return self.limits["max_concurrency"]
+
+    def _slots_full(self):
+        """Return whether the concurrency limit is reached (caller holds the lock).
+
+        :rtype: bool
+        """
+        return self.in_flight >= int(self.concurrency)
+
+    def _reserve(self):
+        """Take a token and a slot if both are free.
+
+        :returns: ``0`` once a request may start, ``None`` if every slot is
+            busy, otherwise the number of seconds until the next token.
+        :rtype: float or None
+        """
+        with self._lock:
+            if self._slots_full():
+                return None
+            return self._take_token()
+
+    def _take_token(self):
+        """Refill the bucket and take a token and slot if a token is ready.
+
+        The caller must hold the lock and have checked for a free slot.
+
+        :returns: ``0`` if the request may start, otherwise the seconds to
+            wait (plus jitter) before the next token.
+        :rtype: float
+        """
+        now = self._clock()
+        self._tokens = min(1.0, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        if self._tokens < 1.0 - TOKEN_EPSILON:
+            wait = (1.0 - self._tokens) / self.rate
+            return wait + random.uniform(0, self.limits["jitter"] / self.rate)
+        self._tokens = max(0.0, self._tokens - 1.0)
+        self.in_flight += 1
+        self.counters["requests"] += 1
+        return 0
+
+    def acquire(self, sleep=time.sleep):
+        """Block until a request may be sent.
+
+        Waits on a condition (not a poll) while every slot is busy, and
+        sleeps for the token-bucket delay when pacing.
+
+        :param sleep: Function used to wait for the next token.
+        :type sleep: callable
+        :returns: Clock reading at which the request starts, to pass to
+            :meth:`release`.
+        :rtype: float
+        """
+        while True:
+            with self._slot_free:
+                self._slot_free.wait_for(lambda: not self._slots_full())
+                wait = self._take_token()
+            if not wait:
+                return self._clock()
+            sleep(wait)
+
+    async def acquire_async(self):
+        """Event-loop variant of :meth:`acquire`.
+
+        The event loop must not block on the thread condition, so a full
+        set of slots is re-checked every :data:`SLOT_POLL_INTERVAL`.
+
+        :returns: Clock reading at which the request starts.
+        :rtype: float
+        """
+        wait = self._reserve()
+        while wait != 0:
+            await asyncio.sleep(SLOT_POLL_INTERVAL if wait is None else wait)
+            wait = self._reserve()
+        return self._clock()
+
+    @contextmanager
+    def slot(self, sleep=time.sleep):
+        """Wrap one blocking request: acquire, then release with its outcome.
+
+        A normal exit counts as a success, an :class:`HTTPError` reports
+        its status code and any other exception counts as a failed request.
+
+        :param sleep: Function used to wait.
+        :type sleep: callable
+        """
+        started = self.acquire(sleep)
+        status = None
+        try:
+            yield
+            status = 200
+        except HTTPError as e:
+            status = e.code
+            raise
+        finally:
+            self.release(started, status)
+
+    def release(self, started, status=None):
+        """Report a finished request and adapt the rate and concurrency.
+
+        :param started: Value returned by :meth:`acquire`.
+        :type started: float
+        :param status: HTTP status of the response, or ``None`` if the
+            request failed without one (connection error or timeout).
+        :type status: int or None
+        """
+        with self._slot_free:
+            self._release_locked(started, status)
+            free = int(self.concurrency) - self.in_flight
+            if free > 0:
+                self._slot_free.notify(free)
+
+    def _release_locked(self, started, status):
+        """Apply the AIMD update for one finished request (caller holds the lock).
+
+        :param started: Value returned by :meth:`acquire`.
+        :type started: float
+        :param status: HTTP status, or ``None`` for a failed request.
+        :type status: int or None
+        """
+        self.in_flight -= 1
+        now = self._clock()
+        latency = now - started
+        if status is None:
+            self.counters["errors"] += 1
+        elif status == 429 or status >= 500:
+            self.counters["throttled"] += 1
+        elif latency > self.limits["latency_target"]:
+            self.counters["slow"] += 1
+        else:
+            self.rate = min(self.limits["max_rate"],
+                            self.rate + self.RATE_STEP / self.rate)
+            self.concurrency = min(self.limits["max_concurrency"],
+                                   self.concurrency + self.CONCURRENCY_STEP / self.concurrency)
+            return
+        self._decrease(now)
+
+    def _decrease(self, now):
+        """Cut rate and concurrency, at most once per latency-target period.
+
+        The caller must hold the lock.
+
+        :param now: Current clock reading.
+        :type now: float
+        """
+        cooldown = self.limits["latency_target"]
+        if self._last_decrease is not None and now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.rate = max(self.MIN_RATE, self.rate * self.DECREASE_FACTOR)
+        self.concurrency = max(self.MIN_CONCURRENCY,
+                               self.concurrency * self.DECREASE_FACTOR)
+
+    def stats(self):
+        """Return the current rate, limits and outcome counters.
+
+        :returns: Dict with keys ``rate``, ``concurrency``, ``in_flight``,
+            ``requests``, ``throttled``, ``errors`` and ``slow``.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2),
+                "concurrency": int(self.concurrency),
+                "in_flight": self.in_flight,
+                **self.counters,
+            }
+
+    def report(self):
+        """Return a one-line summary of the current rate for logging.
+
+        :rtype: str
+        """
+        stats = self.stats()
+        return (
+            f"Request rate {stats['rate']:.2f}/s, concurrency "
+            f"{stats['concurrency']}, {stats['requests']} requests "
+            f"({stats['throttled']} throttled, {stats['errors']} errors, "
+            f"{stats['slow']} slow)"
+        )
@@ -0,0 +1,190 @@
+"""
+Compact in-memory representation of one GradCafe applicant record.
+
+Survey, detail and cleaned records share the same handful of keys, and a
+large scrape keeps tens of thousands of them alive at once. As plain dicts
+each record carries its own hash table and its own copies of strings such
+as the university, status and start term. :class:`ApplicantRecord` stores
+the fields in ``__slots__`` instead and interns the highly repeated values,
+so equal strings are shared between records.
+
+It is a :class:`collections.abc.MutableMapping` keyed by the original JSON
+field names, so code written against record dicts keeps working, and it
+remembers key insertion order so :meth:`ApplicantRecord.to_dict` (and
+:func:`json_default`) reproduce the dict the record was built from.
+"""
+
+# Import sys for string interning
+import sys
+
+# Import MutableMapping so records behave like the dicts they replace
+from collections.abc import MutableMapping
+
+# JSON field name -> slot name, for every field the pipeline produces
+FIELDS = {
+    "result_id": "result_id",
+    "university": "university",
+    "program_name": "program_name",
+    "degree_type": "degree_type",
+    "date_added": "date_added",
+    "applicant_status": "applicant_status",
+    "start_term": "start_term",
+    "International/US": "citizenship",
+    "comments": "comments",
+    "url_link": "url_link",
+    "gre_general": "gre_general",
+    "gre_verbal": "gre_verbal",
+    "gre_analytical_writing": "gre_analytical_writing",
+    "gpa": "gpa",
+    "llm-generated-program": "llm_program",
+    "llm-generated-university": "llm_university",
+}
+
+# Slots whose values repeat across many records and are interned
+INTERNED = frozenset({
+    "university", "program_name", "degree_type", "date_added",
+    "applicant_status", "start_term", "citizenship",
+    "llm_program", "llm_university",
+})
+
+# Shared key-order tuples, so records with the same layout share one tuple
+_LAYOUTS = {}
+
+
+def _layout(keys):
+    """Return the shared tuple equal to ``keys``.
+
+    :param keys: Field names in insertion order.
+    :type keys: tuple[str, ...]
+    :rtype: tuple[str, ...]
+    """
+    return _LAYOUTS.setdefault(keys, keys)
+
+
+class ApplicantRecord(MutableMapping):
+    """Slotted, dict-compatible applicant record.
+
+    Keys outside :data:`FIELDS` are accepted and kept in a per-record dict
+    that is only created when needed.
+
+    :param data: Optional mapping or iterable of pairs to copy in.
+    :type data: collections.abc.Mapping or collections.abc.Iterable
+    """
+
+    __slots__ = ("_keys", "_extra") + tuple(FIELDS.values())
+
+    def __init__(self, data=()):
+        self._keys = ()
+        self._extra = None
+        if data:
+            self.update(data)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a record dict, e.g. one line of a JSON file.
+
+        :param data: Record dict.
+        :type data: dict
+        :rtype: ApplicantRecord
+        """
+        return cls(data)
+
+    @classmethod
+    def from_rows(cls, keys, rows):
+        """Build many records that share one key layout.
+
+        Skips the per-key bookkeeping of :meth:`__setitem__`; the caller
+        is responsible for interning repeated values beforehand.
+
+        :param keys: Field names, all in :data:`FIELDS`, in output order.
+        :type keys: tuple[str, ...]
+        :param rows: Value tuples aligned with ``keys``.
+        :type rows: collections.abc.Iterable[tuple]
+        :returns: One record per row.
+        :rtype: list[ApplicantRecord]
+        """
+        layout = _layout(tuple(keys))
+        setters = [getattr(cls, FIELDS[key]).__set__ for key in keys]
+        records = []
+        for values in rows:
+            rec = cls.__new__(cls)
+            rec._keys = layout
+            rec._extra = None
+            for setter, value in zip(setters, values):
+                setter(rec, value)
+            records.append(rec)
+        return records
+
+    def to_dict(self):
+        """Return the record as a plain dict in key insertion order.
+
+        :rtype: dict
+        """
+        return {key: self[key] for key in self._keys}
+
+    def __getitem__(self, key):
+        slot = FIELDS.get(key)
+        if slot is None:
+            if self._extra is None or key not in self._extra:
+                raise KeyError(key)
+            return self._extra[key]
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        slot = FIELDS.get(key)
+        if slot is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+        else:
+            if slot in INTERNED and type(value) is str:  # pylint: disable=unidiomatic-typecheck
+                value = sys.intern(value)
+            setattr(self, slot, value)
+        if key not in self._keys:
+            self._keys = _layout(self._keys + (key,))
+
+    def __delitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        slot = FIELDS.get(key)
+        if slot is None:
+            del self._extra[key]
+        else:
+            delattr(self, slot)
+        self._keys = _layout(tuple(k for k in self._keys if k != key))
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __repr__(self):
+        return f"ApplicantRecord({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self._keys = ()
+        self._extra = None
+        self.update(state)
+
+
+def json_default(obj):
+    """``default`` hook letting :mod:`json` serialize :class:`ApplicantRecord`.
+
+    :param obj: Object the encoder could not serialize.
+    :returns: ``obj.to_dict()`` for records.
+    :rtype: dict
+    :raises TypeError: For any other type.
+    """
+    if isinstance(obj, ApplicantRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
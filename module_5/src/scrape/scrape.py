@@ -9,6 +9,9 @@ to disk.
 # Import JSON for saving scraped data
 import json
 
+# Import os for checkpoint paths
+import os
+
 # Import regular expressions for pattern matching
 import re
 
@@ -21,11 +24,39 @@ from urllib.error import URLError, HTTPError
 # Import time module for execution timing
 import time
 
-# Import thread pool for parallel detail-page scraping
+# Import deque for the survey-page prefetch window
+from collections import deque
+
+# Import partial to bind the parser configuration sent to worker processes
+from functools import partial
+
+# Import islice to cut record streams into fixed-size batches
+from itertools import islice
+
+# Import closing so early exits shut down the survey-page generator
+from contextlib import closing, nullcontext
+
+# Import thread pool for parallel detail-page and survey-page fetching
 from concurrent.futures import ThreadPoolExecutor
 
-# Import BeautifulSoup for HTML parsing
-from bs4 import BeautifulSoup
+# Import BeautifulSoup for HTML parsing, restricted to the nodes we read
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Import the asyncio detail-page engine (plain import when run as a script
+# from src/scrape/, where there is no parent package)
+try:
+    from . import async_fetch, crawl_session, detail_pipeline, http_pool
+    from .http_common import DEFAULT_HEADERS
+    from .json_stream import compact_checkpoint
+    from .record import ApplicantRecord, json_default
+except ImportError:  # pragma: no cover
+    import async_fetch
+    import crawl_session
+    import detail_pipeline
+    import http_pool
+    from http_common import DEFAULT_HEADERS
+    from json_stream import compact_checkpoint
+    from record import ApplicantRecord, json_default
 
 # Base GradCafe URL
 BASE_URL = "https://www.thegradcafe.com"
@@ -39,21 +70,143 @@ MAX_RECORDS = 30000
 # Number of parallel workers for detail pages
 NUM_WORKERS = 10
 
+# Detail-page fetch engine: "threads" (ThreadPoolExecutor) or "asyncio"
+FETCH_ENGINE = "threads"
+
+# Maximum detail requests kept in flight by the asyncio engine
+MAX_IN_FLIGHT = 200
+
+# Parser processes for detail pages (0 = parse on the fetch threads)
+PARSE_PROCESSES = 0
+
+# Parser processes reused by every iter_details_in_processes call
+PARSE_POOL = detail_pipeline.ParsePool()
+
+# Survey pages fetched ahead concurrently while paging (1 = strictly serial)
+PREFETCH_PAGES = 1
+
 # HTTP timeout in seconds
 TIMEOUT = 30
 
 # Output file for raw scraped data
 OUTPUT_FILE = "applicant_data.json"
 
-# Save every N records
+# Flush the NDJSON checkpoint to disk every N records
 SAVE_EVERY = 1000
 
+# Records enriched together by iter_enriched_records (bounds streaming memory)
+STREAM_BATCH = 500
+
+# Detail fetches kept outstanding while survey pages are still being listed
+# (0 = list every page before fetching any detail page)
+PIPELINE_DEPTH = 0
+
+# Route fetch_html through the shared keep-alive connection pool
+USE_HTTP_POOL = False
+
+# Shared keep-alive connection pool used when USE_HTTP_POOL is enabled
+HTTP_POOL = http_pool.ConnectionPool(maxsize=NUM_WORKERS, timeout=TIMEOUT)
+
+# HTML parser backend: any installed BeautifulSoup tree builder name. Others
+# such as "lxml" are not in requirements.txt and repair malformed rows
+# differently from "html.parser"
+PARSER_BACKEND = "html.parser"
+
+# Survey pages: only table rows are built into the tree
+SURVEY_STRAINER = SoupStrainer("tr")
+
+# Detail pages: the definition lists, their <dt>/<dd> pairs wherever they sit
+# and the <span> label/value pairs of the GRE scores. Page-wide <div>
+# wrappers are left out so the rest of the page is never built
+DETAIL_STRAINER = SoupStrainer(["dl", "dt", "dd", "span"])
+
+# Score values GradCafe uses as "not reported" placeholders
+PLACEHOLDER_SCORES = {"0", "0.0", "0.00", "99.99"}
+
+# Optional adaptive pacing shared by every fetch path (a
+# rate_control.RateController); None sends requests unpaced
+RATE_CONTROLLER = None
+
+# Optional on-disk conditional-GET cache (an http_cache.HTTPCache); None disables it
+HTTP_CACHE = None
+
+
+def _conditional_get(url, headers):
+    """Send one GET request where ``304 Not Modified`` is not an error.
+
+    :param url: URL to fetch.
+    :type url: str
+    :param headers: Request headers, including any validators.
+    :type headers: dict[str, str]
+    :returns: Tuple of ``(status, headers, body)`` with lower-cased
+        header names.
+    :rtype: tuple[int, dict[str, str], bytes]
+    """
+    if USE_HTTP_POOL:
+        return HTTP_POOL.fetch(url, headers)
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+            return response.status, response_headers, response.read()
+    except HTTPError as e:
+        if e.code == 304:
+            return 304, {}, b""
+        raise
+
+
+def _fetch_cached(url):
+    """Fetch a page through :data:`HTTP_CACHE`.
+
+    Sends the cached validators with the request; a ``304`` is answered
+    from disk, and a fresh ``200`` is stored for next time.
+
+    :param url: URL to fetch.
+    :type url: str
+    :returns: Raw response body.
+    :rtype: bytes
+    """
+    status, response_headers, body = _conditional_get(
+        url, {**DEFAULT_HEADERS, **HTTP_CACHE.validators(url)},
+    )
+    if status == 304:
+        cached = HTTP_CACHE.load(url)
+        if cached is not None:
+            return cached
+        # Evicted since the validators were read: fetch it unconditionally
+        status, response_headers, body = _conditional_get(url, DEFAULT_HEADERS)
+    HTTP_CACHE.store(url, body, response_headers)
+    return body
+
+
+def _fetch_once(url):
+    """Make one download attempt over the configured transport.
+
+    :param url: URL to fetch.
+    :type url: str
+    :returns: Decoded HTML string.
+    :rtype: str
+    """
+    if HTTP_CACHE is not None:
+        return _fetch_cached(url).decode("utf-8")
+    if USE_HTTP_POOL:
+        return HTTP_POOL.get(url).decode("utf-8")
+    request = urllib.request.Request(url, headers=DEFAULT_HEADERS)
+    with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+        return response.read().decode("utf-8")
+
 
 def fetch_html(url, retries=3):
     """Fetch HTML content from a URL with retry logic.
 
     Attempts to download the page up to ``retries`` times, sleeping
     between attempts with exponential backoff. Raises on the final failure.
+    When :data:`USE_HTTP_POOL` is enabled the request is sent over a
+    reused keep-alive connection from :data:`HTTP_POOL` instead of a new
+    ``urllib`` connection. When :data:`HTTP_CACHE` is set, the request is
+    made conditional and unchanged pages are served from disk. When
+    :data:`RATE_CONTROLLER` is set, every attempt waits for its pacing
+    and reports its latency and status back to it.
 
     :param url: URL to fetch.
     :type url: str
@@ -67,12 +220,8 @@ def fetch_html(url, retries=3):
     last_error = None
     for attempt in range(retries):
         try:
-            request = urllib.request.Request(
-                url,
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
-            with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
-                return response.read().decode("utf-8")
+            with RATE_CONTROLLER.slot() if RATE_CONTROLLER else nullcontext():
+                return _fetch_once(url)
         except (HTTPError, URLError) as e:
             last_error = e
             if attempt < retries - 1:
@@ -80,6 +229,33 @@ def fetch_html(url, retries=3):
     raise last_error
 
 
+def detail_workers():
+    """Return the thread-pool size to use for detail-page fetches.
+
+    :returns: :data:`NUM_WORKERS`, or the controller's maximum concurrency
+        when :data:`RATE_CONTROLLER` is set, so it can tune within that.
+    :rtype: int
+    """
+    if RATE_CONTROLLER is None:
+        return NUM_WORKERS
+    return RATE_CONTROLLER.max_concurrency
+
+
+def make_soup(html, parse_only=None, backend=None):
+    """Parse HTML with the configured :data:`PARSER_BACKEND`.
+
+    :param html: Raw HTML string.
+    :type html: str
+    :param parse_only: Optional strainer limiting which nodes are built.
+    :type parse_only: bs4.SoupStrainer or None
+    :param backend: Tree builder name. Defaults to :data:`PARSER_BACKEND`.
+    :type backend: str or None
+    :returns: Parsed document.
+    :rtype: bs4.BeautifulSoup
+    """
+    return BeautifulSoup(html, backend or PARSER_BACKEND, parse_only=parse_only)
+
+
 def clean_text(element):
     """Clean and normalize visible text from an HTML element.
 
@@ -119,7 +295,7 @@ def extract_undergrad_gpa(soup):
     :rtype: str
     """
     gpa = extract_dt_dd(soup, "Undergrad GPA")
-    if gpa in {"0", "0.0", "0.00", "99.99"}:
+    if gpa in PLACEHOLDER_SCORES:
         return ""
     return gpa
 
@@ -146,7 +322,7 @@ def extract_gre_scores(soup):
         if i + 1 >= len(spans):
             continue
         value = clean_text(spans[i + 1])
-        if value in {"0", "0.0", "0.00", "99.99"}:
+        if value in PLACEHOLDER_SCORES:
             value = ""
         if label.startswith("gre general"):
             scores["gre_general"] = value
@@ -157,28 +333,202 @@ def extract_gre_scores(soup):
     return scores
 
 
+# Detail-page <dt> labels and the output fields they fill
+DETAIL_LABELS = {
+    "Program": "program_name",
+    "Degree Type": "degree_type",
+    "Notes": "comments",
+    "Undergrad GPA": "gpa",
+}
+
+# GRE span label prefixes and the output fields they fill
+GRE_LABELS = (
+    ("gre general", "gre_general"),
+    ("gre verbal", "gre_verbal"),
+    ("analytical writing", "gre_analytical_writing"),
+)
+
+def extract_detail_fields(soup):
+    """Extract all seven detail fields in a single pass over the document.
+
+    Equivalent to calling :func:`extract_dt_dd` for each label,
+    :func:`extract_undergrad_gpa` and :func:`extract_gre_scores`, but the
+    ``<dt>`` and ``<span>`` nodes are collected in one traversal and each
+    node's text is cleaned only once.
+
+    :param soup: Parsed BeautifulSoup object for the detail page.
+    :type soup: bs4.BeautifulSoup
+    :returns: Dict with the same keys as :func:`parse_detail_page`.
+    :rtype: dict[str, str]
+    """
+    fields = dict.fromkeys(DETAIL_LABELS.values(), "")
+    fields.update(dict.fromkeys((f for _, f in GRE_LABELS), ""))
+    found = set()
+    span_texts = []
+    # A plain descendant walk is several times faster than find_all([...])
+    for node in soup.descendants:
+        if node.name not in ("dt", "span"):
+            continue
+        text = clean_text(node)
+        if node.name == "span":
+            span_texts.append(text)
+        elif text in DETAIL_LABELS and text not in found:
+            found.add(text)
+            # The <dd> following this <dt>; stops at the next <dt> so a
+            # missing value is not taken from the next pair
+            value = node.find_next_sibling(["dt", "dd"])
+            if value is not None and value.name == "dd":
+                fields[DETAIL_LABELS[text]] = clean_text(value)
+
+    if fields["gpa"] in PLACEHOLDER_SCORES:
+        fields["gpa"] = ""
+    for label, value in zip(span_texts, span_texts[1:]):
+        label = label.lower()
+        if not label.endswith(":"):
+            continue
+        for prefix, field in GRE_LABELS:
+            if label.startswith(prefix):
+                fields[field] = "" if value in PLACEHOLDER_SCORES else value
+                break
+    return fields
+
+
+def parse_detail_page(html, backend=None, strainer=None):
+    """Parse the HTML of a GradCafe result page into detail fields.
+
+    :param html: Raw HTML string of a result detail page.
+    :type html: str
+    :param backend: Tree builder name. Defaults to :data:`PARSER_BACKEND`.
+    :type backend: str or None
+    :param strainer: Nodes to build. Defaults to :data:`DETAIL_STRAINER`.
+    :type strainer: bs4.SoupStrainer or None
+    :returns: Dict with keys ``program_name``, ``degree_type``,
+        ``comments``, ``gpa``, ``gre_general``, ``gre_verbal``,
+        ``gre_analytical_writing``.
+    :rtype: dict[str, str]
+    """
+    return extract_detail_fields(
+        make_soup(html, strainer or DETAIL_STRAINER, backend),
+    )
+
+
+def fetch_detail_html(result_id):
+    """Download the raw HTML of an individual GradCafe result page.
+
+    :param result_id: Numeric GradCafe result ID.
+    :type result_id: int or str
+    :returns: Decoded HTML string.
+    :rtype: str
+    """
+    return fetch_html(f"{BASE_URL}/result/{result_id}")
+
+
 def scrape_detail_page(result_id):
     """Scrape an individual GradCafe result page.
 
     :param result_id: Numeric GradCafe result ID.
     :type result_id: int or str
-    :returns: Dict with keys ``program_name``, ``degree_type``,
-        ``comments``, ``gpa``, ``gre_general``, ``gre_verbal``,
-        ``gre_analytical_writing``.
+    :returns: Detail dict as returned by :func:`parse_detail_page`.
     :rtype: dict[str, str]
     """
-    url = f"{BASE_URL}/result/{result_id}"
-    soup = BeautifulSoup(fetch_html(url), "html.parser")
-    gre = extract_gre_scores(soup)
-    return {
-        "program_name": extract_dt_dd(soup, "Program"),
-        "degree_type": extract_dt_dd(soup, "Degree Type"),
-        "comments": extract_dt_dd(soup, "Notes"),
-        "gpa": extract_undergrad_gpa(soup),
-        "gre_general": gre["gre_general"],
-        "gre_verbal": gre["gre_verbal"],
-        "gre_analytical_writing": gre["gre_analytical_writing"],
-    }
+    return parse_detail_page(fetch_detail_html(result_id))
+
+
+def iter_details_in_processes(result_ids, processes=None):
+    """Fetch detail pages on threads and parse them in worker processes.
+
+    Binds :func:`detail_pipeline.iter_details_in_processes` to
+    :func:`fetch_detail_html`, :func:`parse_detail_page` running in
+    :data:`PARSE_POOL` and :func:`detail_workers` fetch threads. The
+    current :data:`PARSER_BACKEND` and :data:`DETAIL_STRAINER` are passed
+    to the workers, which would otherwise only see the module defaults.
+
+    :param result_ids: Result IDs to fetch.
+    :type result_ids: list
+    :param processes: Number of parser processes. Defaults to
+        :data:`PARSE_PROCESSES`.
+    :type processes: int or None
+    :returns: Generator yielding, in ``result_ids`` order, each detail dict
+        or the exception raised while fetching or parsing it.
+    :rtype: collections.abc.Iterator
+    """
+    parse = partial(parse_detail_page, backend=PARSER_BACKEND, strainer=DETAIL_STRAINER)
+    return detail_pipeline.iter_details_in_processes(
+        result_ids, fetch_detail_html, parse,
+        PARSE_POOL.get(processes or PARSE_PROCESSES), detail_workers(),
+    )
+
+
+def iter_details(result_ids):
+    """Fetch and parse detail pages with the configured engine.
+
+    Dispatches to :func:`fetch_details_async` when :data:`FETCH_ENGINE` is
+    ``"asyncio"``, to :func:`iter_details_in_processes` when
+    :data:`PARSE_PROCESSES` is set, and to a thread pool of
+    :func:`detail_workers` threads otherwise.
+
+    :param result_ids: Result IDs to fetch.
+    :type result_ids: list
+    :returns: Generator yielding, in ``result_ids`` order, each detail dict
+        or the exception raised while fetching or parsing it.
+    :rtype: collections.abc.Iterator
+    """
+    if FETCH_ENGINE == "asyncio":
+        yield from fetch_details_async(result_ids)
+        return
+    if PARSE_PROCESSES > 0:
+        yield from iter_details_in_processes(result_ids)
+        return
+    with ThreadPoolExecutor(max_workers=detail_workers()) as executor:
+        for future in [executor.submit(scrape_detail_page, r) for r in result_ids]:
+            try:
+                detail = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                detail = exc
+            yield detail
+
+
+def open_detail_pipeline(depth=None):
+    """Start a :class:`detail_pipeline.DetailPipeline` for background fetches.
+
+    The pipeline always uses the thread engine (:func:`scrape_detail_page`
+    on :func:`detail_workers` threads); :data:`FETCH_ENGINE` and
+    :data:`PARSE_PROCESSES` are not consulted.
+
+    :param depth: Maximum outstanding fetches. Defaults to
+        :data:`PIPELINE_DEPTH`.
+    :type depth: int or None
+    :rtype: detail_pipeline.DetailPipeline
+    """
+    return detail_pipeline.DetailPipeline(
+        scrape_detail_page, depth or PIPELINE_DEPTH, detail_workers(),
+    )
+
+
+def fetch_details_async(result_ids, max_in_flight=None):
+    """Fetch and parse many result pages on a single asyncio event loop.
+
+    Unlike the thread pool, in-flight requests do not each hold a thread,
+    so hundreds of detail pages can be outstanding at once. Results are
+    returned in the same order as ``result_ids``; a fetch that fails after
+    all retries yields its exception in place of the detail dict.
+
+    :param result_ids: GradCafe result IDs to fetch.
+    :type result_ids: list[int or str]
+    :param max_in_flight: Maximum concurrent requests. Defaults to
+        :data:`MAX_IN_FLIGHT`.
+    :type max_in_flight: int or None
+    :returns: List of detail dicts (or exceptions), aligned with ``result_ids``.
+    :rtype: list[dict or Exception]
+    """
+    urls = [f"{BASE_URL}/result/{result_id}" for result_id in result_ids]
+    return async_fetch.run_fetch_many(
+        urls,
+        max_in_flight=max_in_flight or MAX_IN_FLIGHT,
+        timeout=TIMEOUT,
+        parse=parse_detail_page,
+        controller=RATE_CONTROLLER,
+    )
 
 
 def parse_survey_page(html):
@@ -186,10 +536,10 @@ def parse_survey_page(html):
 
     :param html: Raw HTML string of a survey page.
     :type html: str
-    :returns: List of record dicts, one per applicant found on the page.
-    :rtype: list[dict]
+    :returns: List of records, one per applicant found on the page.
+    :rtype: list[record.ApplicantRecord]
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html, SURVEY_STRAINER)
     rows = soup.find_all("tr")
     results = []
     current = None
@@ -201,7 +551,7 @@ def parse_survey_page(html):
             if not link:
                 continue
             result_id = link["href"].split("/")[-1]
-            current = {
+            current = ApplicantRecord({
                 "result_id": result_id,
                 "university": clean_text(cells[0]),
                 "program_name": clean_text(cells[1]),
@@ -216,7 +566,7 @@ def parse_survey_page(html):
                 "gre_verbal": "",
                 "gre_analytical_writing": "",
                 "gpa": "",
-            }
+            })
             results.append(current)
 
         if current:
@@ -232,45 +582,299 @@ def parse_survey_page(html):
     return results
 
 
-def scrape_data():
-    """Scrape GradCafe survey pages and individual result detail pages.
+def fetch_survey_page(page):
+    """Download and parse a single survey page.
 
-    :returns: List of fully enriched applicant record dicts.
+    :param page: Survey page number.
+    :type page: int
+    :returns: List of record dicts on that page; empty past the last page.
     :rtype: list[dict]
     """
-    start_time = time.time()
-    all_results = []
-    seen_ids = set()
-    page = 1
-
-    while len(all_results) < MAX_RECORDS:
-        html = fetch_html(SURVEY_URL.format(page))
-        page_results = parse_survey_page(html)
-        if not page_results:
-            break
-        for result in page_results:
-            if result["result_id"] not in seen_ids:
-                seen_ids.add(result["result_id"])
-                all_results.append(result)
-            if len(all_results) >= MAX_RECORDS:
-                break
-        page += 1
+    return parse_survey_page(fetch_html(SURVEY_URL.format(page)))
 
-    with ThreadPoolExecutor(max_workers=NUM_WORKERS) as executor:
-        details = executor.map(
-            scrape_detail_page,
-            [r["result_id"] for r in all_results],
-        )
 
-    completed = 0
-    for record, detail in zip(all_results, details):
+def fetch_survey_pages(pages, workers=None):
+    """Download and parse several survey pages concurrently.
+
+    :param pages: Survey page numbers to fetch.
+    :type pages: list[int]
+    :param workers: Thread-pool size. Defaults to :func:`detail_workers`.
+    :type workers: int or None
+    :returns: Dict mapping each page number to its parsed records.
+    :rtype: dict[int, list[dict]]
+    """
+    if not pages:
+        return {}
+    with ThreadPoolExecutor(max_workers=workers or detail_workers()) as executor:
+        return dict(zip(pages, executor.map(fetch_survey_page, pages)))
+
+
+def iter_survey_pages(start_page=1, prefetch=None):
+    """Yield parsed survey pages in order until the first empty page.
+
+    With ``prefetch`` greater than 1, the next ``prefetch`` survey pages are
+    downloaded concurrently on a thread pool while the caller processes the
+    current one; pages are still parsed and yielded strictly in order. When
+    the caller stops early (``break``, ``return`` or closing the generator),
+    queued speculative fetches are cancelled and in-flight ones are
+    abandoned without waiting for them.
+
+    :param start_page: First survey page number to fetch.
+    :type start_page: int
+    :param prefetch: Size of the prefetch window. Defaults to
+        :data:`PREFETCH_PAGES`.
+    :type prefetch: int or None
+    :returns: Generator of ``(page, page_results)`` tuples.
+    :rtype: collections.abc.Iterator[tuple[int, list[dict]]]
+    """
+    prefetch = prefetch or PREFETCH_PAGES
+    page = start_page
+
+    if prefetch <= 1:
+        while True:
+            page_results = parse_survey_page(fetch_html(SURVEY_URL.format(page)))
+            if not page_results:
+                return
+            yield page, page_results
+            page += 1
+
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    window = deque()
+    try:
+        while True:
+            while len(window) < prefetch:
+                url = SURVEY_URL.format(page + len(window))
+                window.append(executor.submit(fetch_html, url))
+            page_results = parse_survey_page(window.popleft().result())
+            if not page_results:
+                return
+            yield page, page_results
+            page += 1
+    finally:
+        for future in window:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_survey_records(start_page=1, limit=None):
+    """Yield survey-level records page by page, skipping repeated IDs.
+
+    :param start_page: First survey page number to fetch.
+    :type start_page: int
+    :param limit: Maximum number of records. Defaults to :data:`MAX_RECORDS`.
+    :type limit: int or None
+    :returns: Generator of survey-level record dicts.
+    :rtype: collections.abc.Iterator[dict]
+    """
+    limit = MAX_RECORDS if limit is None else limit
+    known_ids = set()
+    if limit <= 0:
+        return
+    with closing(iter_survey_pages(start_page=start_page)) as pages:
+        for _, page_results in pages:
+            for record in page_results:
+                if record["result_id"] in known_ids:
+                    continue
+                known_ids.add(record["result_id"])
+                yield record
+                if len(known_ids) >= limit:
+                    return
+
+
+def iter_enriched_records(records, batch_size=None):
+    """Merge detail-page fields into a stream of survey-level records.
+
+    Records are taken ``batch_size`` at a time and their detail pages
+    fetched through :func:`iter_details`, so only one batch is held in
+    memory. A record whose detail fetch fails is yielded unchanged after a
+    warning.
+
+    :param records: Survey-level records, e.g. from :func:`iter_survey_records`.
+    :type records: collections.abc.Iterable[dict]
+    :param batch_size: Records per batch. Defaults to :data:`STREAM_BATCH`.
+    :type batch_size: int or None
+    :returns: Generator of enriched record dicts, in input order.
+    :rtype: collections.abc.Iterator[dict]
+    """
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size or STREAM_BATCH))
+        if not batch:
+            return
+        details = iter_details([r["result_id"] for r in batch])
+        for record, detail in zip(batch, details):
+            if isinstance(detail, Exception):
+                print(
+                    f"Warning: failed to fetch detail for result_id "
+                    f"{record['result_id']}: {detail}"
+                )
+            else:
+                record.update(detail)
+            yield record
+
+
+def _checkpoint_path():
+    """Return the NDJSON checkpoint path that sits next to :data:`OUTPUT_FILE`.
+
+    :returns: ``OUTPUT_FILE`` with its extension replaced by ``.ndjson``.
+    :rtype: str
+    """
+    return os.path.splitext(OUTPUT_FILE)[0] + ".ndjson"
+
+
+def _session_path():
+    """Return the crawl-session state path that sits next to :data:`OUTPUT_FILE`.
+
+    :returns: ``OUTPUT_FILE`` with its extension replaced by ``.session.json``.
+    :rtype: str
+    """
+    return os.path.splitext(OUTPUT_FILE)[0] + ".session.json"
+
+
+def _write_checkpoint(pairs, session):
+    """Merge details into records and append each one to the checkpoint.
+
+    Every record is written exactly once as a single JSON line through
+    :meth:`crawl_session.CrawlSession.record_completed`, which flushes the
+    stream and saves the crawl cursor every :data:`SAVE_EVERY` records.
+
+    :param pairs: ``(record, detail)`` pairs, where ``detail`` is a detail
+        dict or the exception raised fetching it.
+    :type pairs: collections.abc.Iterable[tuple[dict, dict or Exception]]
+    :param session: Crawl session that owns the checkpoint.
+    :type session: crawl_session.CrawlSession
+    :raises Exception: The first exception found in the details.
+    """
+    for record, detail in pairs:
+        if isinstance(detail, Exception):
+            raise detail
         record.update(detail)
-        completed += 1
-        if completed % SAVE_EVERY == 0:
-            with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-                json.dump(all_results, f, indent=2, ensure_ascii=False)
-            print(f"Saved {completed} records to {OUTPUT_FILE}")
+        session.record_completed(record)
+
+
+def _enrich_pending(pending, session):
+    """Fetch detail pages for pending records and checkpoint each one.
+
+    :param pending: Survey-level records still missing their details.
+    :type pending: list[dict]
+    :param session: Crawl session whose checkpoint receives the records.
+    :type session: crawl_session.CrawlSession
+    """
+    result_ids = [r["result_id"] for r in pending]
+    _write_checkpoint(zip(pending, iter_details(result_ids)), session)
+
 
+def _list_survey(session, known_ids, total, on_listed):
+    """Page the survey after the session's last page, up to :data:`MAX_RECORDS`.
+
+    :param session: Crawl session recording each listed page.
+    :type session: crawl_session.CrawlSession
+    :param known_ids: Result IDs already listed; updated in place.
+    :type known_ids: set[str]
+    :param total: Number of records already listed or completed.
+    :type total: int
+    :param on_listed: Called with each page's new records.
+    :type on_listed: callable
+    """
+    with closing(iter_survey_pages(start_page=session.last_page + 1)) as pages:
+        for page, page_results in pages:
+            new_results = []
+            for result in page_results:
+                if total + len(new_results) >= MAX_RECORDS:
+                    break
+                if result["result_id"] not in known_ids:
+                    known_ids.add(result["result_id"])
+                    new_results.append(result)
+            session.add_listed(page, new_results)
+            on_listed(new_results)
+            total += len(new_results)
+            if total >= MAX_RECORDS:
+                break
+    session.finish_listing()
+
+
+def _list_and_enrich(pending, session, known_ids, total):
+    """List the survey while a detail pipeline enriches each page.
+
+    :param pending: Records listed but not yet enriched; extended in place
+        with every newly listed record.
+    :type pending: list[dict]
+    :param session: Crawl session whose checkpoint receives the records.
+    :type session: crawl_session.CrawlSession
+    :param known_ids: Result IDs already listed; updated in place.
+    :type known_ids: set[str]
+    :param total: Number of records already listed or completed.
+    :type total: int
+    """
+    with open_detail_pipeline() as pipeline:
+        def on_listed(records):
+            pending.extend(records)
+            pipeline.submit(records)
+            _write_checkpoint(pipeline.completed(), session)
+
+        pipeline.submit(pending)
+        if not session.listing_done:
+            _list_survey(session, known_ids, total, on_listed)
+        _write_checkpoint(pipeline.drain(), session)
+
+
+def scrape_data(resume=False):
+    """Scrape GradCafe survey pages and individual result detail pages.
+
+    Survey pages are paged via :func:`iter_survey_pages`, prefetching
+    :data:`PREFETCH_PAGES` pages ahead. Detail pages are fetched with a
+    thread pool of :data:`NUM_WORKERS`, or on a single asyncio event loop
+    with up to :data:`MAX_IN_FLIGHT` requests outstanding when
+    :data:`FETCH_ENGINE` is ``"asyncio"``. With :data:`PARSE_PROCESSES`
+    set, the threads only fetch and detail pages are parsed in worker
+    processes (:func:`iter_details_in_processes`).
+
+    With :data:`PIPELINE_DEPTH` set, detail pages are fetched by a detail
+    pipeline (:func:`open_detail_pipeline`) while later survey pages are
+    still being listed, so listing and enrichment overlap instead of
+    running back to back.
+
+    Each enriched record is appended once to an NDJSON checkpoint as it
+    completes; the checkpoint is compacted into :data:`OUTPUT_FILE` as a
+    JSON array at the end via :func:`compact_checkpoint`.
+
+    Progress is tracked in a :class:`crawl_session.CrawlSession` next to
+    :data:`OUTPUT_FILE`. With ``resume=True`` an interrupted run continues
+    after the last saved survey page and only fetches detail pages that
+    are not already in the checkpoint.
+
+    :param resume: Continue from the previous crawl session, if any.
+    :type resume: bool
+    :returns: List of fully enriched applicant record dicts.
+    :rtype: list[dict]
+    """
+    start_time = time.time()
+    session = crawl_session.CrawlSession.open(
+        _session_path(), _checkpoint_path(), resume=resume, save_every=SAVE_EVERY,
+    )
+    all_results = session.completed_records
+    pending = list(session.pending.values())
+    known_ids = session.completed_ids | set(session.pending)
+
+    total = len(all_results) + len(pending)
+
+    try:
+        if PIPELINE_DEPTH > 0:
+            _list_and_enrich(pending, session, known_ids, total)
+        else:
+            if not session.listing_done:
+                _list_survey(session, known_ids, total, pending.extend)
+            _enrich_pending(pending, session)
+    finally:
+        session.close()
+
+    all_results.extend(pending)
+    count = compact_checkpoint(session.checkpoint_path, OUTPUT_FILE)
+    print(f"Saved {count} records to {OUTPUT_FILE}")
+    session.clear()
+
+    if RATE_CONTROLLER is not None:
+        print(RATE_CONTROLLER.report())
     print(f"Scraping completed in {time.time() - start_time:.2f} seconds")
     return all_results
 
@@ -282,5 +886,5 @@ def save_data(data):
     :type data: list[dict]
     """
     with open(OUTPUT_FILE, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=2, ensure_ascii=False)
+        json.dump(data, file, indent=2, ensure_ascii=False, default=json_default)
     print(f"Saved {len(data)} records to {OUTPUT_FILE}")
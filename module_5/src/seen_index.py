@@ -0,0 +1,242 @@
+"""
+Persistent index of already-processed GradCafe result IDs.
+
+The cumulative LLM output file only ever grows, so the result IDs it holds
+are kept in a sidecar file next to it: a small header followed by a sorted
+array of unsigned 32-bit IDs. The array is memory-mapped and searched with
+:mod:`bisect`, so loading the index and testing membership never parse the
+output file or build a Python set.
+
+The header records how many bytes of the output file the index covers.
+:func:`sync` only reads lines appended after that point, and rebuilds the
+index from scratch if the output file has shrunk.
+"""
+
+# Import bisect for membership tests on the sorted ID array
+import bisect
+
+# Import JSON to read the url_link of newly appended records
+import json
+
+# Import mmap to map the ID array without reading it into memory
+import mmap
+
+# Import os for file sizes and atomic renames
+import os
+
+# Import regular expressions to pull the result ID out of a URL
+import re
+
+# Import struct for the fixed-size file header
+import struct
+
+# Import array for the on-disk ID format
+from array import array
+
+# Import heapq.merge to merge new IDs into the existing sorted array
+from heapq import merge
+
+# File signature, bytes of the output file covered, number of IDs
+HEADER = struct.Struct("<8sQQ")
+MAGIC = b"SEENIDX1"
+
+# Array typecode of the stored IDs (unsigned 32-bit, native byte order)
+ID_TYPECODE = "I"
+
+# Bytes per stored ID
+ID_SIZE = array(ID_TYPECODE).itemsize
+
+
+def index_path(source_path):
+    """Return the index path that sits next to ``source_path``.
+
+    :param source_path: Path to the cumulative LLM output NDJSON file.
+    :type source_path: str
+    :returns: ``source_path`` with its extension replaced by ``.seen.idx``.
+    :rtype: str
+    """
+    return os.path.splitext(source_path)[0] + ".seen.idx"
+
+
+def _read_header(path):
+    """Read the header of an index file.
+
+    :param path: Path to the index file.
+    :type path: str
+    :returns: Tuple of ``(covered, count)``, or ``None`` if the file is
+        missing or not a valid index.
+    :rtype: tuple[int, int] or None
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, covered, count = HEADER.unpack(header)
+    if magic != MAGIC or os.path.getsize(path) != HEADER.size + ID_SIZE * count:
+        return None
+    return covered, count
+
+
+def _read_ids(path, count):
+    """Load the stored ID array of an index file.
+
+    :param path: Path to a valid index file.
+    :type path: str
+    :param count: Number of IDs it holds.
+    :type count: int
+    :returns: Sorted IDs.
+    :rtype: array.array
+    """
+    ids = array(ID_TYPECODE)
+    if count:
+        with open(path, "rb") as f:
+            f.seek(HEADER.size)
+            ids.fromfile(f, count)
+    return ids
+
+
+def _scan_tail(source_path, offset):
+    """Extract result IDs from the complete lines after ``offset``.
+
+    A torn final line without a trailing newline is left for the next sync.
+
+    :param source_path: Path to the cumulative LLM output NDJSON file.
+    :type source_path: str
+    :param offset: Byte offset to start reading at.
+    :type offset: int
+    :returns: Tuple of ``(ids, consumed)`` where ``consumed`` is the number
+        of bytes read up to the end of the last complete line.
+    :rtype: tuple[list[int], int]
+    """
+    ids = []
+    consumed = 0
+    with open(source_path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            consumed += len(line)
+            try:
+                url = json.loads(line).get("url_link")
+            except json.JSONDecodeError:
+                continue
+            match = re.search(r"/result/(\d+)", url or "")
+            if match:
+                ids.append(int(match.group(1)))
+    return ids, consumed
+
+
+def _write(path, covered, ids):
+    """Atomically write an index file.
+
+    :param path: Path to the index file.
+    :type path: str
+    :param covered: Bytes of the output file the IDs were read from.
+    :type covered: int
+    :param ids: Sorted, de-duplicated IDs.
+    :type ids: array.array
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, covered, len(ids)))
+        ids.tofile(f)
+    os.replace(tmp_path, path)
+
+
+def sync(source_path, path=None):
+    """Bring the index up to date with the output file.
+
+    Only lines appended since the last sync are parsed; their IDs are
+    merged into the sorted array, which is then rewritten atomically.
+
+    :param source_path: Path to the cumulative LLM output NDJSON file.
+    :type source_path: str
+    :param path: Index file path. Defaults to :func:`index_path`.
+    :type path: str or None
+    :returns: The index file path.
+    :rtype: str
+    """
+    path = path or index_path(source_path)
+    header = _read_header(path)
+    covered, count = header or (0, 0)
+    try:
+        size = os.path.getsize(source_path)
+    except FileNotFoundError:
+        size = 0
+    if size < covered:
+        covered, count = 0, 0
+    elif header and size == covered:
+        return path
+
+    new_ids, consumed = _scan_tail(source_path, covered) if size else ([], 0)
+    ids = array(ID_TYPECODE)
+    for result_id in merge(_read_ids(path, count), sorted(new_ids)):
+        if not ids or ids[-1] != result_id:
+            ids.append(result_id)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    _write(path, covered + consumed, ids)
+    return path
+
+
+class SeenIndex:
+    """Read-only, memory-mapped view of an index file.
+
+    Supports ``result_id in index``, ``len(index)`` and iteration in
+    ascending order. Use :meth:`open` to sync and map the index for an
+    output file.
+
+    :param path: Path to a valid index file.
+    :type path: str
+    """
+
+    def __init__(self, path):
+        _, count = _read_header(path) or (0, 0)
+        self._mmap = None
+        self._ids = array(ID_TYPECODE)
+        if count:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._ids = memoryview(self._mmap)[HEADER.size:].cast(ID_TYPECODE)
+
+    @classmethod
+    def open(cls, source_path, path=None):
+        """Sync the index for ``source_path`` and map it.
+
+        :param source_path: Path to the cumulative LLM output NDJSON file.
+        :type source_path: str
+        :param path: Index file path. Defaults to :func:`index_path`.
+        :type path: str or None
+        :returns: The mapped index.
+        :rtype: SeenIndex
+        """
+        return cls(sync(source_path, path))
+
+    def __contains__(self, result_id):
+        result_id = int(result_id)
+        i = bisect.bisect_left(self._ids, result_id)
+        return i < len(self._ids) and self._ids[i] == result_id
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    @property
+    def newest(self):
+        """Largest stored result ID, or ``None`` when the index is empty.
+
+        :rtype: int or None
+        """
+        return self._ids[-1] if len(self._ids) else None
+
+    def close(self):
+        """Release the memory mapping."""
+        if self._mmap is not None:
+            self._ids.release()
+            self._mmap.close()
+            self._mmap = None
+            self._ids = array(ID_TYPECODE)
@@ -16,11 +16,71 @@ import os
 # Import tempfile for safe intermediate writes
 import tempfile
 
-# Import the internal function used to call the LLM for standardization
-from .scrape.llm_hosting.app import _call_llm
-
+from . import seen_index
+from .llm_client import LLMServiceClient
 from .paths import NEW_APPLICANT_FILE, LLM_OUTPUT_FILE
 
+# Records standardized per LLM prompt; 1 sends one prompt per record
+LLM_BATCH_SIZE = 1
+
+# LLM worker processes sharing the memory-mapped model; 1 generates in-process
+LLM_WORKERS = 1
+
+# Root URL of a standalone llm_hosting service (``app.py --serve``); when set,
+# records are standardized over HTTP and the model is never loaded here
+LLM_SERVICE_URL = os.environ.get("LLM_SERVICE_URL", "")
+
+# Rows per request, requests in flight and per-request timeout in seconds
+LLM_SERVICE_BATCH_SIZE = 32
+LLM_SERVICE_CONCURRENCY = 2
+LLM_SERVICE_TIMEOUT = 300
+
+
+def _llm_host():
+    """Return the in-process model host module, importing it on first use.
+
+    The host pulls in llama.cpp, the canonical lists and its Flask app, so
+    it is only imported when records are standardized in-process; client
+    mode (:data:`LLM_SERVICE_URL`) never loads it.
+
+    :returns: The ``scrape.llm_hosting.app`` module.
+    :rtype: module
+    """
+    # Import the model host lazily so the web process stays small in client mode
+    from .scrape.llm_hosting import app  # pylint: disable=import-outside-toplevel
+    return app
+
+
+def _call_llm(program_text):
+    """Standardize one program string with the in-process model.
+
+    :param program_text: ``"<program>, <university>"`` text.
+    :type program_text: str
+    :returns: Dict with ``standardized_program`` and ``standardized_university``.
+    :rtype: dict[str, str]
+    """
+    return _llm_host()._call_llm(program_text)  # pylint: disable=protected-access
+
+
+def _call_llm_batch(program_texts, batch_size, workers):
+    """Standardize many program strings with the in-process model.
+
+    See :func:`_call_llm`.
+
+    :param program_texts: ``"<program>, <university>"`` texts.
+    :type program_texts: list[str]
+    :param batch_size: Program strings per prompt.
+    :type batch_size: int
+    :param workers: Generation worker processes.
+    :type workers: int
+    :returns: One result dict per text, in order.
+    :rtype: list[dict[str, str]]
+    """
+    host = _llm_host()
+    return host._call_llm_batch(  # pylint: disable=protected-access
+        program_texts, batch_size=batch_size, workers=workers,
+    )
+
 
 def _append_lines_atomically(lines: list, llm_output_path: str) -> None:
     """Atomically append enriched NDJSON lines to the cumulative output file.
@@ -61,6 +121,13 @@ def update_data(
     Reads records from ``new_data_path``, calls the LLM once per record to
     standardize the program and university names, appends each enriched record
     as a JSON line to ``llm_output_path``, then clears the staging file.
+    With :data:`LLM_BATCH_SIZE` or :data:`LLM_WORKERS` above 1 the records
+    are instead standardized through ``_call_llm_batch``, that many per
+    prompt and spread over that many worker processes, in record order.
+    With :data:`LLM_SERVICE_URL` set they are sent in batches to that
+    service's ``/standardize`` endpoint instead (:mod:`src.llm_client`),
+    and records it does not answer get ``None`` rather than falling back to
+    an in-process model.
 
     LLM failures for individual records are caught and logged; the record is
     still written to the output file with ``None`` for the LLM-generated
@@ -68,6 +135,8 @@ def update_data(
 
     The output file is written to a temporary file and renamed atomically on
     completion so that a mid-run crash leaves the original file intact.
+    The seen-ID index next to it (:mod:`src.seen_index`) is then synced
+    with the newly appended lines.
 
     Returns early with ``0`` if the staging file is missing or empty.
 
@@ -104,14 +173,48 @@ def update_data(
     # corrupting the cumulative output file if the process is interrupted.
     new_lines = []
 
-    for row in rows:
-        # Combine program name and university into a single text prompt
-        program_text = row.get("program_name", "") + ", " + row.get("university", "")
+    # Combine program name and university into a single text prompt per record
+    program_texts = [
+        row.get("program_name", "") + ", " + row.get("university", "") for row in rows
+    ]
+
+    # With batching or workers on, standardize everything up front;
+    # if that fails, every record falls back to its own call below
+    batched = {}
+    if LLM_SERVICE_URL:
+        client = LLMServiceClient(
+            LLM_SERVICE_URL,
+            batch_size=LLM_SERVICE_BATCH_SIZE,
+            concurrency=LLM_SERVICE_CONCURRENCY,
+            timeout=LLM_SERVICE_TIMEOUT,
+        )
+        try:
+            batched = dict(zip(program_texts, client.standardize(rows)))
+        finally:
+            client.close()
+    elif LLM_BATCH_SIZE > 1 or LLM_WORKERS > 1:
+        try:
+            batched = dict(zip(
+                program_texts,
+                _call_llm_batch(
+                    program_texts, batch_size=LLM_BATCH_SIZE, workers=LLM_WORKERS,
+                ),
+            ))
+        except Exception as exc:  # pylint: disable=broad-except
+            print(
+                f"Warning: batched LLM call failed: {exc}. "
+                f"Falling back to one call per record."
+            )
 
+    for row, program_text in zip(rows, program_texts):
         # Call the LLM to standardize program and university names.
         # Catch any exception so one bad record never aborts the pipeline.
         try:
-            result = _call_llm(program_text)
+            result = batched.get(program_text)
+            if not result:
+                if LLM_SERVICE_URL:
+                    raise RuntimeError("no result from the LLM service")
+                result = _call_llm(program_text)
             row["llm-generated-program"] = result.get("standardized_program")
             row["llm-generated-university"] = result.get("standardized_university")
         except Exception as exc:  # pylint: disable=broad-except
@@ -129,6 +232,9 @@ def update_data(
     # Atomically append all enriched lines to the cumulative output file.
     _append_lines_atomically(new_lines, llm_output_path)
 
+    # Fold the appended IDs into the seen-ID index used by refresh().
+    seen_index.sync(llm_output_path)
+
     # Overwrite the staging file with an empty list to prevent re-processing
     with open(new_data_path, "w", encoding="utf-8") as f:
         json.dump([], f, indent=2)
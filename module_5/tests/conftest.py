@@ -1,5 +1,7 @@
 # tests/conftest.py
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 import pytest
 
@@ -22,6 +24,71 @@ def app():
     })
     yield flask_app
 
+# ------------------------------
+# Local HTTP server for fetch-engine tests
+# ------------------------------
+class _RouteHandler(BaseHTTPRequestHandler):
+    """Serve canned responses from the ``routes`` dict on the server.
+
+    Each route maps a request path to ``(status, headers, body)``, or to a
+    list of such tuples that are served in turn on successive requests.
+    A ``Transfer-Encoding: chunked`` header sends the body in two chunks
+    followed by a trailer, and ``Connection: close`` sends it delimited by end-of-stream. An
+    ``X-Drop-Connection`` header closes the connection after the response
+    without announcing it. The client port of each request is recorded in
+    ``server.peers``.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        self.server.peers.append(self.client_address[1])
+        route = self.server.routes.get(self.path, (404, {}, b"missing"))
+        if isinstance(route, list):
+            route = route.pop(0) if len(route) > 1 else route[0]
+        status, headers, body = route
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if headers.get("Transfer-Encoding") == "chunked":
+            self.end_headers()
+            for piece in (body[:3], body[3:]):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\nX-Trailer: end\r\n\r\n")
+        elif headers.get("Connection") == "close":
+            self.end_headers()
+            self.wfile.write(body)
+            self.close_connection = True
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self.close_connection = "X-Drop-Connection" in headers
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_http_server():
+    """Run a threaded HTTP server on localhost for the duration of a test.
+
+    Tests register responses on ``server.routes`` and inspect received
+    requests on ``server.requests``; ``server.url`` is the base URL.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RouteHandler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.requests = []
+    server.peers = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
 # ------------------------------
 # Markers for pytest
 # ------------------------------
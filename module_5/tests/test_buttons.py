@@ -203,9 +203,9 @@ def test_pull_data_triggers_loader(monkeypatch, client):
 
     called = {"loader": False}
 
-    monkeypatch.setattr(refresh_module, "get_seen_ids_from_llm_extend_file", lambda: set())
-    monkeypatch.setattr(refresh_module, "scrape_new_records", lambda seen_ids: FAKE_ROWS)
-    monkeypatch.setattr(refresh_module, "enrich_with_details", lambda rows: rows)
+    monkeypatch.setattr(refresh_module, "load_seen_ids", lambda: set())
+    monkeypatch.setattr(refresh_module, "scrape_new_records", lambda seen_ids, **kwargs: FAKE_ROWS)
+    monkeypatch.setattr(refresh_module, "enrich_with_details", lambda rows, **kwargs: rows)
     monkeypatch.setattr(
         refresh_module, "write_new_applicant_file",
         lambda rows: called.update({"loader": True})
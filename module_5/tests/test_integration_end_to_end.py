@@ -358,6 +358,7 @@ def test_refresh_with_seen_ids(client, monkeypatch, tmp_path, instant_thread, fa
 # scrape_new_records BRANCHES
 # ============================================================
 
+@pytest.mark.parametrize("prefetch", [1, 3])
 @pytest.mark.parametrize("page_results_sequence, seen_ids, expected_new_count", [
     # First page new, second page seen -> early return via SEEN_LIMIT
     (
@@ -374,7 +375,7 @@ def test_refresh_with_seen_ids(client, monkeypatch, tmp_path, instant_thread, fa
 ])
 @pytest.mark.integration
 def test_scrape_new_records_all_branches(
-    monkeypatch, page_results_sequence, seen_ids, expected_new_count
+    monkeypatch, page_results_sequence, seen_ids, expected_new_count, prefetch
 ):
     """Parametrized test covering all branches in ``scrape_new_records``.
 
@@ -386,7 +387,8 @@ def test_scrape_new_records_all_branches(
     2. **Empty-page break** - all records are new across two pages; the
        third page is empty, triggering the loop's ``break`` condition.
 
-    In both cases, asserts that:
+    Each scenario runs serially and with a three-page prefetch window.
+    In all cases, asserts that:
 
     - The number of returned new records matches ``expected_new_count``.
     - No returned record ID is present in ``seen_ids``.
@@ -399,6 +401,8 @@ def test_scrape_new_records_all_branches(
     :type seen_ids: set[int]
     :param expected_new_count: Expected number of new records returned.
     :type expected_new_count: int
+    :param prefetch: Survey-page prefetch window size.
+    :type prefetch: int
     """
     call_counter = {"i": 0}
 
@@ -411,7 +415,7 @@ def test_scrape_new_records_all_branches(
 
     monkeypatch.setattr("src.refresh_gradcafe.scrape.parse_survey_page", fake_parse)
 
-    new_records = scrape_new_records(seen_ids)
+    new_records = scrape_new_records(seen_ids, prefetch=prefetch)
 
     assert len(new_records) == expected_new_count
     for rec in new_records:
@@ -604,9 +608,9 @@ def test_refresh_with_new_records(monkeypatch, tmp_path):
     """
     out_file = tmp_path / "new_applicants.json"
     monkeypatch.setattr(refresh_module, "NEW_APPLICANT_FILE", out_file)
-    monkeypatch.setattr(refresh_module, "get_seen_ids_from_llm_extend_file", lambda: set())
-    monkeypatch.setattr(refresh_module, "scrape_new_records", lambda seen_ids: _FAKE_ROWS)
-    monkeypatch.setattr(refresh_module, "enrich_with_details", lambda records: records)
+    monkeypatch.setattr(refresh_module, "load_seen_ids", lambda: set())
+    monkeypatch.setattr(refresh_module, "scrape_new_records", lambda seen_ids, **kwargs: _FAKE_ROWS)
+    monkeypatch.setattr(refresh_module, "enrich_with_details", lambda records, **kwargs: records)
     monkeypatch.setattr(refresh_module.clean, "clean_data", lambda records: records)
 
     def fake_write(records):
@@ -626,8 +630,8 @@ def test_refresh_no_new_records(monkeypatch):
 
     :param monkeypatch: Pytest monkeypatch fixture.
     """
-    monkeypatch.setattr(refresh_module, "get_seen_ids_from_llm_extend_file", lambda: set())
-    monkeypatch.setattr(refresh_module, "scrape_new_records", lambda seen_ids: [])
+    monkeypatch.setattr(refresh_module, "load_seen_ids", lambda: set())
+    monkeypatch.setattr(refresh_module, "scrape_new_records", lambda seen_ids, **kwargs: [])
 
     assert refresh_module.refresh()["new"] == 0
 
@@ -736,7 +740,7 @@ def test_sync_db_from_llm_file(monkeypatch):
             "comments": "Test",
             "date_added": "February 01, 2026",
             "url_link": "https://fake.com/1",
-            "applicant_status": "Accepted",
+            "applicant_status": "Accepted  via E-mail",
             "start_term": "Fall 2026",
             "International/US": "US",
             "gpa": "4.0",
@@ -1033,7 +1037,7 @@ def test_build_rows_skips_malformed_date(tmp_path, monkeypatch):
             "comments": "ok",
             "date_added": "February 01, 2026",
             "url_link": "https://fake.com/1",
-            "applicant_status": "Accepted",
+            "applicant_status": "Accepted  via E-mail",
             "start_term": "Fall 2026",
             "International/US": "US",
             "gpa": "3.9",
@@ -1069,6 +1073,7 @@ def test_build_rows_skips_malformed_date(tmp_path, monkeypatch):
     rows = _build_rows(str(ndjson))
 
     assert len(rows) == 1, "Only the valid record should produce a row"
+    assert rows[0][4] == "Accepted"
     assert any("Warning" in w and "not-a-date" in w for w in warnings), (
         "Expected a warning mentioning the malformed date"
     )
@@ -1150,6 +1155,446 @@ def test_enrich_with_details_logs_warning_on_failure(monkeypatch):
     )
 
 
+@pytest.mark.integration
+def test_enrich_with_details_asyncio_engine(monkeypatch):
+    """Verify ``enrich_with_details`` merges asyncio-engine results and logs failures.
+
+    Patches ``scrape.fetch_details_async`` to return one detail dict and
+    one exception. Asserts the first record is enriched and the second is
+    kept unchanged with a warning printed.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from src.refresh_gradcafe import enrich_with_details
+
+    records = [
+        {"result_id": "1", "gpa": ""},
+        {"result_id": "2", "gpa": ""},
+    ]
+    monkeypatch.setattr(
+        "src.refresh_gradcafe.scrape.fetch_details_async",
+        lambda ids: [{"gpa": "3.50"}, RuntimeError("timeout")],
+    )
+    warnings = []
+    monkeypatch.setattr("builtins.print", lambda msg: warnings.append(str(msg)))
+
+    result = enrich_with_details(records, engine="asyncio")
+
+    assert result[0]["gpa"] == "3.50"
+    assert result[1] == {"result_id": "2", "gpa": ""}
+    assert any("Warning" in w and "2" in w for w in warnings)
+
+
+@pytest.mark.integration
+def test_enrich_with_details_parse_processes(monkeypatch):
+    """Verify ``enrich_with_details`` parses in worker processes when enabled.
+
+    Sets ``scrape.PARSE_PROCESSES`` and patches ``scrape.fetch_html`` so
+    that one detail fetch fails. Asserts the good record is enriched by the
+    parser processes, the failed one is logged and left unchanged, and the
+    rate controller's report is printed.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from src.refresh_gradcafe import enrich_with_details
+    from src.scrape import rate_control
+
+    def fake_fetch(url):
+        if url.endswith("/2"):
+            raise RuntimeError("timeout")
+        return "<dl><div><dt>Undergrad GPA</dt><dd>3.50</dd></div></dl>"
+
+    monkeypatch.setattr(refresh_module.scrape, "PARSE_PROCESSES", 2)
+    monkeypatch.setattr(refresh_module.scrape, "fetch_html", fake_fetch)
+    records = [{"result_id": "1", "gpa": ""}, {"result_id": "2", "gpa": ""}]
+    warnings = []
+    monkeypatch.setattr("builtins.print", lambda msg: warnings.append(str(msg)))
+
+    monkeypatch.setattr(refresh_module.scrape, "RATE_CONTROLLER", rate_control.RateController())
+
+    result = enrich_with_details(records, engine="threads")
+
+    assert result[0]["gpa"] == "3.50"
+    assert result[1] == {"result_id": "2", "gpa": ""}
+    assert any("Warning" in w and "2" in w for w in warnings)
+    assert any(w.startswith("Request rate") for w in warnings)
+
+
+# ============================================================
+# refresh_gradcafe — resumable refresh sessions
+# ============================================================
+
+@pytest.mark.integration
+@pytest.mark.parametrize("pipeline_depth", [0, 2])
+def test_refresh_resume_after_interrupted_write(monkeypatch, tmp_path, pipeline_depth):
+    """Verify ``refresh(resume=True)`` reuses listed and enriched records.
+
+    The first refresh lists one page, enriches its two records and then
+    fails while writing the staging file. The resumed refresh must not
+    fetch any survey or detail page again and must write both records.
+    Runs with listing and enrichment sequential and pipelined.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :param pipeline_depth: Value for ``scrape.PIPELINE_DEPTH``.
+    """
+    monkeypatch.setattr(rgc.scrape, "PIPELINE_DEPTH", pipeline_depth)
+    monkeypatch.setattr(rgc, "REFRESH_SESSION_FILE", str(tmp_path / "s.json"))
+    monkeypatch.setattr(rgc, "REFRESH_CHECKPOINT_FILE", str(tmp_path / "c.ndjson"))
+    monkeypatch.setattr(rgc, "load_seen_ids", lambda: set())
+    monkeypatch.setattr(rgc, "REFRESH_SAVE_EVERY", 1)
+    pages = [[{"result_id": "7"}, {"result_id": "8"}], []]
+    monkeypatch.setattr(rgc.scrape, "fetch_html", lambda url: url)
+    monkeypatch.setattr(rgc.scrape, "parse_survey_page", lambda html: pages.pop(0))
+    monkeypatch.setattr(
+        rgc.scrape, "scrape_detail_page", lambda result_id: {"gpa": "3.0"},
+    )
+
+    def crash(records):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(rgc, "write_new_applicant_file", crash)
+    with pytest.raises(OSError):
+        rgc.refresh()
+
+    written = []
+    monkeypatch.setattr(rgc, "write_new_applicant_file", written.extend)
+    monkeypatch.setattr(
+        rgc.scrape, "fetch_html", lambda url: pytest.fail("re-fetched " + url),
+    )
+    monkeypatch.setattr(
+        rgc.scrape, "scrape_detail_page", lambda rid: pytest.fail("re-enriched"),
+    )
+
+    assert rgc.refresh(resume=True) == {"new": 2}
+    assert sorted(r["result_id"] for r in written) == ["7", "8"]
+    assert all(r["gpa"] == "3.0" for r in written)
+    assert not (tmp_path / "s.json").exists()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("pipeline_depth", [0, 2])
+def test_refresh_resume_after_crash_while_listing(monkeypatch, tmp_path, pipeline_depth):
+    """Verify a refresh that crashes partway through listing can be resumed.
+
+    Survey page 1 holds two new records and fetching page 2 fails. The
+    session must already be saved after page 1, even though far fewer
+    than ``REFRESH_SAVE_EVERY`` records were listed, so the resumed
+    refresh starts at page 2 and still writes the page-1 records.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :param pipeline_depth: Value for ``scrape.PIPELINE_DEPTH``.
+    """
+    monkeypatch.setattr(rgc.scrape, "PIPELINE_DEPTH", pipeline_depth)
+    monkeypatch.setattr(rgc, "REFRESH_SESSION_FILE", str(tmp_path / "s.json"))
+    monkeypatch.setattr(rgc, "REFRESH_CHECKPOINT_FILE", str(tmp_path / "c.ndjson"))
+    monkeypatch.setattr(rgc, "load_seen_ids", lambda: set())
+    url = rgc.scrape.SURVEY_URL.format
+    pages = {url(1): [{"result_id": "7"}, {"result_id": "8"}]}
+
+    def parse(html):
+        if html == url(2):
+            raise ConnectionError("connection reset")
+        return pages.get(html, [])
+
+    monkeypatch.setattr(rgc.scrape, "fetch_html", lambda page_url: page_url)
+    monkeypatch.setattr(rgc.scrape, "parse_survey_page", parse)
+    monkeypatch.setattr(
+        rgc.scrape, "scrape_detail_page", lambda result_id: {"gpa": "3.0"},
+    )
+    with pytest.raises(ConnectionError):
+        rgc.refresh()
+
+    with open(tmp_path / "s.json", "r", encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["last_page"] == 1
+    assert not state["listing_done"]
+
+    pages = {url(2): [{"result_id": "9"}]}
+    written = []
+    monkeypatch.setattr(rgc, "write_new_applicant_file", written.extend)
+
+    def fetch(page_url):
+        assert page_url != url(1), "re-fetched survey page 1"
+        return page_url
+
+    monkeypatch.setattr(rgc.scrape, "fetch_html", fetch)
+    monkeypatch.setattr(rgc.scrape, "parse_survey_page", lambda html: pages.get(html, []))
+
+    assert rgc.refresh(resume=True) == {"new": 3}
+    assert sorted(r["result_id"] for r in written) == ["7", "8", "9"]
+    assert all(r["gpa"] == "3.0" for r in written)
+    assert not (tmp_path / "s.json").exists()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("pipeline_depth", [0, 2])
+def test_refresh_closes_seen_index(monkeypatch, tmp_path, pipeline_depth):
+    """Verify ``refresh`` releases the mapped seen-ID index once listing
+    ends, both when it succeeds and when listing fails.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :param pipeline_depth: Value for ``scrape.PIPELINE_DEPTH``.
+    """
+    llm_file = tmp_path / "llm.json"
+    llm_file.write_text(
+        json.dumps({"url_link": f"{rgc.scrape.BASE_URL}/result/5"}) + "\n"
+    )
+    opened = []
+
+    def load_seen_ids():
+        opened.append(rgc.seen_index.SeenIndex.open(str(llm_file)))
+        return opened[-1]
+
+    monkeypatch.setattr(rgc.scrape, "PIPELINE_DEPTH", pipeline_depth)
+    monkeypatch.setattr(rgc, "REFRESH_SESSION_FILE", str(tmp_path / "s.json"))
+    monkeypatch.setattr(rgc, "REFRESH_CHECKPOINT_FILE", str(tmp_path / "c.ndjson"))
+    monkeypatch.setattr(rgc, "load_seen_ids", load_seen_ids)
+    monkeypatch.setattr(rgc, "write_new_applicant_file", lambda records: None)
+    monkeypatch.setattr(rgc.scrape, "fetch_html", lambda url: url)
+    monkeypatch.setattr(
+        rgc.scrape, "scrape_detail_page", lambda result_id: {"gpa": "3.0"},
+    )
+    pages = [[{"result_id": "7"}, {"result_id": "5"}], []]
+    monkeypatch.setattr(rgc.scrape, "parse_survey_page", lambda html: pages.pop(0))
+
+    assert rgc.refresh() == {"new": 1}
+    with pytest.raises(IndexError):
+        rgc.refresh()
+
+    assert len(opened) == 2
+    assert all(len(index) == 0 for index in opened)
+
+
+@pytest.mark.integration
+def test_list_and_enrich_overlaps_listing(monkeypatch, tmp_path):
+    """Verify ``list_and_enrich`` fetches details while survey pages are
+    still being listed, and logs failed fetches without dropping records.
+
+    With a depth of 1 the second record of page 1 cannot be submitted
+    until the first detail fetch finishes, so that fetch must happen
+    before survey page 2 is requested.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    from urllib.error import URLError
+    from src.scrape import rate_control
+
+    events = []
+    pages = [[{"result_id": "9"}, {"result_id": "8"}], [{"result_id": "7"}], []]
+    monkeypatch.setattr(rgc.scrape, "PIPELINE_DEPTH", 1)
+    monkeypatch.setattr(rgc, "load_seen_ids", lambda: set())
+    monkeypatch.setattr(rgc.scrape, "fetch_html", lambda url: events.append(url))
+    monkeypatch.setattr(rgc.scrape, "parse_survey_page", lambda html: pages.pop(0))
+
+    def fake_detail(result_id):
+        events.append(result_id)
+        if result_id == "8":
+            raise URLError("down")
+        return {"gpa": result_id}
+
+    monkeypatch.setattr(rgc.scrape, "scrape_detail_page", fake_detail)
+    monkeypatch.setattr(rgc.scrape, "RATE_CONTROLLER", rate_control.RateController())
+    session = rgc.crawl_session.CrawlSession.open(
+        str(tmp_path / "s.json"), str(tmp_path / "c.ndjson"),
+    )
+    pending = {"result_id": "10"}
+
+    listed = rgc.list_and_enrich(session, [pending])
+
+    assert [r["result_id"] for r in listed] == ["10", "9", "8", "7"]
+    assert [r.get("gpa") for r in listed] == ["10", "9", None, "7"]
+    assert events.index("9") < events.index(rgc.scrape.SURVEY_URL.format(2))
+    assert session.completed_ids == {"10", "9", "8", "7"}
+    assert session.listing_done
+    session.close()
+
+
+@pytest.mark.integration
+def test_refresh_uses_http_cache_for_its_duration(monkeypatch, tmp_path):
+    """Verify ``refresh`` installs the conditional-GET cache only while it runs.
+
+    The cache path comes from the argument or from ``HTTP_CACHE_PATH``; the
+    previous ``scrape.HTTP_CACHE`` is restored afterwards.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    seen = []
+
+    def fake_run(resume):
+        seen.append(rgc.scrape.HTTP_CACHE)
+        return {"new": 0}
+
+    monkeypatch.setattr(rgc, "_run_refresh", fake_run)
+
+    assert rgc.refresh(http_cache_path=str(tmp_path / "cache" / "a.sqlite3")) == {"new": 0}
+    monkeypatch.setattr(rgc, "HTTP_CACHE_PATH", str(tmp_path / "b.sqlite3"))
+    rgc.refresh()
+
+    assert [type(c).__name__ for c in seen] == ["HTTPCache", "HTTPCache"]
+    assert (tmp_path / "cache" / "a.sqlite3").exists()
+    assert rgc.scrape.HTTP_CACHE is None
+
+
+@pytest.mark.integration
+def test_scrape_new_records_resumes_after_session_page(monkeypatch):
+    """Verify ``scrape_new_records`` starts after the session's last page
+    and records each page's new records in the session.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    class FakeSession:
+        last_page = 4
+
+        def __init__(self):
+            self.listed = []
+
+        def add_listed(self, page, records):
+            self.listed.append((page, [r["result_id"] for r in records]))
+
+    urls = []
+    pages = [[{"result_id": "3"}, {"result_id": "2"}], []]
+    monkeypatch.setattr(rgc.scrape, "fetch_html", lambda url: urls.append(url))
+    monkeypatch.setattr(rgc.scrape, "parse_survey_page", lambda html: pages.pop(0))
+    session = FakeSession()
+
+    records = scrape_new_records({2}, session=session)
+
+    assert [r["result_id"] for r in records] == ["3"]
+    assert urls[0] == rgc.scrape.SURVEY_URL.format(5)
+    assert session.listed == [(5, ["3"])]
+
+
+def _fake_survey(monkeypatch, last_page, per_page=10, top_id=1000):
+    """Serve a survey of ``last_page`` pages whose IDs fall page by page.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param last_page: Number of non-empty survey pages.
+    :param per_page: Records per page.
+    :param top_id: Result ID of the first record on page 1.
+    :returns: List that collects every page number fetched.
+    :rtype: list[int]
+    """
+    fetched = []
+
+    def fake_fetch_page(page):
+        fetched.append(page)
+        if page > last_page:
+            return []
+        first = top_id - (page - 1) * per_page
+        return [{"result_id": str(first - i)} for i in range(per_page)]
+
+    monkeypatch.setattr(rgc.scrape, "fetch_survey_page", fake_fetch_page)
+    return fetched
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("newest_seen, expected", [(775, 23), (1000, 1), (0, 41)])
+def test_find_frontier_page(monkeypatch, newest_seen, expected):
+    """Verify ``find_frontier_page`` finds the first page reaching seen IDs
+    in a logarithmic number of probes, including past the last page.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param newest_seen: Largest already-seen result ID.
+    :param expected: Expected frontier page.
+    """
+    fetched = _fake_survey(monkeypatch, last_page=40)
+
+    frontier, probed = rgc.find_frontier_page(newest_seen)
+
+    assert frontier == expected
+    assert set(probed) == set(fetched)
+    assert len(fetched) <= 12
+
+
+@pytest.mark.integration
+def test_scrape_new_records_frontier_mode(monkeypatch, tmp_path):
+    """Verify frontier mode returns every unseen record above the boundary,
+    fetching each page once and recording pages in the session in order.
+    A :class:`seen_index.SeenIndex` gives the same boundary as a set.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    class FakeSession:
+        last_page = 2
+
+        def __init__(self):
+            self.listed = []
+
+        def add_listed(self, page, records):
+            self.listed.append((page, len(records)))
+
+    fetched = _fake_survey(monkeypatch, last_page=40)
+    monkeypatch.setattr(rgc, "FRONTIER_SEARCH", True)
+    seen_ids = {775, 770, 500}
+    session = FakeSession()
+
+    batches = []
+    records = scrape_new_records(seen_ids, session=session, on_listed=batches.append)
+
+    assert [r for batch in batches for r in batch] == records
+    ids = [int(r["result_id"]) for r in records]
+    assert ids == [i for i in range(980, 770, -1) if i != 775]
+    assert [page for page, _ in session.listed] == list(range(3, 24))
+    assert len(fetched) == len(set(fetched))
+    assert min(fetched) == 3
+
+    llm_file = tmp_path / "llm.json"
+    llm_file.write_text("".join(
+        json.dumps({"url_link": f"{rgc.scrape.BASE_URL}/result/{i}"}) + "\n"
+        for i in seen_ids
+    ))
+    indexed = rgc.load_seen_ids(str(llm_file))
+    records = scrape_new_records(indexed, frontier=True)
+    assert [int(r["result_id"]) for r in records] == [
+        i for i in range(1000, 770, -1) if i != 775
+    ]
+
+
+@pytest.mark.integration
+def test_scrape_new_records_frontier_without_seen_ids_walks_pages(monkeypatch):
+    """Verify frontier mode falls back to the serial walk with no seen IDs.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    pages = [[{"result_id": "2"}, {"result_id": "1"}], []]
+    monkeypatch.setattr(rgc.scrape, "fetch_html", lambda url: "HTML")
+    monkeypatch.setattr(rgc.scrape, "parse_survey_page", lambda html: pages.pop(0))
+
+    records = scrape_new_records(set(), frontier=True)
+
+    assert [r["result_id"] for r in records] == ["2", "1"]
+
+
+@pytest.mark.integration
+def test_enrich_with_details_on_complete_callback(monkeypatch):
+    """Verify ``enrich_with_details`` reports every finished record to ``on_complete``.
+
+    Covers both the thread-pool and asyncio engines.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(
+        rgc.scrape, "scrape_detail_page", lambda result_id: {"gpa": "4.0"},
+    )
+    monkeypatch.setattr(
+        rgc.scrape, "fetch_details_async", lambda ids: [{"gpa": "4.0"} for _ in ids],
+    )
+
+    for engine in ("threads", "asyncio"):
+        done = []
+        enrich_with_details(
+            [{"result_id": "1"}, {"result_id": "2"}],
+            engine=engine, on_complete=done.append,
+        )
+        assert sorted(r["result_id"] for r in done) == ["1", "2"]
+
+
 # ============================================================
 # refresh_gradcafe — write_new_applicant_file JSONDecodeError (line 161)
 # ============================================================
@@ -1238,4 +1683,747 @@ def test_update_data_llm_failure_sets_fields_to_none(monkeypatch, tmp_path):
     assert len(written) == 1
     assert written[0]["llm-generated-program"] is None
     assert written[0]["llm-generated-university"] is None
-    assert any("Warning" in w and "LLM call failed" in w for w in warnings)
\ No newline at end of file
+    assert any("Warning" in w and "LLM call failed" in w for w in warnings)
+
+# ============================================================
+# llm_cache — persistent LLM result cache
+# ============================================================
+
+@pytest.mark.integration
+def test_llm_cache_normalizes_keys_and_versions(tmp_path):
+    """Verify cached results survive reopening, ignore case and whitespace,
+    and are isolated by version tag.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from src.scrape.llm_hosting import llm_cache
+
+    path = str(tmp_path / "cache" / "llm.sqlite3")
+    version = llm_cache.version_tag("model.gguf", "prompt")
+    assert version != llm_cache.version_tag("model.gguf", "edited prompt")
+
+    cache = llm_cache.LLMCache(path, version)
+    assert cache.stats()["hit_rate"] == 0.0
+    assert cache.get("Computer Science, Stanford University") is None
+    cache.put("Computer Science, Stanford University", {"standardized_program": "CS"})
+    cache.close()
+
+    cache = llm_cache.LLMCache(path, version)
+    assert cache.get("  computer science,   STANFORD university ") == {
+        "standardized_program": "CS",
+    }
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 0)
+    assert stats["hit_rate"] == 1.0
+    cache.close()
+
+    other = llm_cache.LLMCache(path, llm_cache.version_tag("model.gguf", "edited prompt"))
+    assert other.get("Computer Science, Stanford University") is None
+    other.close()
+
+
+@pytest.mark.integration
+def test_llm_cache_evicts_least_recently_used(tmp_path):
+    """Verify eviction by recency, with hit recency buffered and then written.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from src.scrape.llm_hosting import llm_cache
+
+    path = str(tmp_path / "llm.sqlite3")
+    cache = llm_cache.LLMCache(path, "v1", max_entries=2, touch_every=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}  # buffered: "a" is now most recent
+    cache.put("c", {"n": 3})  # writes the buffered hit, then evicts "b"
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}  # second buffered hit writes both
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+
+@pytest.mark.integration
+def test_llm_app_cache_is_anchored_and_versions_batch_prompt(monkeypatch, tmp_path):
+    """Verify the default cache lives beside the app, not the working
+    directory, and that editing the batched prompt changes its version.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from src.scrape.llm_hosting import app as llm_app
+
+    if "LLM_CACHE_PATH" not in os.environ:
+        assert os.path.isabs(llm_app.LLM_CACHE_PATH)
+
+    def opened_version():
+        monkeypatch.setattr(llm_app, "_CACHE", None)
+        cache = llm_app._load_cache()
+        cache.close()
+        return cache.version
+
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    versions = [opened_version()]
+    monkeypatch.setattr(llm_app, "BATCH_SYSTEM_PROMPT", "edited")
+    versions.append(opened_version())
+    monkeypatch.setattr(llm_app, "BATCH_FEW_SHOT", ({}, []))
+    versions.append(opened_version())
+    assert len(set(versions)) == 3
+
+
+# ============================================================
+# LLM batching — multi-row prompts
+# ============================================================
+
+@pytest.mark.integration
+@pytest.mark.parametrize("batch_fails", [False, True])
+def test_update_data_batches_llm_calls(monkeypatch, tmp_path, batch_fails):
+    """Verify ``update_data`` standardizes records through one batched call,
+    and falls back to one ``_call_llm`` per record if that call fails.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    :param batch_fails: Whether the batched call raises.
+    """
+    def fake_batch(program_texts, batch_size, workers):
+        assert (batch_size, workers) == (4, 1)
+        if batch_fails:
+            raise RuntimeError("model crashed")
+        return [{"standardized_program": t.split(",")[0] + "-batch",
+                 "standardized_university": "U"} for t in program_texts]
+
+    singles = []
+    monkeypatch.setattr("src.update_data.LLM_BATCH_SIZE", 4)
+    monkeypatch.setattr("src.update_data._call_llm_batch", fake_batch)
+    monkeypatch.setattr(
+        "src.update_data._call_llm",
+        lambda t: singles.append(t) or {"standardized_program": "single",
+                                        "standardized_university": "U"},
+    )
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+
+    staging_file = tmp_path / "new_applicants.json"
+    staging_file.write_text(json.dumps([
+        {"program_name": "CS", "university": "MIT"},
+        {"program_name": "EE", "university": "MIT"},
+    ]), encoding="utf-8")
+    output_file = tmp_path / "llm_output.ndjson"
+
+    assert update_data(str(staging_file), str(output_file)) == 2
+
+    written = [json.loads(line) for line in output_file.read_text().splitlines()]
+    if batch_fails:
+        assert singles == ["CS, MIT", "EE, MIT"]
+        assert [w["llm-generated-program"] for w in written] == ["single", "single"]
+    else:
+        assert not singles
+        assert [w["llm-generated-program"] for w in written] == ["CS-batch", "EE-batch"]
+
+
+@pytest.mark.integration
+def test_parse_batch_matches_rows_by_id_or_position():
+    """Verify batched replies are matched to rows robustly.
+
+    Rows are matched by echoed id in any order, by position when ids are
+    missing but the count matches, and left as ``None`` when malformed.
+    """
+    from src.scrape.llm_hosting import app as llm_app
+
+    def obj(prog, **extra):
+        return {"standardized_program": prog, "standardized_university": "U", **extra}
+
+    reply = "Sure:\n" + json.dumps([obj("B", id=1), obj("A", id=0), {"id": 2}])
+    assert llm_app._parse_batch(reply, 3) == [("A", "U"), ("B", "U"), None]
+
+    assert llm_app._parse_batch(json.dumps([obj("A"), obj("B")]), 2) == [
+        ("A", "U"), ("B", "U"),
+    ]
+    assert llm_app._parse_batch(json.dumps([obj("A")]), 2) == [None, None]
+
+    # Truncated array: complete objects are still salvaged
+    salvaged = json.dumps(obj("A", id=0)) + ", {bad}, " + '{"id": 1, "standardized_pro'
+    assert llm_app._parse_batch("[" + salvaged, 2) == [("A", "U"), None]
+
+
+@pytest.mark.integration
+def test_llm_app_public_helpers(monkeypatch, tmp_path):
+    """Verify ``read_rows`` accepts both input shapes and
+    ``standardize_texts`` with ``batch_size=1`` answers one row at a time.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from src.scrape.llm_hosting import app as llm_app
+
+    rows = [{"program_name": "Math", "university": "McG"}]
+    for payload in (rows, {"rows": rows}):
+        path = tmp_path / "rows.json"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        assert llm_app.read_rows(str(path)) == rows
+
+    monkeypatch.setattr(llm_app, "_call_llm", lambda t: {"text": t})
+    assert llm_app.standardize_texts(["a", "b"], batch_size=1, workers=1) == [
+        {"text": "a"}, {"text": "b"},
+    ]
+
+
+@pytest.mark.integration
+def test_call_llm_batch_dedupes_and_falls_back(monkeypatch):
+    """Verify ``_call_llm_batch`` packs distinct inputs into batches and
+    retries unanswered rows one at a time.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from src.scrape.llm_hosting import app as llm_app
+
+    prompts = []
+
+    class FakeLLM:
+        """Answers every batch but drops the last row."""
+
+        def create_chat_completion(self, messages, **_kwargs):
+            rows = json.loads(messages[-1]["content"])["rows"]
+            prompts.append([r["program"] for r in rows])
+            reply = [{"id": r["id"], "standardized_program": "Mathematics",
+                      "standardized_university": "McGill University"}
+                     for r in rows[:-1]]
+            return {"choices": [{"message": {"content": json.dumps(reply)}}]}
+
+        def tokenize(self, text):
+            return text.split()
+
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(llm_app, "PREFIX_CACHE", False)
+    monkeypatch.setattr(llm_app, "_load_llm", FakeLLM)
+    monkeypatch.setattr(
+        llm_app, "_generate",
+        lambda t: {"standardized_program": "single", "standardized_university": t},
+    )
+
+    texts = ["a, McG", "b, McG", "a, McG", "c, McG"]
+    results = llm_app._call_llm_batch(texts, batch_size=2)
+
+    assert prompts == [["a, McG", "b, McG"], ["c, McG"]]
+    assert [r["standardized_program"] for r in results] == [
+        "Mathematics", "single", "Mathematics", "single",
+    ]
+    assert results[1]["standardized_university"] == "b, McG"
+
+
+@pytest.mark.integration
+def test_generate_batch_fits_reply_into_context(monkeypatch):
+    """Verify a batch whose reply would overflow ``N_CTX`` is split until
+    each completion's ``max_tokens`` fits the room left after its prompt,
+    and that a lone row that still does not fit uses the single-row prompt.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from src.scrape.llm_hosting import app as llm_app
+
+    class FakeLLM:
+        """Counts one token per whitespace-separated word."""
+
+        def tokenize(self, text):
+            return text.split()
+
+    completions = []
+
+    def complete(prefix, content, max_tokens):
+        rows = json.loads(content)["rows"]
+        prompt = prefix + [{"role": "user", "content": content}]
+        completions.append((len(rows), max_tokens, llm_app._prompt_tokens(prompt)))
+        return json.dumps([{"id": r["id"], "standardized_program": "P",
+                            "standardized_university": "U"} for r in rows])
+
+    monkeypatch.setattr(llm_app, "_load_llm", FakeLLM)
+    monkeypatch.setattr(llm_app, "_complete", complete)
+    monkeypatch.setattr(
+        llm_app, "_generate",
+        lambda t: {"standardized_program": "single", "standardized_university": t},
+    )
+    texts = [f"p{i}, u" for i in range(4)]
+    two_rows = llm_app._prompt_tokens(llm_app._batch_prefix_messages() + [{
+        "role": "user",
+        "content": json.dumps({"rows": [{"id": i, "program": t}
+                                        for i, t in enumerate(texts[:2])]}),
+    }])
+    monkeypatch.setattr(llm_app, "N_CTX", two_rows + 2 * llm_app.BATCH_TOKENS_PER_ROW
+                        + llm_app.BATCH_TOKENS_EXTRA)
+
+    results = llm_app._generate_batch(texts)
+
+    assert [rows for rows, _, _ in completions] == [2, 2]
+    assert all(used + budget <= llm_app.N_CTX for _, budget, used in completions)
+    assert [r["standardized_program"] for r in results] == ["P"] * 4
+
+    monkeypatch.setattr(llm_app, "N_CTX", 10)
+    assert llm_app._generate_batch(texts[:1])[0]["standardized_program"] == "single"
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("batch_size", [1, 2])
+def test_call_llm_batch_spreads_chunks_over_workers(monkeypatch, batch_size):
+    """Verify that with ``workers`` above 1 the cache misses are split into
+    chunks, mapped over the worker pool and returned in input order, and
+    that each worker gets its share of the threads.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param batch_size: Program strings per prompt.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.scrape.llm_hosting import app as llm_app
+
+    def answer(text):
+        return {"standardized_program": text.upper(), "standardized_university": "U"}
+
+    pools = []
+
+    def fake_pool(workers):
+        # Threads stand in for the spawned processes so the stubs apply
+        pools.append(workers)
+        return ThreadPoolExecutor(workers)
+
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(llm_app, "FAST_PATH", False)
+    monkeypatch.setattr(llm_app, "_worker_pool", fake_pool)
+    monkeypatch.setattr(llm_app, "_generate", answer)
+    monkeypatch.setattr(llm_app, "_generate_batch", lambda chunk: [answer(t) for t in chunk])
+
+    texts = [f"p{i}, u" for i in range(7)] + ["p0, u"]
+    results = llm_app._call_llm_batch(texts, batch_size=batch_size, workers=3)
+
+    assert [r["standardized_program"] for r in results] == [t.upper() for t in texts]
+    assert pools == [3]
+
+    # A single chunk is not worth a round trip to the pool
+    llm_app._call_llm_batch(["p9, u"], batch_size=batch_size, workers=3)
+    assert pools == [3]
+
+    monkeypatch.setattr(llm_app, "N_THREADS", 32)
+    llm_app._init_worker(8)
+    assert llm_app.N_THREADS == 8
+
+
+@pytest.mark.integration
+def test_worker_pool_rebuilt_when_size_changes(monkeypatch):
+    """Verify the worker pool is reused for the same ``workers`` value and
+    replaced, after shutting the old one down, when the value changes.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    import atexit
+
+    from src.scrape.llm_hosting import app as llm_app
+
+    class FakeExecutor:
+        """Records its size and whether it was shut down."""
+
+        def __init__(self, max_workers, **_kwargs):
+            self.max_workers = max_workers
+            self.closed = False
+
+        def shutdown(self):
+            self.closed = True
+
+    monkeypatch.setattr(llm_app, "ProcessPoolExecutor", FakeExecutor)
+    monkeypatch.setattr(llm_app, "_model_path", lambda: "model.gguf")
+    monkeypatch.setattr(llm_app, "_POOL", None)
+    monkeypatch.setattr(atexit, "register", lambda func: None)
+    monkeypatch.setattr(atexit, "unregister", lambda func: None)
+
+    first = llm_app._worker_pool(2)
+    assert llm_app._worker_pool(2) is first
+    second = llm_app._worker_pool(3)
+
+    assert first.closed and not second.closed
+    assert (first.max_workers, second.max_workers) == (2, 3)
+    assert llm_app._worker_pool(3) is second
+
+
+# ============================================================
+# LLM prefix-state reuse
+# ============================================================
+
+@pytest.mark.integration
+def test_prefix_state_built_once_and_persisted(monkeypatch, tmp_path):
+    """Verify the fixed-prefix state is evaluated once, saved next to the
+    model, loaded only when the context does not already hold the prefix,
+    reloaded from disk by a fresh process, and rebuilt when the saved file
+    cannot be unpickled.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from types import SimpleNamespace
+    from src.scrape.llm_hosting import app as llm_app
+
+    class FakeLLM:
+        """Tokenizes each message to one token and records state calls."""
+
+        model_path = str(tmp_path / "model.gguf")
+
+        def __init__(self):
+            self.input_ids, self.n_tokens = [], 0
+            self.calls = []
+
+        def create_chat_completion(self, messages, **_kwargs):
+            self.input_ids = [m["content"] for m in messages]
+            self.n_tokens = len(self.input_ids)
+            self.calls.append("complete")
+            reply = {"standardized_program": "Mathematics",
+                     "standardized_university": "McGill University"}
+            return {"choices": [{"message": {"content": json.dumps(reply)}}]}
+
+        def reset(self):
+            self.input_ids, self.n_tokens = [], 0
+            self.calls.append("reset")
+
+        def eval(self, tokens):
+            self.input_ids, self.n_tokens = list(tokens), len(tokens)
+            self.calls.append(("eval", len(tokens)))
+
+        def save_state(self):
+            return SimpleNamespace(input_ids=list(self.input_ids), n_tokens=self.n_tokens)
+
+        def load_state(self, state):
+            self.input_ids, self.n_tokens = list(state.input_ids), state.n_tokens
+            self.calls.append("load")
+
+    llm = FakeLLM()
+    monkeypatch.setattr(llm_app, "PREFIX_CACHE", True)
+    monkeypatch.setattr(llm_app, "_PREFIX_STATES", {})
+    monkeypatch.setattr(llm_app, "_load_llm", lambda: llm)
+
+    llm_app._generate("Math, McG")
+    llm_app._generate("Math, McG")
+
+    prefix_len = len(llm_app._prefix_messages())
+    assert llm.calls == [
+        "complete", "complete", "reset", ("eval", prefix_len), "complete",
+        "complete",
+    ]
+    state_files = list(tmp_path.glob("*.prefix-state"))
+    assert len(state_files) == 1
+
+    # Another prompt left in the context: the prefix state is loaded again
+    llm.calls, llm.input_ids, llm.n_tokens = [], ["other"] * prefix_len, prefix_len
+    llm_app._generate("Math, McG")
+    assert llm.calls == ["load", "complete"]
+
+    # A new process: nothing in memory, state comes from disk
+    llm = FakeLLM()
+    monkeypatch.setattr(llm_app, "_PREFIX_STATES", {})
+    llm_app._generate("Math, McG")
+    assert llm.calls == ["load", "complete"]
+
+    # A state file that no longer unpickles is rebuilt and replaced
+    state_files[0].write_bytes(b"cno_such_module\nState\n.")
+    llm = FakeLLM()
+    monkeypatch.setattr(llm_app, "_PREFIX_STATES", {})
+    llm_app._generate("Math, McG")
+    assert llm.calls == [
+        "complete", "complete", "reset", ("eval", prefix_len), "complete",
+    ]
+    assert [p.name for p in tmp_path.iterdir()] == [state_files[0].name]
+
+
+# ============================================================
+# LLM rules-first fast path
+# ============================================================
+
+@pytest.mark.integration
+def test_fast_path_resolves_canonical_names_and_aliases(monkeypatch):
+    """Verify exact, near-exact and alias inputs skip the model, and that
+    anything unresolved falls through to it.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from src.scrape.llm_hosting import app as llm_app
+
+    generated = []
+    monkeypatch.setattr(llm_app, "FAST_PATH_STATS", {"hits": 0, "misses": 0})
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(
+        llm_app, "_generate",
+        lambda t: generated.append(t) or {"standardized_program": "?",
+                                          "standardized_university": "?"},
+    )
+
+    def std(text):
+        result = llm_app._call_llm(text)
+        return result["standardized_program"], result["standardized_university"]
+
+    assert std("Computer Science, Stanford University") == (
+        "Computer Science", "Stanford University",
+    )
+    assert std(" computer  science , university of california, berkeley") == (
+        "Computer Science", "University of California, Berkeley",
+    )
+    assert std("Mathematic at McG") == ("Mathematics", "McGill University")
+    assert not generated
+
+    assert std("Basket Weaving, Stanford University") == ("?", "?")
+    assert std("Computer Science") == ("?", "?")
+    assert llm_app._call_llm_batch(
+        ["Computer Science, Nowhere College", "History, UBC"], batch_size=1,
+    )[1]["standardized_university"] == "University of British Columbia"
+    assert len(generated) == 3
+    assert llm_app._fast_path_stats() == {"hits": 4, "misses": 3, "hit_rate": 4 / 7}
+
+    monkeypatch.setattr(llm_app, "FAST_PATH", False)
+    assert llm_app._fast_path("Computer Science, Stanford University") is None
+
+
+@pytest.mark.integration
+def test_fast_path_stats_count_every_threaded_lookup(monkeypatch):
+    """Verify concurrent fast-path lookups, as made by threaded request
+    handlers, are all counted.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.scrape.llm_hosting import app as llm_app
+
+    monkeypatch.setattr(llm_app, "FAST_PATH", True)
+    monkeypatch.setattr(llm_app, "FAST_PATH_STATS", {"hits": 0, "misses": 0})
+    texts = ["Computer Science, Stanford University", "Basket Weaving, Nowhere"] * 2000
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(llm_app._fast_path, texts))
+
+    assert llm_app._fast_path_stats() == {"hits": 2000, "misses": 2000, "hit_rate": 0.5}
+
+
+@pytest.mark.integration
+def test_canonical_index_drops_ambiguous_keys():
+    """Verify names that collide after normalization are not indexed."""
+    from src.scrape.llm_hosting import app as llm_app
+
+    index = llm_app._build_index(
+        ["St. Mary's College", "St Marys College", "Art & Design"],
+        {"Art Desing": "Art & Design"},
+    )
+
+    assert "st marys college" not in index
+    assert index["art and design"] == "Art & Design"
+    assert index["art desing"] == "Art & Design"
+
+
+# ============================================================
+# fuzzy_index — indexed canonical-name matching
+# ============================================================
+
+@pytest.mark.integration
+@pytest.mark.parametrize("cutoff", [0.0, 0.6, 0.84, 0.86, 1.0])
+def test_fuzzy_index_matches_difflib(cutoff):
+    """Verify the index returns exactly what difflib would for misspelled,
+    truncated, padded and unrelated names.
+
+    :param cutoff: Minimum similarity ratio.
+    """
+    import difflib
+
+    from src.scrape.llm_hosting import app as llm_app
+    from src.scrape.llm_hosting.fuzzy_index import FuzzyIndex
+
+    candidates = llm_app.CANON_UNIS[:300] + llm_app.CANON_UNIS[:5]
+    index = FuzzyIndex(candidates)
+    queries = ["", "x", "Qzqzqz", "Stanford", "University of Tornto",
+               "Universty of Michigan, Ann Arbor", "Massachusetts Institute of Technolgy",
+               "McGill  University ", "Harvard Universityy", candidates[7]]
+    queries += [c[1:] for c in candidates[:40]] + [c[::2] for c in candidates[:40]]
+
+    for q in queries:
+        expected = difflib.get_close_matches(q, candidates, n=1, cutoff=cutoff)
+        assert index.best_match(q, cutoff) == (expected[0] if expected else None), q
+    assert len(index) == 300
+    assert candidates[0] in index and "Nowhere College" not in index
+
+
+@pytest.mark.integration
+def test_post_normalize_uses_fuzzy_index():
+    """Verify canonical, misspelled and unknown names through the matchers."""
+    from src.scrape.llm_hosting import app as llm_app
+    from src.scrape.llm_hosting.fuzzy_index import FuzzyIndex
+
+    assert llm_app._post_normalize_university("McGill University") == "McGill University"
+    assert llm_app._post_normalize_university("Mcgill Universty") == "McGill University"
+    assert llm_app._post_normalize_program("Computer Sciense") == "Computer Science"
+    assert llm_app._post_normalize_program("Basket Weaving") == "Basket Weaving"
+    assert llm_app._best_match("", llm_app.UNI_MATCHER) is None
+    assert llm_app._best_match("Physics", FuzzyIndex([])) is None
+
+
+# ============================================================
+# LLM service client — update_data over /standardize
+# ============================================================
+
+@pytest.fixture
+def llm_service(monkeypatch):
+    """Serve the llm_hosting app on a local port with a stubbed generator.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :returns: Tuple of ``(base_url, generated_texts)``.
+    """
+    import threading
+
+    from werkzeug.serving import make_server
+
+    from src.scrape.llm_hosting import app as llm_app
+
+    generated = []
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(llm_app, "FAST_PATH", False)
+    monkeypatch.setattr(
+        llm_app, "_generate",
+        lambda t: generated.append(t) or {"standardized_program": t.split(",")[0] + "!",
+                                          "standardized_university": "U"},
+    )
+    server = make_server("127.0.0.1", 0, llm_app.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", generated
+    server.shutdown()
+    thread.join()
+
+
+@pytest.mark.integration
+def test_update_data_uses_llm_service(monkeypatch, tmp_path, llm_service):
+    """Verify client mode standardizes records through the service in
+    concurrent batches, sends repeated inputs once, keeps record order and
+    never calls the in-process model.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    :param llm_service: Local service fixture.
+    """
+    url, generated = llm_service
+    monkeypatch.setattr("src.update_data.LLM_SERVICE_URL", url + "/")
+    monkeypatch.setattr("src.update_data.LLM_SERVICE_BATCH_SIZE", 2)
+    monkeypatch.setattr("src.update_data.LLM_SERVICE_CONCURRENCY", 2)
+    monkeypatch.setattr("src.update_data._call_llm", lambda t: pytest.fail("in-process LLM"))
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+
+    programs = ["CS", "EE", "CS", "Math", "Physics", "Café"]
+    staging_file = tmp_path / "new_applicants.json"
+    staging_file.write_text(json.dumps(
+        [{"program_name": p, "university": "MIT", "result_id": i} for i, p in enumerate(programs)]
+    ), encoding="utf-8")
+    output_file = tmp_path / "llm_output.ndjson"
+
+    assert update_data(str(staging_file), str(output_file)) == 6
+
+    written = [json.loads(line) for line in output_file.read_text(encoding="utf-8").splitlines()]
+    assert [w["result_id"] for w in written] == list(range(6))
+    assert [w["llm-generated-program"] for w in written] == [p + "!" for p in programs]
+    assert sorted(generated) == sorted(f"{p}, MIT" for p in set(programs))
+
+
+@pytest.mark.integration
+def test_update_data_imports_model_host_lazily(monkeypatch):
+    """Verify importing ``update_data`` loads neither the model host nor
+    llama.cpp, and that the in-process wrappers delegate to the host.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    import subprocess
+
+    from src import update_data as update_module
+    from src.scrape.llm_hosting import app as llm_app
+
+    probe = (
+        "import sys, src.update_data; "
+        "print(any(m.startswith(('src.scrape.llm_hosting', 'llama_cpp')) for m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+                         check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert out.stdout.strip() == "False"
+
+    monkeypatch.setattr(llm_app, "_call_llm", lambda t: {"text": t})
+    monkeypatch.setattr(llm_app, "_call_llm_batch",
+                        lambda texts, batch_size, workers: [(batch_size, workers)] * len(texts))
+    assert update_module._call_llm("CS, MIT") == {"text": "CS, MIT"}
+    assert update_module._call_llm_batch(["a", "b"], 4, 2) == [(4, 2), (4, 2)]
+
+
+@pytest.mark.integration
+def test_llm_service_client_failures(monkeypatch, llm_service):
+    """Verify unreachable services, error statuses and short replies give
+    ``None`` for the affected rows only, and that ``update_data`` records
+    them with ``None`` fields.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param llm_service: Local service fixture.
+    """
+    from src.llm_client import LLMServiceClient
+    from src.scrape.llm_hosting import app as llm_app
+
+    url, _ = llm_service
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+    rows = [{"program_name": "CS", "university": "MIT"}]
+
+    assert LLMServiceClient("http://127.0.0.1:9").standardize(rows) == [None]
+    assert LLMServiceClient(url + "/missing").standardize(rows) == [None]
+
+    real_batch = llm_app._call_llm_batch
+    monkeypatch.setattr(
+        llm_app, "_call_llm_batch",
+        lambda texts: [] if texts == ["EE, MIT"] else real_batch(texts),
+    )
+    client = LLMServiceClient(url, batch_size=1)
+    assert client.standardize(rows + [{"program_name": "EE", "university": "MIT"}]) == [
+        {"standardized_program": "CS!", "standardized_university": "U"}, None,
+    ]
+    client.close()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("body", [
+    b"not json", b"[]", b'{"ok": true}', b'{"rows": {"0": {}}}', b'{"rows": [1]}',
+])
+def test_llm_service_client_malformed_reply(monkeypatch, body):
+    """Verify a well-formed HTTP reply with an unexpected body gives ``None``
+    for the batch instead of raising.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param body: Response body returned by the service.
+    :type body: bytes
+    """
+    from src.llm_client import LLMServiceClient
+
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+    client = LLMServiceClient("http://llm.invalid")
+    monkeypatch.setattr(client.pool, "request", lambda *a, **k: (200, "OK", {}, body))
+
+    assert client.standardize([{"program_name": "CS", "university": "MIT"}]) == [None]
+
+
+@pytest.mark.integration
+def test_update_data_llm_service_down(monkeypatch, tmp_path):
+    """Verify records the service does not answer are written with ``None``.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    monkeypatch.setattr("src.update_data.LLM_SERVICE_URL", "http://127.0.0.1:9")
+    monkeypatch.setattr("src.update_data._call_llm", lambda t: pytest.fail("in-process LLM"))
+    monkeypatch.setattr("builtins.print", lambda *a, **k: None)
+
+    staging_file = tmp_path / "new_applicants.json"
+    staging_file.write_text(json.dumps([{"program_name": "CS", "university": "MIT"}]),
+                            encoding="utf-8")
+    output_file = tmp_path / "llm_output.ndjson"
+
+    assert update_data(str(staging_file), str(output_file)) == 1
+    written = json.loads(output_file.read_text(encoding="utf-8"))
+    assert written["llm-generated-program"] is None
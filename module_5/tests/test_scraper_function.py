@@ -22,6 +22,8 @@ All tests are marked ``database`` and use ``monkeypatch`` / ``tmp_path``
 to avoid touching real network or disk resources.
 """
 
+import importlib.util
+import io
 import json
 import pytest
 from pathlib import Path
@@ -29,6 +31,8 @@ from bs4 import BeautifulSoup
 from urllib.error import URLError, HTTPError
 from src.scrape import scrape
 from src.scrape import clean
+from src.scrape import detail_pipeline, json_stream
+from src.scrape.record import ApplicantRecord, json_default
 
 
 # ============================================================
@@ -317,152 +321,1548 @@ def test_empty_detail_fields(monkeypatch):
         assert result[key] == ""
 
 
+# ============================================================
+# extract_detail_fields (single pass)
+# ============================================================
+
+#: Detail page with repeated labels, nested spans and a trailing GRE label.
+FAKE_DETAIL_TRICKY = """
+<dl>
+    <div><dt>Program</dt><dd>First  Program</dd></div>
+    <div><dt>Program</dt><dd>Second Program</dd></div>
+    <div><dt>Undergrad GPA</dt><dd>99.99</dd></div>
+    <div><span>GRE General: <span>165</span></span><span>330</span></div>
+    <div><span>Other:</span><span>x</span></div>
+    <div><span>GRE Verbal:</span><span>160</span></div>
+    <div><span>GRE Verbal:</span><span>0.0</span></div>
+</dl>
+<span>Analytical Writing:</span>
+"""
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "html",
+    [FAKE_DETAIL_HTML, FAKE_DETAIL_EMPTY, FAKE_DETAIL_TRICKY],
+)
+def test_extract_detail_fields_matches_per_field_extractors(html):
+    """Verify the one-pass extractor matches the per-field extractors.
+
+    :param html: Detail-page HTML fixture.
+    :type html: str
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    expected = {
+        "program_name": scrape.extract_dt_dd(soup, "Program"),
+        "degree_type": scrape.extract_dt_dd(soup, "Degree Type"),
+        "comments": scrape.extract_dt_dd(soup, "Notes"),
+        "gpa": scrape.extract_undergrad_gpa(soup),
+        **scrape.extract_gre_scores(soup),
+    }
+
+    fields = scrape.extract_detail_fields(soup)
+
+    assert fields == expected
+    assert list(fields) == list(scrape.parse_detail_page(FAKE_DETAIL_HTML))
+
+
 # ============================================================
 # _parse_survey_page
 # ============================================================
 
 @pytest.mark.db
-def test_parse_survey_page_metadata_assignment_with_main_result():
-    """Verify ``_parse_survey_page`` assigns term and citizenship metadata to the record.
+def test_parse_survey_page_metadata_assignment_with_main_result():
+    """Verify ``_parse_survey_page`` assigns term and citizenship metadata to the record.
+
+    The HTML contains one main result row followed by metadata rows for
+    ``"Fall 2025"`` and ``"international"``. Asserts that both are attached
+    to the parsed record via the metadata-assignment branches.
+    """
+    html = """
+    <tr>
+        <td><a href="/result/FAKE_ID">Some University</a></td>
+        <td>Program</td>
+        <td>Feb 18, 2026</td>
+        <td>Accepted</td>
+    </tr>
+    <tr><td colspan="4"><div>Fall 2025</div></td></tr>
+    <tr><td colspan="4"><div>international</div></td></tr>
+    """
+    results = scrape.parse_survey_page(html)
+
+    assert len(results) == 1
+    assert results[0]["result_id"] == "FAKE_ID"
+    assert results[0]["university"] == "Some University"
+    assert results[0]["start_term"] == "Fall 2025"
+    assert results[0]["International/US"] == "International"
+
+
+@pytest.mark.db
+def test_parse_survey_page_skip_no_link():
+    """Verify ``_parse_survey_page`` skips rows that have no result link.
+
+    The first row has no ``<a href="/result/...">`` so it triggers the
+    ``if not link: continue`` branch. Only the second row should be returned.
+    """
+    html = """
+    <tr>
+        <td>Random University</td>
+        <td>Program</td>
+        <td>Feb 18, 2026</td>
+        <td>Accepted</td>
+    </tr>
+    <tr>
+        <td><a href="/result/FAKE_ID">Some University</a></td>
+        <td>Program</td>
+        <td>Feb 18, 2026</td>
+        <td>Accepted</td>
+    </tr>
+    """
+    results = scrape.parse_survey_page(html)
+
+    assert len(results) == 1
+    assert results[0]["result_id"] == "FAKE_ID"
+    assert results[0]["university"] == "Some University"
+
+
+# ============================================================
+# Parser backend and strainers
+# ============================================================
+
+#: Detail page with page chrome and spans outside the ``<dl>``.
+FAKE_DETAIL_WITH_CHROME = """
+<html><head><title>Result</title></head><body>
+<nav><span>Menu:</span><span>Home</span><a href="/">Home</a></nav>
+<main><h1>Result</h1>""" + FAKE_DETAIL_HTML + """</main>
+<footer><span>GRE Verbal:</span></footer>
+</body></html>
+"""
+
+#: Detail page whose ``<dt>``/``<dd>`` pairs sit in ``<div>`` wrappers, not a ``<dl>``.
+FAKE_DETAIL_NO_DL = """
+<html><body><main>
+<div><dt>Program</dt><dd>CS</dd></div>
+<div><dt>Degree Type</dt><dd>PhD</dd></div>
+<div><dt>Undergrad GPA</dt><dd>3.70</dd></div>
+<ul><li><span>GRE General:</span><span>320</span></li></ul>
+</main></body></html>
+"""
+
+#: Well-formed survey page: every row closed, inside a ``<table>``.
+FAKE_SURVEY_PAGE = """
+<html><body><table><tbody>
+<tr>
+<td>Stanford University</td>
+<td><div><a href="/result/42">Computer Science</a><span>PhD</span></div>
+    <div>Fall 2026</div><div>International</div></td>
+<td>March 1, 2026</td>
+<td><div>Accepted on 28 Feb</div></td>
+</tr>
+<tr class="tw-border-none"><td colspan="100%"><p>Great news.</p></td></tr>
+</tbody></table></body></html>
+"""
+
+#: Whether the optional lxml tree builder is installed.
+HAVE_LXML = importlib.util.find_spec("lxml") is not None
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("backend", [
+    "html.parser",
+    pytest.param("lxml", marks=pytest.mark.skipif(not HAVE_LXML, reason="lxml not installed")),
+])
+def test_strained_parsing_matches_full_tree(monkeypatch, backend):
+    """Verify strained parsing yields the same dicts as a full-tree parse.
+
+    Parses every fixture with the configured strainers and again with the
+    strainers disabled, under each parser backend, and compares results.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param backend: Value for ``PARSER_BACKEND``.
+    :type backend: str
+    """
+    monkeypatch.setattr(scrape, "PARSER_BACKEND", backend)
+    surveys = [FAKE_SURVEY_HTML, FAKE_SURVEY_HTML_METADATA, FAKE_SURVEY_EMPTY]
+    surveys.append(FAKE_SURVEY_PAGE)
+    details = [FAKE_DETAIL_HTML, FAKE_DETAIL_EMPTY, FAKE_DETAIL_WITH_CHROME, FAKE_DETAIL_NO_DL]
+
+    strained = (
+        [scrape.parse_survey_page(html) for html in surveys],
+        [scrape.parse_detail_page(html) for html in details],
+    )
+    monkeypatch.setattr(scrape, "SURVEY_STRAINER", None)
+    monkeypatch.setattr(scrape, "DETAIL_STRAINER", None)
+    full = (
+        [scrape.parse_survey_page(html) for html in surveys],
+        [scrape.parse_detail_page(html) for html in details],
+    )
+
+    assert strained == full
+    assert strained[1][2]["program_name"] == "Political Science"
+    assert strained[1][2]["gpa"] == "3.90"
+    assert strained[1][3]["program_name"] == "CS"
+    assert strained[1][3]["degree_type"] == "PhD"
+    assert strained[1][3]["gpa"] == "3.70"
+    assert strained[1][3]["gre_general"] == "320"
+
+
+@pytest.mark.db
+def test_detail_strainer_skips_page_wrappers():
+    """Verify the detail strainer leaves page-wide ``<div>`` wrappers out of
+    the tree, and that a ``<dt>`` without a value does not take the next
+    pair's ``<dd>`` once those wrappers are gone.
+    """
+    chrome = "".join(
+        f'<div class="card"><div><p>Result {i} <a href="/result/{i}">view</a></p></div></div>'
+        for i in range(40)
+    )
+    html = f"<html><body><div>{chrome}<div>{FAKE_DETAIL_HTML}</div>{chrome}</div></body></html>"
+    full = scrape.make_soup(html)
+    strained = scrape.make_soup(html, scrape.DETAIL_STRAINER)
+
+    assert len(strained.find_all(True)) * 4 < len(full.find_all(True))
+    assert all(div.find_parent("dl") for div in strained.find_all("div"))
+    assert scrape.extract_detail_fields(strained) == scrape.extract_detail_fields(full)
+
+    no_value = "<div><dt>Program</dt></div><div><dt>Degree Type</dt><dd>PhD</dd></div>"
+    fields = scrape.parse_detail_page(no_value)
+    assert (fields["program_name"], fields["degree_type"]) == ("", "PhD")
+
+
+@pytest.mark.db
+@pytest.mark.skipif(not HAVE_LXML, reason="lxml not installed")
+def test_lxml_backend_matches_html_parser(monkeypatch):
+    """Verify the opt-in lxml backend yields the same records as html.parser.
+
+    ``FAKE_SURVEY_HTML`` is left out on purpose: its first ``<tr>`` is never
+    closed, and its record only exists because html.parser nests the next
+    row inside it. lxml repairs the markup per HTML5 and finds no record,
+    which is why lxml is not the default.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    surveys = [FAKE_SURVEY_PAGE, FAKE_SURVEY_HTML_METADATA, FAKE_SURVEY_EMPTY]
+    details = [FAKE_DETAIL_HTML, FAKE_DETAIL_EMPTY, FAKE_DETAIL_WITH_CHROME, FAKE_DETAIL_NO_DL]
+
+    def parse_all():
+        return (
+            [[r.to_dict() for r in scrape.parse_survey_page(html)] for html in surveys],
+            [scrape.parse_detail_page(html) for html in details],
+        )
+
+    monkeypatch.setattr(scrape, "PARSER_BACKEND", "html.parser")
+    expected = parse_all()
+    monkeypatch.setattr(scrape, "PARSER_BACKEND", "lxml")
+
+    assert parse_all() == expected
+    assert expected[0][0][0]["result_id"] == "42"
+    assert expected[0][0][0]["start_term"] == "Fall 2026"
+    assert expected[0][0][0]["International/US"] == "International"
+    assert scrape.parse_survey_page(FAKE_SURVEY_HTML) == []
+
+
+# ============================================================
+# scrape_data (full pipeline)
+# ============================================================
+
+@pytest.mark.db
+def test_scrape_data(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` runs the full survey + detail pipeline and writes output.
+
+    Patches ``_fetch_html`` to return survey HTML for survey URLs and
+    detail HTML otherwise, limits scraping to 1 record, and asserts that:
+
+    - Exactly one record is returned.
+    - The output JSON file is created.
+    - Survey fields (``result_id``, ``url_link``, ``date_added``) are populated.
+    - Detail fields (``program_name``, ``gpa``, GRE scores) are merged in correctly.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    tmp_file = tmp_path / "output.json"
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_file))
+    monkeypatch.setattr(scrape, "SAVE_EVERY", 1)
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 1)
+
+    def fake_fetch(url):
+        if "survey" in url:
+            return FAKE_SURVEY_HTML
+        return FAKE_DETAIL_HTML
+
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+
+    results = scrape.scrape_data()
+
+    assert len(results) == 1
+    assert tmp_file.exists()
+
+    record = results[0]
+    assert record["result_id"] == "FAKE_ID"
+    assert record["url_link"].endswith("/FAKE_ID")
+    assert record["date_added"] != ""
+    assert record["applicant_status"] != ""
+    assert record["program_name"] == "Political Science"
+    assert record["degree_type"] == "PhD"
+    assert record["comments"] == ""
+    assert record["gpa"] == "3.90"
+    assert record["gre_general"] == ""
+    assert record["gre_verbal"] == ""
+    assert record["gre_analytical_writing"] == ""
+
+
+@pytest.mark.db
+def test_survey_page_continue_and_metadata(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` correctly assigns metadata even when rows lack result links.
+
+    Uses :data:`FAKE_SURVEY_EMPTY` which contains metadata rows for
+    ``"Fall 2026"`` and ``"US"`` but no anchor link. For any records
+    that do get parsed, asserts the metadata fields are set correctly.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_path / "out.json"))
+    monkeypatch.setattr(scrape, "fetch_html", lambda url: FAKE_SURVEY_EMPTY)
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 1)
+
+    results = scrape.scrape_data()
+
+    for r in results:
+        assert "start_term" in r
+        assert r["start_term"] == "Fall 2026"
+        assert "International/US" in r
+        assert r["International/US"] == "US"
+
+
+@pytest.mark.db
+def test_survey_page_break(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` exits cleanly when a survey page returns no results.
+
+    Passes blank HTML so ``_parse_survey_page`` returns ``[]``, triggering
+    the ``if not page_results: break`` early-exit branch. Asserts the
+    function returns an empty list without raising.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_path / "out.json"))
+    monkeypatch.setattr(scrape, "fetch_html", lambda url: "<html></html>")
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 1)
+
+    assert scrape.scrape_data() == []
+
+
+@pytest.mark.db
+def test_iter_survey_pages_prefetch_window(monkeypatch):
+    """Verify prefetching yields pages in order and stops at the first empty page.
+
+    Pages 1 and 2 contain one record each; page 3 is empty. Asserts the
+    generator yields both pages in order and that closing it early after
+    page 1 leaves no further pages yielded.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    fetched = []
+
+    def fake_fetch(url):
+        page = int(url.rsplit("=", 1)[1])
+        fetched.append(page)
+        return FAKE_SURVEY_HTML.replace("FAKE_ID", str(page)) if page < 3 else ""
+
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+
+    pages = list(scrape.iter_survey_pages(prefetch=3))
+    assert [(p, r[0]["result_id"]) for p, r in pages] == [(1, "1"), (2, "2")]
+
+    fetched.clear()
+    generator = scrape.iter_survey_pages(prefetch=2)
+    assert next(generator)[0] == 1
+    generator.close()
+    assert max(fetched) <= 3
+
+
+@pytest.mark.db
+def test_fetch_survey_pages_concurrently(monkeypatch):
+    """Verify ``fetch_survey_pages`` maps each requested page to its records.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    def fake_fetch(url):
+        return FAKE_SURVEY_HTML.replace("FAKE_ID", url.rsplit("=", 1)[1])
+
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+
+    pages = scrape.fetch_survey_pages([4, 2, 7], workers=2)
+
+    assert {p: r[0]["result_id"] for p, r in pages.items()} == {4: "4", 2: "2", 7: "7"}
+    assert scrape.fetch_survey_pages([]) == {}
+
+
+@pytest.mark.db
+def test_scrape_data_with_prefetch(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` honours ``PREFETCH_PAGES`` and ``MAX_RECORDS``.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_path / "out.json"))
+    monkeypatch.setattr(scrape, "PREFETCH_PAGES", 4)
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 2)
+
+    def fake_fetch(url):
+        if "survey" in url:
+            return FAKE_SURVEY_HTML.replace("FAKE_ID", url.rsplit("=", 1)[1])
+        return FAKE_DETAIL_HTML
+
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+
+    results = scrape.scrape_data()
+
+    assert [r["result_id"] for r in results] == ["1", "2"]
+
+
+@pytest.mark.db
+def test_scrape_data_parses_details_in_processes(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` with ``PARSE_PROCESSES`` parses in worker processes.
+
+    Fetching stays on the (patched) I/O layer; the detail dicts returned by
+    the parser processes must equal in-process parsing.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_path / "out.json"))
+    monkeypatch.setattr(scrape, "PARSE_PROCESSES", 2)
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 3)
+
+    def fake_fetch(url):
+        if "survey" in url:
+            return FAKE_SURVEY_HTML.replace("FAKE_ID", url.rsplit("=", 1)[1])
+        return FAKE_DETAIL_HTML
+
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+
+    results = scrape.scrape_data()
+
+    expected = scrape.parse_detail_page(FAKE_DETAIL_HTML)
+    assert [r["result_id"] for r in results] == ["1", "2", "3"]
+    assert all(r["gpa"] == expected["gpa"] == "3.90" for r in results)
+
+
+@pytest.mark.db
+def test_parse_processes_reuse_pool_and_see_runtime_parser(monkeypatch):
+    """Verify parser processes are reused across calls, replaced when the
+    size changes, and parse with the strainer set at runtime rather than
+    the module default the spawned workers import.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from bs4 import SoupStrainer
+
+    from src.scrape import detail_pipeline
+
+    pool = detail_pipeline.ParsePool()
+    monkeypatch.setattr(scrape, "PARSE_POOL", pool)
+    monkeypatch.setattr(scrape, "fetch_html", lambda url: FAKE_DETAIL_HTML)
+
+    assert next(scrape.iter_details_in_processes(["1"], processes=2))["gpa"] == "3.90"
+    first = pool.get(2)
+    monkeypatch.setattr(scrape, "DETAIL_STRAINER", SoupStrainer("p"))
+    assert next(scrape.iter_details_in_processes(["1"], processes=2))["gpa"] == ""
+    assert pool.get(2) is first
+
+    assert pool.get(1) is not first
+    pool.close()
+    pool.close()
+
+
+# ============================================================
+# NDJSON checkpoint and compaction
+# ============================================================
+
+@pytest.mark.db
+def test_scrape_data_checkpoints_each_record_once(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` appends records to the checkpoint and compacts it.
+
+    Scrapes three records with ``SAVE_EVERY = 2`` and asserts that:
+
+    - One fsync'd checkpoint message is printed (after record 2).
+    - The final output equals ``json.dump(results, indent=2)`` byte for byte.
+    - The NDJSON checkpoint is removed after compaction.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    out_file = tmp_path / "applicant_data.json"
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(out_file))
+    monkeypatch.setattr(scrape, "SAVE_EVERY", 2)
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 3)
+
+    def fake_fetch(url):
+        if "survey" in url:
+            return FAKE_SURVEY_HTML.replace("FAKE_ID", url.rsplit("=", 1)[1])
+        return FAKE_DETAIL_HTML.replace("Political Science", "Política")
+
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+    printed = []
+    monkeypatch.setattr("builtins.print", lambda msg: printed.append(msg))
+
+    results = scrape.scrape_data()
+
+    expected = json.dumps(results, indent=2, ensure_ascii=False, default=json_default)
+    assert out_file.read_text(encoding="utf-8") == expected
+    assert not (tmp_path / "applicant_data.ndjson").exists()
+    assert sum("Checkpointed 2 records" in m for m in printed) == 1
+
+
+@pytest.mark.db
+def test_compact_checkpoint_empty(tmp_path):
+    """Verify compacting an empty checkpoint yields ``[]`` like ``json.dump``.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    checkpoint = tmp_path / "c.ndjson"
+    checkpoint.write_text("", encoding="utf-8")
+    out_file = tmp_path / "c.json"
+
+    assert json_stream.compact_checkpoint(str(checkpoint), str(out_file)) == 0
+    assert out_file.read_text(encoding="utf-8") == json.dumps([], indent=2)
+
+
+@pytest.mark.db
+def test_scrape_data_writes_empty_output(monkeypatch, tmp_path):
+    """Verify a scrape that finds nothing still replaces ``OUTPUT_FILE``
+    with ``[]`` instead of leaving the previous run's records behind.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    out_file = tmp_path / "out.json"
+    out_file.write_text('[{"result_id": "stale"}]', encoding="utf-8")
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(out_file))
+    monkeypatch.setattr(scrape, "fetch_html", lambda url: "<html></html>")
+
+    assert scrape.scrape_data() == []
+    assert out_file.read_text(encoding="utf-8") == json.dumps([], indent=2)
+
+
+# ============================================================
+# Streaming pipeline
+# ============================================================
+
+@pytest.mark.db
+def test_iter_survey_records_dedupes_and_limits(monkeypatch):
+    """Verify ``iter_survey_records`` skips repeated IDs and stops at the limit.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    pages = {1: ["1", "2"], 2: ["2", "3", "4"]}
+
+    def fake_fetch(url):
+        page = int(url.rsplit("=", 1)[1])
+        return "".join(
+            FAKE_SURVEY_HTML.replace("FAKE_ID", rid) for rid in pages.get(page, [])
+        )
+
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+
+    ids = [r["result_id"] for r in scrape.iter_survey_records(limit=3)]
+    assert ids == ["1", "2", "3"]
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 10)
+    assert [r["result_id"] for r in scrape.iter_survey_records()] == ["1", "2", "3", "4"]
+    assert not list(scrape.iter_survey_records(limit=0))
+
+
+@pytest.mark.db
+def test_iter_enriched_records_in_batches(monkeypatch):
+    """Verify ``iter_enriched_records`` fetches one batch at a time, keeps
+    input order and yields failed records unchanged.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    batches = []
+
+    def fake_details(result_ids):
+        batches.append(list(result_ids))
+        for rid in result_ids:
+            yield RuntimeError("boom") if rid == "3" else {"gpa": rid}
+
+    monkeypatch.setattr(scrape, "iter_details", fake_details)
+    printed = []
+    monkeypatch.setattr("builtins.print", printed.append)
+    records = ({"result_id": str(i)} for i in range(1, 6))
+
+    enriched = list(scrape.iter_enriched_records(records, batch_size=2))
+
+    assert batches == [["1", "2"], ["3", "4"], ["5"]]
+    assert [r.get("gpa") for r in enriched] == ["1", "2", None, "4", "5"]
+    assert any("result_id 3" in m for m in printed)
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("engine, processes", [("threads", 0), ("asyncio", 0), ("threads", 1)])
+def test_iter_details_dispatches_engines(monkeypatch, engine, processes):
+    """Verify ``iter_details`` uses the configured engine and reports
+    per-page failures as exceptions.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param engine: Detail-page fetch engine.
+    :param processes: Parser processes.
+    """
+    def fake_fetch(url):
+        if url.endswith("/2"):
+            raise URLError("down")
+        return FAKE_DETAIL_HTML
+
+    monkeypatch.setattr(scrape, "FETCH_ENGINE", engine)
+    monkeypatch.setattr(scrape, "PARSE_PROCESSES", processes)
+    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+    monkeypatch.setattr(
+        scrape, "fetch_details_async",
+        lambda ids: [scrape.parse_detail_page(FAKE_DETAIL_HTML) for _ in ids],
+    )
+    monkeypatch.setattr(
+        scrape, "iter_details_in_processes",
+        lambda ids: iter([URLError("down")] * len(ids)),
+    )
+
+    details = list(scrape.iter_details(["1", "2"]))
+
+    failed = [isinstance(d, URLError) for d in details]
+    assert failed == {"threads": [False, True], "asyncio": [False, False]}.get(
+        engine if not processes else "processes", [True, True],
+    )
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("records", [[], [{"a": "é", "b": [1, {"c": None}]}, {"d": 2}]])
+def test_write_json_array_matches_json_dump(tmp_path, records):
+    """Verify ``write_json_array`` streams the same bytes as ``json.dump``.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :param records: Records to write.
+    """
+    out_file = tmp_path / "out.json"
+
+    count = json_stream.write_json_array(iter(records), str(out_file))
+
+    assert count == len(records)
+    assert out_file.read_text(encoding="utf-8") == json.dumps(
+        records, indent=2, ensure_ascii=False,
+    )
+
+
+@pytest.mark.db
+def test_iter_clean_records_matches_clean_data():
+    """Verify the lazy cleaner yields the same records as ``clean_data``."""
+    raw = [{"program_name": "  CS  ", "applicant_status": "Wait listed"}, {}]
+
+    stream = clean.iter_clean_records(iter(raw))
+
+    assert next(stream) == clean.clean_data(raw)[0]
+    assert list(stream) == clean.clean_data(raw)[1:]
+
+
+@pytest.mark.db
+def test_clean_data_columns_engine_matches_rows(monkeypatch):
+    """Verify the column engine returns exactly the row engine's records.
+
+    Uses a small ``CLEAN_BATCH`` so records span several batches, and mixes
+    repeated values (table path) with unique ones (comprehension path).
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(clean, "CLEAN_BATCH", 7)
+    statuses = ["Accepted on 1 Feb", " Wait  listed ", None, "Rejected", "Other"]
+    raw = [
+        {
+            "program_name": "  Computer   Science ",
+            "university": ["MIT", "Rice  University", ""][i % 3],
+            "applicant_status": statuses[i % len(statuses)],
+            "comments": f" note  {i} ",
+            "gpa": None,
+        }
+        for i in range(20)
+    ] + [{}]
+
+    rows = clean.clean_data(raw, engine="rows")
+    columns = clean.clean_data(iter(raw), engine="columns")
+
+    assert [r.to_dict() for r in columns] == [r.to_dict() for r in rows]
+    assert columns[0]["university"] is columns[3]["university"]
+    assert clean.clean_data([], engine="columns") == []
+
+
+@pytest.mark.db
+def test_iter_array_items_splits_across_blocks():
+    """Verify objects are split correctly whatever the block boundaries.
+
+    String values contain brackets, quotes and escapes, and one record
+    nests arrays and objects.
+    """
+    raw = [
+        {"comments": 'tricky "}]{[" \\" \\\\ é', "gpa": "3.9"},
+        {"extra": {"nested": [1, {"a": "]"}]}},
+        {},
+    ]
+    text = "  " + json.dumps(raw, indent=2, ensure_ascii=False) + "\n"
+
+    for block_size in (1, 5, 4096):
+        items = clean._iter_array_items(io.StringIO(text), block_size=block_size)
+        assert [json.loads(item) for item in items] == raw
+
+    with pytest.raises(ValueError):
+        list(clean._iter_array_items(io.StringIO('[{"a": 1}'), block_size=4))
+
+
+@pytest.mark.db
+def test_clean_file_matches_save_data(tmp_path, monkeypatch):
+    """Verify ``clean_file`` writes exactly what ``save_data(clean_data(...))`` does.
+
+    Uses several small chunks over two workers and cleans the file in place.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    raw = [
+        {"program_name": f" Program  {i} ", "applicant_status": "Accepted on 6 Feb",
+         "university": "MIT", "comments": "é {}"}
+        for i in range(25)
+    ]
+    raw_file = tmp_path / "applicant_data.json"
+    raw_file.write_text(json.dumps(raw, indent=2), encoding="utf-8")
+    expected_file = tmp_path / "expected.json"
+    monkeypatch.setattr(clean, "OUT_FILE", str(expected_file))
+    clean.save_data(clean.clean_data(raw))
+
+    count = clean.clean_file(str(raw_file), str(raw_file), processes=2, chunk_size=4)
+
+    assert count == 25
+    assert raw_file.read_text(encoding="utf-8") == expected_file.read_text(encoding="utf-8")
+    assert clean._clean_chunk([json.dumps(raw[0])]) == json.dumps(
+        clean.clean_data(raw[:1]), indent=2, ensure_ascii=False, default=json_default,
+    )[4:-2]
+
+
+@pytest.mark.db
+def test_clean_file_empty_array(tmp_path, monkeypatch):
+    """Verify an empty dump is rewritten as ``[]`` using the module defaults.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    raw_file = tmp_path / "applicant_data.json"
+    raw_file.write_text("[]", encoding="utf-8")
+    monkeypatch.setattr(clean, "RAW_FILE", str(raw_file))
+    monkeypatch.setattr(clean, "OUT_FILE", str(tmp_path / "out.json"))
+
+    assert clean.clean_file() == 0
+    assert (tmp_path / "out.json").read_text(encoding="utf-8") == "[]"
+
+
+# ============================================================
+# ApplicantRecord
+# ============================================================
+
+@pytest.mark.db
+def test_applicant_record_behaves_like_dict():
+    """Verify ``ApplicantRecord`` round-trips dicts in key order, supports
+    the mapping protocol, keeps unknown keys and pickles.
+
+    """
+    import pickle
+
+    data = {"url_link": "u", "International/US": "US", "result_id": "7"}
+    record = ApplicantRecord.from_dict(data)
+
+    assert record.to_dict() == data and list(record.to_dict()) == list(data)
+    assert record == data and data == record
+    record.update({"gpa": "3.9", "extra": 1, "result_id": "8"})
+    assert list(record) == ["url_link", "International/US", "result_id", "gpa", "extra"]
+    assert record["extra"] == 1 and record.get("comments", "-") == "-"
+    assert "gpa" in record and "comments" not in record and len(record) == 5
+    with pytest.raises(KeyError):
+        record["missing"]  # pylint: disable=pointless-statement
+    del record["extra"], record["gpa"]
+    with pytest.raises(KeyError):
+        del record["gpa"]
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert repr(record).startswith("ApplicantRecord({'url_link'")
+    assert json.dumps([record], default=json_default) == json.dumps(
+        [{"url_link": "u", "International/US": "US", "result_id": "8"}]
+    )
+    with pytest.raises(TypeError):
+        json.dumps(object(), default=json_default)
+
+
+@pytest.mark.db
+def test_applicant_record_shares_repeated_strings():
+    """Verify repeated values are interned and records are smaller than dicts."""
+    import sys
+
+    raw = [{"university": "".join(["M", "IT"]), "gpa": "".join(["3", ".9"])}
+           for _ in range(2)]
+    first, second = (ApplicantRecord(r) for r in raw)
+
+    assert first["university"] is second["university"]
+    assert first["gpa"] is not second["gpa"]
+    assert first._keys is second._keys  # pylint: disable=protected-access
+    full = scrape.parse_survey_page(FAKE_SURVEY_HTML)[0]
+    assert sys.getsizeof(full) < sys.getsizeof(full.to_dict())
+
+
+# ============================================================
+# Resumable crawl sessions
+# ============================================================
+
+def _paged_survey_fetch(pages, details, fail=None):
+    """Build a fake ``fetch_html`` serving numbered survey and detail pages.
+
+    :param pages: Mapping of survey page number to list of result IDs.
+    :type pages: dict[int, list[str]]
+    :param details: List that every fetched detail result ID is appended to.
+    :type details: list[str]
+    :param fail: Optional set of URLs that raise ``URLError`` once.
+    :type fail: set[str] or None
+    :returns: Fake ``fetch_html`` callable.
+    """
+    fail = fail if fail is not None else set()
+
+    def fake_fetch(url):
+        if url in fail:
+            fail.discard(url)
+            raise URLError("killed")
+        if "survey" in url:
+            ids = pages.get(int(url.rsplit("=", 1)[1]), [])
+            return "".join(FAKE_SURVEY_HTML.replace("FAKE_ID", i) for i in ids)
+        details.append(url.rsplit("/", 1)[1])
+        return FAKE_DETAIL_HTML
+
+    return fake_fetch
+
+
+@pytest.mark.db
+def test_scrape_data_resumes_detail_phase(monkeypatch, tmp_path):
+    """Verify a resumed ``scrape_data`` skips listing and completed detail pages.
+
+    The first run fails on the detail page for result 2. The resumed run
+    must not re-list survey pages, must not re-fetch result 1, must drop
+    a torn line left at the end of the checkpoint, and must return all
+    three records in listing order.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    out_file = tmp_path / "applicant_data.json"
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(out_file))
+    monkeypatch.setattr(scrape, "SAVE_EVERY", 1)
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 3)
+    monkeypatch.setattr(scrape, "NUM_WORKERS", 1)
+    pages = {1: ["1", "2"], 2: ["3", "4"]}
+    fetched = []
+    detail_2 = f"{scrape.BASE_URL}/result/2"
+    monkeypatch.setattr(
+        scrape, "fetch_html", _paged_survey_fetch(pages, fetched, {detail_2}),
+    )
+
+    with pytest.raises(URLError):
+        scrape.scrape_data()
+    assert (tmp_path / "applicant_data.session.json").exists()
+    with open(tmp_path / "applicant_data.ndjson", "a", encoding="utf-8") as f:
+        f.write('{"result_id": "2", "torn')
+
+    fetched.clear()
+    monkeypatch.setattr(scrape, "fetch_html", _paged_survey_fetch({}, fetched))
+    results = scrape.scrape_data(resume=True)
+
+    assert [r["result_id"] for r in results] == ["1", "2", "3"]
+    assert sorted(fetched) == ["2", "3"]
+    assert [r["result_id"] for r in json.loads(out_file.read_text())] == ["1", "2", "3"]
+    assert not (tmp_path / "applicant_data.session.json").exists()
+
+
+@pytest.mark.db
+def test_crawl_session_state_stays_small_and_drops_unsaved_listing(tmp_path):
+    """Verify the state file holds only scalars, completed IDs come from the
+    checkpoint, and records listed after the last save are dropped on
+    restore because their page is listed again.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    from src.scrape import crawl_session
+
+    state_path = str(tmp_path / "s.json")
+    session = crawl_session.CrawlSession.open(
+        state_path, str(tmp_path / "c.ndjson"), save_every=1000,
+    )
+    session.add_listed(1, [{"result_id": "1"}, {"result_id": "2"}])
+    session.record_completed({"result_id": "1", "gpa": "3.9"})
+    session.save()
+    session.add_listed(2, [{"result_id": "3"}])
+    session.close()
+
+    with open(state_path, "r", encoding="utf-8") as f:
+        assert set(json.load(f)) == {"last_page", "listing_done", "listing_bytes"}
+
+    session = crawl_session.CrawlSession.open(
+        state_path, str(tmp_path / "c.ndjson"), resume=True,
+    )
+    assert session.last_page == 1
+    assert session.completed_ids == {"1"}
+    assert list(session.pending) == ["2"]
+    session.add_listed(2, [{"result_id": "3"}])
+    session.save()
+    session.close()
+
+    session = crawl_session.CrawlSession.open(
+        state_path, str(tmp_path / "c.ndjson"), resume=True,
+    )
+    assert list(session.pending) == ["2", "3"]
+    session.clear()
+
+
+@pytest.mark.db
+def test_scrape_data_resumes_listing_after_last_page(monkeypatch, tmp_path):
+    """Verify a resumed ``scrape_data`` continues listing after the saved page.
+
+    The first run is killed while fetching survey page 2. The resumed run
+    starts at page 2 and still enriches the record listed on page 1.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_path / "out.json"))
+    monkeypatch.setattr(scrape, "SAVE_EVERY", 1)
+    pages = {1: ["1"], 2: ["2"]}
+    fetched = []
+    page_2 = scrape.SURVEY_URL.format(2)
+    monkeypatch.setattr(
+        scrape, "fetch_html", _paged_survey_fetch(pages, fetched, {page_2}),
+    )
+
+    with pytest.raises(URLError):
+        scrape.scrape_data()
+
+    surveys = []
+    fake = _paged_survey_fetch(pages, fetched)
+    monkeypatch.setattr(
+        scrape, "fetch_html", lambda url: surveys.append(url) or fake(url),
+    )
+    results = scrape.scrape_data(resume=True)
+
+    assert [r["result_id"] for r in results] == ["1", "2"]
+    assert scrape.SURVEY_URL.format(1) not in surveys
+
+
+@pytest.mark.db
+def test_scrape_data_pipelines_details_with_listing(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` with ``PIPELINE_DEPTH`` overlaps listing and
+    enrichment and resumes after a failed detail fetch.
+
+    With a depth of 1, submitting the second record of page 1 waits for
+    the first detail fetch, so it happens before survey page 2 is
+    requested. The first run fails on result 3; the resumed run enriches
+    the pending records and keeps listing after page 2.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    """
+    out_file = tmp_path / "out.json"
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(out_file))
+    monkeypatch.setattr(scrape, "SAVE_EVERY", 1)
+    monkeypatch.setattr(scrape, "PIPELINE_DEPTH", 1)
+    pages = {1: ["1", "2"], 2: ["3"], 3: ["4"]}
+    events = []
+    fake = _paged_survey_fetch(pages, [], {f"{scrape.BASE_URL}/result/3"})
+    monkeypatch.setattr(scrape, "fetch_html", lambda url: events.append(url) or fake(url))
+
+    with pytest.raises(URLError):
+        scrape.scrape_data()
+    assert events.index(f"{scrape.BASE_URL}/result/1") < events.index(
+        scrape.SURVEY_URL.format(2)
+    )
+
+    results = scrape.scrape_data(resume=True)
+
+    assert [r["result_id"] for r in results] == ["1", "2", "3", "4"]
+    assert all(r["gpa"] == "3.90" for r in results)
+    assert [r["result_id"] for r in json.loads(out_file.read_text())] == ["1", "2", "3", "4"]
+
+
+@pytest.mark.db
+def test_detail_pipeline_bounds_outstanding_fetches():
+    """Verify ``DetailPipeline`` never has more than ``depth`` fetches in flight."""
+    import threading
+    import time
+
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def fake_detail(result_id):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+        return {"gpa": result_id}
+
+    with detail_pipeline.DetailPipeline(fake_detail, depth=3, workers=10) as pipeline:
+        pipeline.submit([{"result_id": str(i)} for i in range(12)])
+        done = list(pipeline.completed()) + list(pipeline.drain())
+        assert not list(pipeline.completed())
+
+    assert sorted(int(r["result_id"]) for r, _ in done) == list(range(12))
+    assert all(d == {"gpa": r["result_id"]} for r, d in done)
+    assert active["peak"] <= 3
+
+
+# ============================================================
+# async_fetch engine
+# ============================================================
+
+@pytest.mark.db
+def test_async_fetch_framings_and_redirect(local_http_server):
+    """Verify the asyncio client reads length, chunked and EOF-delimited bodies.
+
+    Also follows a relative redirect and keeps the query string on the
+    request line.
+
+    :param local_http_server: Local HTTP server fixture.
+    """
+    from src.scrape import async_fetch
+
+    server = local_http_server
+    server.routes.update({
+        "/length?page=1": (200, {}, b"length-body"),
+        "/chunked": (200, {"Transfer-Encoding": "chunked"}, b"chunked-body"),
+        "/eof": (200, {"Connection": "close"}, b"eof-body"),
+        "/moved": (302, {"Location": "/eof"}, b""),
+    })
+    urls = [f"{server.url}{p}" for p in ("/length?page=1", "/chunked", "/moved")]
+
+    assert async_fetch.run_fetch_many(urls, max_in_flight=2) == [
+        "length-body", "chunked-body", "eof-body",
+    ]
+    assert server.requests[0][1]["User-Agent"] == "Mozilla/5.0"
+
+
+@pytest.mark.db
+def test_async_fetch_reuses_connections(local_http_server):
+    """Verify ``fetch_many`` keeps connections alive and reuses them, and
+    opens a new one when the server has closed an idle connection.
 
-    The HTML contains one main result row followed by metadata rows for
-    ``"Fall 2025"`` and ``"international"``. Asserts that both are attached
-    to the parsed record via the metadata-assignment branches.
-    """
-    html = """
-    <tr>
-        <td><a href="/result/FAKE_ID">Some University</a></td>
-        <td>Program</td>
-        <td>Feb 18, 2026</td>
-        <td>Accepted</td>
-    </tr>
-    <tr><td colspan="4"><div>Fall 2025</div></td></tr>
-    <tr><td colspan="4"><div>international</div></td></tr>
+    :param local_http_server: Local HTTP server fixture.
     """
-    results = scrape.parse_survey_page(html)
+    from src.scrape import async_fetch
+
+    server = local_http_server
+    server.routes.update({
+        "/a": (200, {}, b"a"),
+        "/b": (200, {"Transfer-Encoding": "chunked"}, b"bbbb"),
+        "/drop": (200, {"X-Drop-Connection": "1"}, b"d"),
+    })
+    paths = ["/a", "/b", "/drop", "/a", "/b"]
+
+    results = async_fetch.run_fetch_many(
+        [f"{server.url}{p}" for p in paths], max_in_flight=1,
+    )
 
-    assert len(results) == 1
-    assert results[0]["result_id"] == "FAKE_ID"
-    assert results[0]["university"] == "Some University"
-    assert results[0]["start_term"] == "Fall 2025"
-    assert results[0]["International/US"] == "International"
+    assert results == ["a", "bbbb", "d", "a", "bbbb"]
+    assert server.requests[0][1]["Connection"] == "keep-alive"
+    assert len(set(server.peers[:3])) == 1
+    assert len(set(server.peers[3:])) == 1 and server.peers[3] != server.peers[0]
 
 
 @pytest.mark.db
-def test_parse_survey_page_skip_no_link():
-    """Verify ``_parse_survey_page`` skips rows that have no result link.
+def test_async_fetch_retries_then_raises(local_http_server, monkeypatch):
+    """Verify retry, HTTP error and connection error handling in the asyncio client.
 
-    The first row has no ``<a href="/result/...">`` so it triggers the
-    ``if not link: continue`` branch. Only the second row should be returned.
+    - A 500 followed by a 200 succeeds on the second attempt.
+    - A persistent 404 is returned as an ``HTTPError`` in its result slot.
+    - An unreachable port is returned as a ``URLError``.
+    - ``parse`` is applied to successful bodies only.
+
+    :param local_http_server: Local HTTP server fixture.
+    :param monkeypatch: Pytest monkeypatch fixture.
     """
-    html = """
-    <tr>
-        <td>Random University</td>
-        <td>Program</td>
-        <td>Feb 18, 2026</td>
-        <td>Accepted</td>
-    </tr>
-    <tr>
-        <td><a href="/result/FAKE_ID">Some University</a></td>
-        <td>Program</td>
-        <td>Feb 18, 2026</td>
-        <td>Accepted</td>
-    </tr>
+    from src.scrape import async_fetch
+
+    monkeypatch.setattr(async_fetch, "RETRY_BACKOFF", 0)
+    server = local_http_server
+    server.routes["/flaky"] = [(500, {}, b"boom"), (200, {}, b"ok")]
+
+    results = async_fetch.run_fetch_many(
+        [f"{server.url}/flaky", f"{server.url}/nothing", "http://127.0.0.1:9/"],
+        parse=str.upper,
+    )
+
+    assert results[0] == "OK"
+    assert isinstance(results[1], HTTPError) and results[1].code == 404
+    assert isinstance(results[2], URLError)
+
+
+@pytest.mark.db
+def test_scrape_data_asyncio_engine(monkeypatch, tmp_path):
+    """Verify ``scrape_data`` merges details from the asyncio engine and raises on failure.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
     """
-    results = scrape.parse_survey_page(html)
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_path / "out.json"))
+    monkeypatch.setattr(scrape, "MAX_RECORDS", 1)
+    monkeypatch.setattr(scrape, "FETCH_ENGINE", "asyncio")
+    monkeypatch.setattr(scrape, "fetch_html", lambda url: FAKE_SURVEY_HTML)
 
-    assert len(results) == 1
-    assert results[0]["result_id"] == "FAKE_ID"
-    assert results[0]["university"] == "Some University"
+    calls = {}
+
+    def fake_run(urls, max_in_flight, timeout, parse, controller=None):
+        calls["urls"] = urls
+        calls["max_in_flight"] = max_in_flight
+        return [parse(FAKE_DETAIL_HTML)]
+
+    monkeypatch.setattr(scrape.async_fetch, "run_fetch_many", fake_run)
+
+    results = scrape.scrape_data()
+
+    assert calls["urls"] == [f"{scrape.BASE_URL}/result/FAKE_ID"]
+    assert calls["max_in_flight"] == scrape.MAX_IN_FLIGHT
+    assert results[0]["gpa"] == "3.90"
+
+    monkeypatch.setattr(
+        scrape.async_fetch, "run_fetch_many",
+        lambda urls, **kwargs: [URLError("down")],
+    )
+    with pytest.raises(URLError):
+        scrape.scrape_data()
 
 
 # ============================================================
-# scrape_data (full pipeline)
+# http_pool keep-alive connection pool
 # ============================================================
 
 @pytest.mark.db
-def test_scrape_data(monkeypatch, tmp_path):
-    """Verify ``scrape_data`` runs the full survey + detail pipeline and writes output.
+def test_http_pool_reuses_keep_alive_connections(local_http_server):
+    """Verify the pool serves repeat requests over one keep-alive connection.
 
-    Patches ``_fetch_html`` to return survey HTML for survey URLs and
-    detail HTML otherwise, limits scraping to 1 record, and asserts that:
+    Also checks that a relative redirect is followed, that a
+    ``Connection: close`` response is not returned to the pool, and that
+    ``close`` empties it.
+
+    :param local_http_server: Local HTTP server fixture.
+    """
+    from src.scrape import http_pool
+
+    server = local_http_server
+    server.routes.update({
+        "/a?x=1": (200, {}, b"first"),
+        "/b": (301, {"Location": "/a?x=1"}, b""),
+        "/closing": (200, {"Connection": "close"}, b"bye"),
+    })
+    pool = http_pool.ConnectionPool(maxsize=2)
+
+    assert pool.get(f"{server.url}/a?x=1") == b"first"
+    assert pool.get(f"{server.url}/b") == b"first"
+    stats = pool.stats()
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 2
+    assert stats["requests"] == 3
+    assert stats["idle_connections"] == 1
+
+    assert pool.get(f"{server.url}/closing") == b"bye"
+    assert pool.stats()["idle_connections"] == 0
+
+    pool.get(f"{server.url}/a?x=1")
+    pool.close()
+    assert pool.stats()["idle_connections"] == 0
+
+
+@pytest.mark.db
+def test_http_pool_errors_and_stale_connections(local_http_server):
+    """Verify error mapping, stale-socket retry and the ``maxsize`` cap.
+
+    - A 404 raises ``HTTPError``.
+    - An unreachable port raises ``URLError``.
+    - A reused connection whose socket was closed is replaced transparently.
+    - With ``maxsize=0`` released connections are closed, not kept.
+
+    :param local_http_server: Local HTTP server fixture.
+    """
+    from src.scrape import http_pool
+
+    server = local_http_server
+    server.routes["/ok"] = (200, {}, b"ok")
+    pool = http_pool.ConnectionPool(maxsize=1)
+
+    with pytest.raises(HTTPError):
+        pool.get(f"{server.url}/missing")
+    with pytest.raises(URLError):
+        pool.get("http://127.0.0.1:9/")
+
+    pool.get(f"{server.url}/ok")
+    idle = next(iter(pool._idle.values()))
+    idle[0].sock.close()
+    assert pool.get(f"{server.url}/ok") == b"ok"
+    assert pool.stats()["connections_created"] == 3
+
+    capped = http_pool.ConnectionPool(maxsize=0)
+    capped.get(f"{server.url}/ok")
+    assert capped.stats()["idle_connections"] == 0
+
+
+@pytest.mark.db
+def test_http_pool_https_connection_class():
+    """Verify HTTPS pool keys open ``HTTPSConnection`` objects."""
+    import http.client
+    from src.scrape import http_pool
+
+    pool = http_pool.ConnectionPool()
+    conn, reused = pool._acquire(("https", "example.org", 443))
+
+    assert isinstance(conn, http.client.HTTPSConnection)
+    assert reused is False
 
-    - Exactly one record is returned.
-    - The output JSON file is created.
-    - Survey fields (``result_id``, ``url_link``, ``date_added``) are populated.
-    - Detail fields (``program_name``, ``gpa``, GRE scores) are merged in correctly.
 
+@pytest.mark.db
+def test_fetch_html_uses_http_pool(local_http_server, monkeypatch):
+    """Verify ``fetch_html`` routes through ``HTTP_POOL`` when enabled.
+
+    :param local_http_server: Local HTTP server fixture.
     :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    from src.scrape import http_pool
+
+    server = local_http_server
+    server.routes["/page"] = (200, {}, "café".encode("utf-8"))
+    pool = http_pool.ConnectionPool()
+    monkeypatch.setattr(scrape, "USE_HTTP_POOL", True)
+    monkeypatch.setattr(scrape, "HTTP_POOL", pool)
+
+    assert scrape.fetch_html(f"{server.url}/page") == "café"
+    assert scrape.fetch_html(f"{server.url}/page") == "café"
+    assert pool.stats()["connections_reused"] == 1
+
+
+# ============================================================
+# http_cache (conditional-GET cache)
+# ============================================================
+
+@pytest.mark.db
+def test_http_cache_store_validators_and_lru(tmp_path):
+    """Verify ``HTTPCache`` stores validated bodies and evicts by recency.
+
+    Responses without validators are not stored, cached bodies round-trip
+    through compression, and once the size bound is exceeded the least
+    recently loaded page is evicted. Access order survives reopening.
+
     :param tmp_path: Pytest-provided temporary directory.
     :type tmp_path: pathlib.Path
     """
-    tmp_file = tmp_path / "output.json"
-    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_file))
-    monkeypatch.setattr(scrape, "SAVE_EVERY", 1)
-    monkeypatch.setattr(scrape, "MAX_RECORDS", 1)
+    from src.scrape import http_cache
+
+    path = str(tmp_path / "cache.sqlite3")
+    cache = http_cache.HTTPCache(path)
+    cache.store("u0", b"no validators", {})
+    assert cache.validators("u0") == {}
+    assert cache.load("u0") is None
+
+    cache.store("u1", b"one" * 100, {"etag": '"e1"'})
+    cache.store("u2", b"two" * 100, {"last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    assert cache.validators("u1") == {"If-None-Match": '"e1"'}
+    assert cache.validators("u2") == {
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.load("u1") == b"one" * 100
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["stores"] == 2
+    cache.close()
+
+    # Reopen with room for two entries: u2 is now the least recently used
+    cache = http_cache.HTTPCache(path, max_bytes=stats["bytes"])
+    cache.store("u3", b"six" * 100, {"etag": '"e3"'})
+    assert cache.validators("u2") == {}
+    assert cache.load("u1") == b"one" * 100
+    assert cache.stats()["evictions"] == 1
+    cache.close()
 
-    def fake_fetch(url):
-        if "survey" in url:
-            return FAKE_SURVEY_HTML
-        return FAKE_DETAIL_HTML
 
-    monkeypatch.setattr(scrape, "fetch_html", fake_fetch)
+@pytest.mark.db
+def test_http_cache_batches_commits_and_tracks_size(tmp_path):
+    """Verify ``HTTPCache`` commits every ``commit_every`` writes and on
+    close, indexes the access stamp, and keeps its in-memory byte count
+    equal to the stored sizes through replacements and evictions.
 
-    results = scrape.scrape_data()
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    import sqlite3
+
+    from src.scrape import http_cache
+
+    path = str(tmp_path / "cache.sqlite3")
+    cache = http_cache.HTTPCache(path, max_bytes=60, commit_every=2)
+    reader = sqlite3.connect(path)
+
+    def on_disk():
+        return reader.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    cache.store("u1", b"a", {"etag": '"1"'})
+    assert on_disk() == 0
+    cache.store("u1", b"b" * 10, {"etag": '"2"'})
+    assert on_disk() == 1
+    for i in range(2, 8):
+        cache.store(f"u{i}", bytes([i]) * 10, {"etag": '"e"'})
+    assert cache.stats()["evictions"] > 0
+    total = cache._db.execute("SELECT SUM(size) FROM pages").fetchone()[0]
+    assert cache.stats()["bytes"] == total <= 60
+    assert reader.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'pages_accessed'"
+    ).fetchone()
+
+    cache.load("u7")
+    cache.close()
+    reader.close()
+    cache = http_cache.HTTPCache(path)
+    assert cache.stats()["bytes"] == total
+    cache.close()
 
-    assert len(results) == 1
-    assert tmp_file.exists()
 
-    record = results[0]
-    assert record["result_id"] == "FAKE_ID"
-    assert record["url_link"].endswith("/FAKE_ID")
-    assert record["date_added"] != ""
-    assert record["applicant_status"] != ""
-    assert record["program_name"] == "Political Science"
-    assert record["degree_type"] == "PhD"
-    assert record["comments"] == ""
-    assert record["gpa"] == "3.90"
-    assert record["gre_general"] == ""
-    assert record["gre_verbal"] == ""
-    assert record["gre_analytical_writing"] == ""
+@pytest.mark.db
+@pytest.mark.parametrize("use_pool", [False, True])
+def test_fetch_html_serves_304_from_http_cache(local_http_server, monkeypatch,
+                                               tmp_path, use_pool):
+    """Verify ``fetch_html`` revalidates cached pages with conditional GETs.
+
+    The first fetch stores the page with its ETag; the second sends
+    ``If-None-Match`` and serves the ``304`` from disk. Covers both the
+    ``urllib`` path and the connection-pool path.
+
+    :param local_http_server: Local HTTP server fixture.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    :param use_pool: Whether ``USE_HTTP_POOL`` is enabled.
+    :type use_pool: bool
+    """
+    from src.scrape import http_cache, http_pool
+
+    server = local_http_server
+    server.routes["/result/1"] = [
+        (200, {"ETag": '"v1"'}, "café".encode("utf-8")),
+        (304, {"ETag": '"v1"'}, b""),
+    ]
+    cache = http_cache.HTTPCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(scrape, "HTTP_CACHE", cache)
+    monkeypatch.setattr(scrape, "USE_HTTP_POOL", use_pool)
+    monkeypatch.setattr(scrape, "HTTP_POOL", http_pool.ConnectionPool())
+
+    assert scrape.fetch_html(f"{server.url}/result/1") == "café"
+    assert scrape.fetch_html(f"{server.url}/result/1") == "café"
+
+    first, second = (headers for _, headers in server.requests)
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == '"v1"'
+    assert cache.stats()["hits"] == 1
+    cache.close()
 
 
 @pytest.mark.db
-def test_survey_page_continue_and_metadata(monkeypatch):
-    """Verify ``scrape_data`` correctly assigns metadata even when rows lack result links.
+def test_fetch_html_http_cache_evicted_and_errors(local_http_server, monkeypatch,
+                                                  tmp_path):
+    """Verify cache fallbacks: refetch after eviction and error propagation.
 
-    Uses :data:`FAKE_SURVEY_EMPTY` which contains metadata rows for
-    ``"Fall 2026"`` and ``"US"`` but no anchor link. For any records
-    that do get parsed, asserts the metadata fields are set correctly.
+    A ``304`` for a page evicted since its validators were read triggers
+    one unconditional refetch, and HTTP errors other than ``304`` still
+    raise after the usual retries.
 
+    :param local_http_server: Local HTTP server fixture.
     :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
     """
-    monkeypatch.setattr(scrape, "fetch_html", lambda url: FAKE_SURVEY_EMPTY)
-    monkeypatch.setattr(scrape, "MAX_RECORDS", 1)
+    from src.scrape import http_cache
 
-    results = scrape.scrape_data()
+    server = local_http_server
+    server.routes["/page"] = [
+        (304, {}, b""),
+        (200, {"ETag": '"v2"'}, b"fresh"),
+    ]
+    cache = http_cache.HTTPCache(str(tmp_path / "cache.sqlite3"))
+    cache.store(f"{server.url}/page", b"stale", {"etag": '"v1"'})
+    monkeypatch.setattr(cache, "load", lambda url: None)
+    monkeypatch.setattr(scrape, "HTTP_CACHE", cache)
+    monkeypatch.setattr(scrape.time, "sleep", lambda s: None)
 
-    for r in results:
-        assert "start_term" in r
-        assert r["start_term"] == "Fall 2026"
-        assert "International/US" in r
-        assert r["International/US"] == "US"
+    assert scrape.fetch_html(f"{server.url}/page") == "fresh"
+    assert "If-None-Match" not in server.requests[1][1]
+    assert cache.validators(f"{server.url}/page") == {"If-None-Match": '"v2"'}
+
+    with pytest.raises(HTTPError):
+        scrape.fetch_html(f"{server.url}/missing", retries=1)
+    cache.close()
+
+
+# ============================================================
+# rate_control (adaptive AIMD pacing)
+# ============================================================
+
+class _FakeClock:
+    """Manually advanced clock; ``sleep`` moves time forward instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
 
 
 @pytest.mark.db
-def test_survey_page_break(monkeypatch):
-    """Verify ``scrape_data`` exits cleanly when a survey page returns no results.
+def test_rate_controller_aimd_and_pacing():
+    """Verify token-bucket pacing, AIMD adjustment and reporting.
+
+    - Back-to-back acquires are spaced by ``1 / rate`` seconds.
+    - Fast successes raise the rate and concurrency additively.
+    - A 429 halves both; a 5xx within the cool-down does not cut again.
+    - Slow responses and connection errors are counted as congestion.
+    - A full set of in-flight slots makes ``_reserve`` poll.
+    """
+    from src.scrape import rate_control
 
-    Passes blank HTML so ``_parse_survey_page`` returns ``[]``, triggering
-    the ``if not page_results: break`` early-exit branch. Asserts the
-    function returns an empty list without raising.
+    clock = _FakeClock()
+    controller = rate_control.RateController(
+        rate=2.0, concurrency=2, max_rate=4.0, max_concurrency=3,
+        latency_target=1.0, jitter=0, clock=clock,
+    )
+    first = controller.acquire(sleep=clock.sleep)
+    second = controller.acquire(sleep=clock.sleep)
+    assert (first, second) == (0.0, 0.5)
+    assert controller._reserve() is None
+
+    controller.release(first, 200)
+    controller.release(second, 200)
+    assert controller.rate > 2.0 and controller.concurrency > 2.0
+    for _ in range(50):
+        controller.release(controller.acquire(sleep=clock.sleep), 200)
+    assert controller.stats()["rate"] == 4.0
+    assert controller.stats()["concurrency"] == 3
+
+    controller.release(controller.acquire(sleep=clock.sleep), 429)
+    controller.release(controller.acquire(sleep=clock.sleep), 503)
+    assert controller.stats()["rate"] == 2.0
+    assert controller.stats()["concurrency"] == 1
+
+    clock.now += 5
+    started = controller.acquire(sleep=clock.sleep)
+    clock.now += 2
+    controller.release(started, 200)
+    clock.now += 5
+    controller.release(controller.acquire(sleep=clock.sleep), None)
+    stats = controller.stats()
+    assert stats["rate"] == 0.5 and stats["concurrency"] == 1
+    assert (stats["throttled"], stats["slow"], stats["errors"]) == (2, 1, 1)
+    assert "Request rate 0.50/s" in controller.report()
+
+
+@pytest.mark.db
+def test_rate_controller_waits_for_free_slot():
+    """Verify callers block on a full set of slots until one is released.
+
+    A fetch thread waits on the controller's condition and an asyncio
+    caller polls; both proceed once the held slot is released.
+    """
+    import asyncio
+    import threading
+    from src.scrape import rate_control
+
+    controller = rate_control.RateController(
+        rate=1000.0, concurrency=1, max_concurrency=1, jitter=0,
+    )
+    held = controller.acquire()
+    started = threading.Event()
+
+    def worker():
+        controller.release(controller.acquire(), 200)
+        started.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not started.wait(0.05)
+    controller.release(held, 200)
+    thread.join(timeout=5)
+    assert started.is_set()
+
+    async def blocked_then_released():
+        held = await controller.acquire_async()
+        asyncio.get_running_loop().call_later(0.03, controller.release, held, 200)
+        controller.release(await controller.acquire_async(), 200)
 
+    asyncio.run(blocked_then_released())
+    assert controller.stats()["requests"] == 4
+    assert controller.stats()["in_flight"] == 0
+
+
+@pytest.mark.db
+def test_fetch_paths_report_to_rate_controller(local_http_server, monkeypatch):
+    """Verify ``fetch_html`` and the asyncio engine feed the shared controller.
+
+    A 429 on the blocking path and a 500 then 200 on the asyncio path are
+    reported as throttling; an unreachable port is reported as an error.
+
+    :param local_http_server: Local HTTP server fixture.
     :param monkeypatch: Pytest monkeypatch fixture.
     """
-    monkeypatch.setattr(scrape, "fetch_html", lambda url: "<html></html>")
+    from src.scrape import async_fetch, rate_control
+
+    server = local_http_server
+    server.routes["/ok"] = (200, {}, b"fine")
+    server.routes["/busy"] = (429, {}, b"slow down")
+    server.routes["/flaky"] = [(500, {}, b"boom"), (200, {}, b"ok")]
+    controller = rate_control.RateController(rate=1000.0, max_rate=1000.0, jitter=0)
+    monkeypatch.setattr(scrape, "RATE_CONTROLLER", controller)
+    monkeypatch.setattr(async_fetch, "RETRY_BACKOFF", 0)
+
+    assert scrape.fetch_html(f"{server.url}/ok") == "fine"
+    with pytest.raises(HTTPError):
+        scrape.fetch_html(f"{server.url}/busy", retries=1)
+    results = async_fetch.run_fetch_many(
+        [f"{server.url}/flaky", "http://127.0.0.1:9/"],
+        max_in_flight=1, retries=2, controller=controller,
+    )
+
+    assert results[0] == "ok" and isinstance(results[1], URLError)
+    stats = controller.stats()
+    assert stats["requests"] == 6 and stats["in_flight"] == 0
+    assert stats["throttled"] == 2 and stats["errors"] == 2
+    assert scrape.detail_workers() == controller.max_concurrency
+
+
+@pytest.mark.db
+def test_scrape_data_reports_rate(monkeypatch, tmp_path, capsys):
+    """Verify ``scrape_data`` prints the controller report when pacing is on.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :param tmp_path: Pytest-provided temporary directory.
+    :param capsys: Pytest output-capture fixture.
+    """
+    from src.scrape import rate_control
+
+    monkeypatch.setattr(scrape, "OUTPUT_FILE", str(tmp_path / "out.json"))
     monkeypatch.setattr(scrape, "MAX_RECORDS", 1)
+    monkeypatch.setattr(scrape, "RATE_CONTROLLER", rate_control.RateController())
+    monkeypatch.setattr(
+        scrape, "fetch_html",
+        lambda url: FAKE_SURVEY_HTML if "survey" in url else FAKE_DETAIL_HTML,
+    )
 
-    assert scrape.scrape_data() == []
+    scrape.scrape_data()
+
+    assert "Request rate 5.00/s" in capsys.readouterr().out
 
 
 # ============================================================
@@ -647,6 +2047,28 @@ def test_normalize_status_branches():
     assert clean._normalize_status("Under review") == "Under review"
 
 
+@pytest.mark.db
+def test_normalize_status_memo_counts_hits():
+    """Verify ``normalize_status`` memoizes results and reports its hit rate.
+
+    Also checks that the "wait" rule beats "interview" even when
+    "interview" appears first in the string.
+    """
+    clean.normalize_status.cache_clear()
+    assert clean.status_memo_stats()["hit_rate"] == 0.0
+
+    raw = ["Accepted on 6 Feb", "interview, then wait listed", "Accepted on 6 Feb"] * 2
+    assert [clean.normalize_status(s) for s in raw] == [
+        clean._normalize_status(s) for s in raw
+    ]
+    assert clean.normalize_status(raw[1]) == "Waitlisted"
+
+    stats = clean.status_memo_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (5, 2, 2)
+    assert stats["maxsize"] == clean.STATUS_MEMO_SIZE
+    assert stats["hit_rate"] == pytest.approx(5 / 7)
+
+
 # ============================================================
 # clean.save_data
 # ============================================================
@@ -736,4 +2158,88 @@ def test_get_seen_ids_no_url(tmp_path):
     no_url_file = tmp_path / "no_url.json"
     no_url_file.write_text(json.dumps({"some_key": 123}) + "\n")
 
-    assert get_seen_ids_from_llm_extend_file(path=no_url_file) == set()
\ No newline at end of file
+    assert get_seen_ids_from_llm_extend_file(path=no_url_file) == set()
+
+# ============================================================
+# seen_index
+# ============================================================
+
+def _llm_line(result_id):
+    """Return one LLM-output NDJSON line for ``result_id``."""
+    return json.dumps({"url_link": f"https://www.thegradcafe.com/result/{result_id}"}) + "\n"
+
+
+@pytest.mark.db
+def test_seen_index_syncs_incrementally(tmp_path):
+    """Verify the seen-ID index matches the LLM file as it grows and shrinks.
+
+    Invalid lines, records without a URL and duplicates are skipped; a torn
+    final line is only indexed once it is completed.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from src import seen_index
+
+    llm_file = tmp_path / "llm.json"
+    llm_file.write_text(
+        _llm_line(30) + "{ not json }\n" + json.dumps({"a": 1}) + "\n"
+        + _llm_line(10) + _llm_line(30) + '{"url_link": "/result/5"'
+    )
+
+    index = seen_index.SeenIndex.open(str(llm_file))
+    assert list(index) == [10, 30]
+    assert 30 in index and "10" in index and 5 not in index and 99 not in index
+    assert index.newest == 30
+    index.close()
+    index.close()
+
+    with open(llm_file, "a", encoding="utf-8") as f:
+        f.write("}\n" + _llm_line(20) + _llm_line(40))
+    index = seen_index.SeenIndex.open(str(llm_file))
+    assert list(index) == [5, 10, 20, 30, 40]
+    index.close()
+    assert seen_index.sync(str(llm_file)) == str(tmp_path / "llm.seen.idx")
+
+    llm_file.write_text(_llm_line(7))
+    assert list(seen_index.SeenIndex.open(str(llm_file))) == [7]
+
+
+@pytest.mark.db
+def test_seen_index_empty_and_corrupt(tmp_path):
+    """Verify a missing LLM file gives an empty index and a corrupt index
+    file is rebuilt.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from src import seen_index
+
+    missing = str(tmp_path / "missing.json")
+    index = seen_index.SeenIndex.open(missing)
+    assert len(index) == 0 and index.newest is None and 1 not in index
+
+    llm_file = tmp_path / "llm.json"
+    llm_file.write_text(_llm_line(3))
+    idx_file = tmp_path / "llm.seen.idx"
+    for junk in (b"", b"SEENIDX1" + b"\x00" * 40):
+        idx_file.write_bytes(junk)
+        assert list(seen_index.SeenIndex.open(str(llm_file))) == [3]
+
+
+@pytest.mark.db
+def test_load_seen_ids_uses_index(tmp_path):
+    """Verify ``load_seen_ids`` returns the mapped index for the LLM file.
+
+    :param tmp_path: Pytest-provided temporary directory.
+    :type tmp_path: pathlib.Path
+    """
+    from src.refresh_gradcafe import load_seen_ids
+
+    llm_file = tmp_path / "llm.json"
+    llm_file.write_text(_llm_line(42))
+
+    seen_ids = load_seen_ids(path=str(llm_file))
+
+    assert 42 in seen_ids and len(seen_ids) == 1
+    assert (tmp_path / "llm.seen.idx").exists()